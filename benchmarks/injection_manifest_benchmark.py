@@ -0,0 +1,121 @@
+"""Benchmark the global injection manifest build on a cold and a warm hash cache.
+
+Usage:
+    python benchmarks/injection_manifest_benchmark.py --zips 300 --listings-per-zip 400
+    python benchmarks/injection_manifest_benchmark.py --hash-workers 1 2 4 8
+
+Writes a synthetic Fetched tree (canonical, raw and metadata files per provider/ZIP)
+into a temporary directory. For each --hash-workers count, with buffered and mmap
+reads, reports MB/s for hashing alone and for uncached builds (every file read,
+hashed and counted). Then times a
+cold cache, a warm cache, and a warm cache after touching a handful of ZIPs.
+Checks that every build yields the same records.
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from re_analyzer.scrapers import injection_manifest
+
+
+PROVIDERS = ("zillow", "redfin", "realtor")
+TIMESTAMP = "2026-05-28_19-35"
+
+
+def _listing(rng, provider, zip_code, index):
+    return {
+        "source": provider,
+        "source_property_id": f"{zip_code}-{index}",
+        "address": f"{rng.randrange(1, 9999)} Example St",
+        "zip_code": zip_code,
+        "price": rng.randrange(90_000, 2_500_000),
+        "beds": rng.randrange(1, 6),
+        "baths": rng.randrange(1, 5),
+        "living_area": rng.randrange(500, 5000),
+        "image_urls": [f"https://photos.example.com/{zip_code}/{index}/{photo}.jpg" for photo in range(4)],
+    }
+
+
+def write_tree(fetched_root, zip_count, listings_per_zip, seed=11):
+    rng = random.Random(seed)
+    for provider in PROVIDERS:
+        metadata_dir = fetched_root / provider / "Metadata"
+        metadata_dir.mkdir(parents=True, exist_ok=True)
+        for zip_index in range(zip_count):
+            zip_code = str(33000 + zip_index)
+            zip_dir = fetched_root / provider / zip_code
+            zip_dir.mkdir(parents=True, exist_ok=True)
+            listings = [_listing(rng, provider, zip_code, index) for index in range(listings_per_zip)]
+            (zip_dir / f"canonical_listings_{TIMESTAMP}.json").write_text(json.dumps(listings))
+            (zip_dir / f"listings_{TIMESTAMP}.json").write_text(json.dumps([{"raw": listing} for listing in listings]))
+            (metadata_dir / f"{zip_code}_metadata.json").write_text(json.dumps({"raw_count": listings_per_zip}))
+
+
+def _timed_build(fetched_root, **kwargs):
+    started = time.perf_counter()
+    manifest = injection_manifest.build_injection_manifest(fetched_root, **kwargs)
+    return manifest, time.perf_counter() - started
+
+
+def _comparable(manifest):
+    return [{key: value for key, value in record.items() if key != "generated_at"} for record in manifest["records"]]
+
+
+def run_benchmark(zip_count, listings_per_zip, touched_zips, hash_workers):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetched_root = Path(temp_dir) / "Fetched"
+        write_tree(fetched_root, zip_count, listings_per_zip)
+        tree_bytes = sum(path.stat().st_size for path in fetched_root.rglob("*.json"))
+        print(f"files={len(PROVIDERS) * zip_count * 3} tree_mb={tree_bytes / 1e6:.1f}")
+
+        payload_paths = sorted(fetched_root.rglob("*.json"))
+        uncached_manifests = []
+        for workers in hash_workers:
+            for use_mmap in (False, True):
+                # Hashing alone (no record counting): the part the thread pool parallelizes.
+                started = time.perf_counter()
+                injection_manifest.prefetch_digests(
+                    [(path, False) for path in payload_paths], fetched_root, injection_manifest._open_cache_database(":memory:"),
+                    workers=workers, use_mmap=use_mmap,
+                )
+                seconds = time.perf_counter() - started
+                print(f"hash only, hash_workers={workers} {'mmap' if use_mmap else 'read'}: {seconds:.3f}s {tree_bytes / 1e6 / max(seconds, 1e-9):,.0f} MB/s")
+                manifest, seconds = _timed_build(fetched_root, use_file_cache=False, hash_workers=workers, use_mmap=use_mmap)
+                uncached_manifests.append(manifest)
+                print(f"no cache, hash_workers={workers} {'mmap' if use_mmap else 'read'}: {seconds:.3f}s {tree_bytes / 1e6 / max(seconds, 1e-9):,.0f} MB/s")
+        uncached = uncached_manifests[0]
+
+        cold, cold_seconds = _timed_build(fetched_root)
+        warm, warm_seconds = _timed_build(fetched_root)
+        for zip_index in range(touched_zips):
+            canonical_path = fetched_root / "zillow" / str(33000 + zip_index) / f"canonical_listings_{TIMESTAMP}.json"
+            canonical_path.write_text(canonical_path.read_text()[:-1] + ", {}]")
+        touched, touched_seconds = _timed_build(fetched_root)
+
+        print(f"cold cache: {cold_seconds:.3f}s")
+        print(f"warm cache: {warm_seconds:.3f}s")
+        print(f"warm cache, {touched_zips} canonical files changed: {touched_seconds:.3f}s")
+        print(f"records_identical={all(_comparable(manifest) == _comparable(uncached) for manifest in (*uncached_manifests, cold, warm))}")
+        print(f"changed_counts_picked_up={touched['summary']['canonical_listing_count'] == warm['summary']['canonical_listing_count'] + touched_zips}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the cached injection manifest build.")
+    parser.add_argument("--zips", type=int, default=300, help="ZIP folders per provider.")
+    parser.add_argument("--listings-per-zip", type=int, default=400)
+    parser.add_argument("--touched-zips", type=int, default=5)
+    parser.add_argument("--hash-workers", type=int, nargs="+", default=[1, 0], help="Thread counts to compare (0 = one per CPU).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.zips, args.listings_per_zip, args.touched_zips, args.hash_workers)
+
+
+if __name__ == "__main__":
+    main()
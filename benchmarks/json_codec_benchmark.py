@@ -0,0 +1,109 @@
+"""Benchmark the JSON codec on canonical listing and PropertyDetails payloads.
+
+Usage:
+    python benchmarks/json_codec_benchmark.py [--files 200] [--repeat 3]
+
+Reads up to ``--files`` of the newest canonical_listings_*.json files under
+Data/Fetched and *_property_details.json files under Data/PropertyDetails, then
+reports load and dump throughput (MB/s) for the stdlib json module (dumping with
+indent=4, as the files were written before) against json_codec (whichever backend
+is installed, dumping compact). Without local data, synthetic payloads are used.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import time
+
+from re_analyzer.utility import json_codec
+from re_analyzer.utility.utility import DATA_PATH, PROPERTY_DETAILS_PATH
+
+
+def _newest(pattern, limit):
+    return sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)[:limit]
+
+
+def _synthetic_canonical(rng, count=400):
+    return json.dumps([
+        {
+            "canonical_property_id": f"prop-{index}",
+            "address": f"{rng.randrange(1, 9999)} Example St, Miami, FL 33131",
+            "price": rng.randrange(120_000, 3_000_000),
+            "rent_estimate": rng.randrange(900, 12_000),
+            "latitude": 25.7 + rng.random() / 10,
+            "longitude": -80.2 - rng.random() / 10,
+            "raw": {"imgSrc": f"https://photos.example.com/{index}.jpg", "hoaFee": rng.randrange(0, 900)},
+        }
+        for index in range(count)
+    ], indent=4).encode("utf-8")
+
+
+def _synthetic_details(rng):
+    property_info = {
+        "zpid": rng.randrange(10**7, 10**8),
+        "price": rng.randrange(120_000, 3_000_000),
+        "resoFacts": {f"fact{index}": rng.random() for index in range(200)},
+        "originalPhotos": [{"mixedSources": {"jpeg": [{"url": f"https://photos.example.com/{index}.jpg", "width": 384}]}} for index in range(40)],
+        "description": "Lorem ipsum " * 200,
+    }
+    return json.dumps({
+        "props": {"pageProps": {"componentProps": {"gdpClientCache": {"key": {"property": property_info}}}}},
+        "zestimateHistory": [{"Date": f"2024-{month:02d}-01", "Price": rng.randrange(100_000, 900_000)} for month in range(1, 13)],
+    }, indent=4).encode("utf-8")
+
+
+def load_payloads(file_count):
+    canonical = _newest(os.path.join(DATA_PATH, "Fetched", "*", "*", "canonical_listings_*.json"), file_count)
+    details = _newest(os.path.join(PROPERTY_DETAILS_PATH, "*", "*_property_details.json"), file_count)
+    rng = random.Random(7)
+    payloads = {}
+    for name, paths, synthetic in (("canonical", canonical, _synthetic_canonical), ("property_details", details, _synthetic_details)):
+        if paths:
+            payloads[name] = [open(path, "rb").read() for path in paths]
+        else:
+            payloads[f"{name} (synthetic)"] = [synthetic(rng) for _ in range(file_count)]
+    return payloads
+
+
+def _throughput(function, items, total_bytes, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - started)
+    return total_bytes / (1024 * 1024) / max(best, 1e-9)
+
+
+def run_benchmark(file_count, repeat):
+    print(f"json_codec backend={json_codec.BACKEND}")
+    for name, blobs in load_payloads(file_count).items():
+        total_bytes = sum(len(blob) for blob in blobs)
+        documents = [json.loads(blob) for blob in blobs]
+        stdlib_load = _throughput(json.loads, blobs, total_bytes, repeat)
+        codec_load = _throughput(json_codec.loads, blobs, total_bytes, repeat)
+        stdlib_dump = _throughput(lambda document: json.dumps(document, indent=4), documents, total_bytes, repeat)
+        codec_dump = _throughput(json_codec.dumps, documents, total_bytes, repeat)
+        compact_bytes = sum(len(json_codec.dumps(document).encode("utf-8")) for document in documents)
+        print(f"{name}: files={len(blobs)} MB={total_bytes / (1024 * 1024):.1f} compact_MB={compact_bytes / (1024 * 1024):.1f}")
+        print(f"  load  stdlib={stdlib_load:.1f} MB/s codec={codec_load:.1f} MB/s speedup={codec_load / stdlib_load:.1f}x")
+        print(f"  dump  stdlib(indent=4)={stdlib_dump:.1f} MB/s codec(compact)={codec_dump:.1f} MB/s speedup={codec_dump / stdlib_dump:.1f}x")
+        print(f"  round_trip_identical={all(json_codec.loads(json_codec.dumps(document)) == document for document in documents)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark stdlib json against json_codec on bulk data payloads.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
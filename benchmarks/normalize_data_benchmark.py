@@ -0,0 +1,117 @@
+"""Benchmark the canonical listing transform used by the normalize_data BUILD step.
+
+Usage:
+    python benchmarks/normalize_data_benchmark.py --listings 500000
+
+Generates synthetic canonical listings shaped like the provider payloads, then times
+the per-listing ``listing_to_row`` path against the batched ``listings_to_columns``
+path (each including the Arrow table build) and checks that both produce
+byte-identical Parquet output.
+"""
+
+import argparse
+import random
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from re_analyzer.scrapers import normalize_data
+
+
+SCRAPED_AT = "2026-05-28T19:35:00"
+PROVIDERS = ("zillow", "redfin", "realtor")
+HOME_TYPES = ("SINGLE_FAMILY", "CONDO", "TOWNHOUSE", None)
+
+
+def _raw_payload(rng, index):
+    raw = {}
+    roll = rng.random()
+    if roll < 0.4:
+        raw["imgSrc"] = f"https://photos.example.com/{index}.jpg"
+    elif roll < 0.6:
+        raw["primary_photo"] = {"href": f"https://photos.example.com/p/{index}.jpg"}
+    if rng.random() < 0.3:
+        raw[rng.choice(("hoaFee", "monthlyHoa", "hoa"))] = rng.choice((rng.randrange(0, 900), str(rng.randrange(0, 900)), "n/a"))
+    if rng.random() < 0.25:
+        raw["annualHomeownersInsurance"] = rng.randrange(900, 9000)
+    return raw
+
+
+def synthetic_listings(listing_count, seed=7):
+    rng = random.Random(seed)
+    listings = []
+    for index in range(listing_count):
+        price = rng.randrange(120_000, 3_000_000, 500)
+        listing = {
+            "canonical_property_id": f"prop-{index}",
+            "source_name": rng.choice(PROVIDERS),
+            "source_property_id": str(10_000_000 + index),
+            "address": f"{rng.randrange(1, 9999)} Example St",
+            "city": "Miami",
+            "state": "FL",
+            "zip_code": "33131",
+            "price": price if rng.random() < 0.97 else None,
+            "rent_estimate": rng.randrange(900, 12_000) if rng.random() < 0.8 else None,
+            "year_built": rng.randrange(1920, 2025),
+            "beds": rng.randrange(0, 7),
+            "baths": rng.choice((1, 1.5, 2, 2.5, 3, None)),
+            "living_area": rng.randrange(400, 6000),
+            "lot_size": rng.randrange(0, 20_000) if rng.random() < 0.7 else None,
+            "home_type": rng.choice(HOME_TYPES),
+            "latitude": 25.7 + rng.random() / 10,
+            "longitude": -80.2 - rng.random() / 10,
+            "url": f"https://www.example.com/homedetails/{index}",
+            "status": "Active",
+            "raw": _raw_payload(rng, index),
+        }
+        if rng.random() < 0.5:
+            listing["tax_history"] = [{"taxPaid": round(price * rng.uniform(0.01, 0.025), 2), "value": round(price * 0.85)}]
+        listings.append(listing)
+    return listings
+
+
+def _parquet_bytes(table):
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="snappy")
+    return sink.getvalue().to_pybytes()
+
+
+def _row_table(listings):
+    return pa.Table.from_pylist([normalize_data.listing_to_row(listing, SCRAPED_AT) for listing in listings])
+
+
+def _column_table(listings):
+    return pa.Table.from_pydict(normalize_data.listings_to_columns(listings, SCRAPED_AT))
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def run_benchmark(listing_count):
+    listings = synthetic_listings(listing_count)
+    row_table, row_seconds = _timed(_row_table, listings)
+    column_table, column_seconds = _timed(_column_table, listings)
+    print(f"listings={listing_count}")
+    print(f"listing_to_row: {row_seconds:.3f}s rows_per_second={listing_count / max(row_seconds, 1e-9):,.0f}")
+    print(f"listings_to_columns: {column_seconds:.3f}s rows_per_second={listing_count / max(column_seconds, 1e-9):,.0f}")
+    print(f"identical_parquet={_parquet_bytes(row_table) == _parquet_bytes(column_table)}")
+    print(f"speedup={row_seconds / max(column_seconds, 1e-9):.1f}x")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs batched canonical listing transforms.")
+    parser.add_argument("--listings", type=int, default=500_000)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.listings)
+
+
+if __name__ == "__main__":
+    main()
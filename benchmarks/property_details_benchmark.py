@@ -0,0 +1,89 @@
+"""Benchmark full vs lazy decoding of PropertyDetails pages.
+
+Usage:
+    python benchmarks/property_details_benchmark.py --files 200 --filler-kb 400
+
+Writes synthetic page JSON whose property subtree sits beside large unrelated
+subtrees (as on real detail pages), then times and measures the peak traced memory
+of a full json_codec decode + slim_property_details against
+load_slim_property_details, checking that both return the same result.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from re_analyzer.analyzers import iterator
+from re_analyzer.utility import json_codec
+
+
+def synthetic_page(rng, zpid, filler_kb):
+    filler = [{"id": index, "caption": "x" * 80, "score": rng.random()} for index in range(filler_kb * 1024 // 120)]
+    property_info = {
+        "zpid": zpid, "zipcode": "33131", "price": rng.randrange(200_000, 2_000_000), "bedrooms": 3,
+        "originalPhotos": [{"mixedSources": {"jpeg": [{"url": f"https://photos.example.com/{zpid}/{index}.jpg"}]}} for index in range(40)],
+        "resoFacts": {"hasGarage": True, "atAGlanceFacts": [{"factLabel": "Type", "factValue": "SingleFamily"}]},
+        "nearbyHomes": filler[: len(filler) // 4],
+    }
+    return {
+        "props": {"pageProps": {
+            "componentProps": {"gdpClientCache": {f"ForSaleDoubleScrollFullRenderQuery{zpid}": {"property": property_info}}},
+            "apolloState": {"tracking": filler},
+        }},
+        "page": {"layout": filler},
+        "zestimateHistory": [{"Date": f"2024-{month:02d}-01", "Price": 500_000 + month} for month in range(1, 13)],
+    }
+
+
+def _full_decode(path):
+    property_details = json_codec.load_file(path)
+    return iterator.slim_property_details(property_details) if "props" in property_details else {}
+
+
+def _measure(function, paths):
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = [function(path) for path in paths]
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, seconds, peak
+
+
+def run_benchmark(file_count, filler_kb):
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for zpid in range(file_count):
+            path = os.path.join(directory, f"{zpid}_property_details.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(synthetic_page(rng, zpid, filler_kb), file)
+            paths.append(path)
+        megabytes = sum(os.path.getsize(path) for path in paths) / 1e6
+        full, full_seconds, full_peak = _measure(_full_decode, paths)
+        lazy, lazy_seconds, lazy_peak = _measure(iterator.load_slim_property_details, paths)
+    print(f"files={file_count} total_mb={megabytes:.1f} backend={json_codec.BACKEND}")
+    print(f"full decode: {full_seconds:.3f}s peak_traced_mb={full_peak / 1e6:.1f}")
+    print(f"lazy extract: {lazy_seconds:.3f}s peak_traced_mb={lazy_peak / 1e6:.1f}")
+    print(f"identical={full == lazy}")
+    print(f"speedup={full_seconds / max(lazy_seconds, 1e-9):.1f}x")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark full vs lazy PropertyDetails decoding.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--filler-kb", type=int, default=400)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.files, args.filler_kb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark the re_metrics_processor metrics DataFrame build.
+
+Usage:
+    python benchmarks/re_metrics_benchmark.py --properties 100000
+
+Generates synthetic slim property_info dicts, then times the previous per-row
+build (a list of metric dicts handed to pd.DataFrame, reproduced below) against
+the columnar ``property_metrics_df``, reports the deep memory usage of both
+DataFrames, and checks that the values agree (to float32 precision).
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from re_analyzer.processors import re_metrics_processor
+
+
+HOME_TYPES = ("SINGLE_FAMILY", "CONDO", "TOWNHOUSE", "MULTI_FAMILY", None)
+CITIES = ("Miami", "Miami Beach", "Hialeah", "Doral", "Coral Gables", "Homestead")
+
+
+def synthetic_property_infos(property_count, seed=7):
+    rng = random.Random(seed)
+    property_infos = []
+    for index in range(property_count):
+        property_info = {
+            "zpid": 40_000_000 + index,
+            "zipcode": str(rng.randrange(33101, 33199)),
+            "streetAddress": f"{rng.randrange(1, 9999)} Example St",
+            "city": rng.choice(CITIES),
+            "hdpUrl": f"/homedetails/{40_000_000 + index}_zpid/",
+            "price": rng.randrange(120_000, 3_000_000, 500) if rng.random() < 0.97 else None,
+            "rentZestimate": rng.randrange(900, 12_000) if rng.random() < 0.85 else None,
+            "yearBuilt": rng.randrange(1920, 2025) if rng.random() < 0.95 else None,
+            "bedrooms": rng.randrange(0, 7),
+            "bathrooms": rng.choice((1, 1.5, 2, 2.5, 3, None)),
+            "propertyTaxRate": rng.choice((1.02, 1.89, None)),
+            "livingArea": rng.randrange(400, 6000) if rng.random() < 0.95 else None,
+            "lotSize": rng.randrange(0, 20_000) if rng.random() < 0.7 else None,
+            "homeType": rng.choice(HOME_TYPES),
+            "mortgageRates": {"thirtyYearFixedRate": rng.choice((6.1, 6.5, 7.0))} if rng.random() < 0.9 else None,
+            "annualHomeownersInsurance": rng.randrange(900, 9000) if rng.random() < 0.8 else None,
+            "monthlyHoaFee": rng.randrange(0, 900) if rng.random() < 0.4 else None,
+        }
+        if rng.random() < 0.9:
+            property_info["originalPhotos"] = [{"mixedSources": {"jpeg": [{"url": f"s/{index}"}, {"url": f"l/{index}"}]}}]
+        property_infos.append(property_info)
+    return property_infos
+
+
+def _row_metrics(property_info):
+    """The per-row metrics build property_metrics_df replaced."""
+    MONTHS_IN_YEAR = re_metrics_processor.MONTHS_IN_YEAR
+    zpid = property_info.get('zpid', 0) or 0
+    zip_code = property_info.get('zipcode', 0) or 0
+    monthly_restimate = property_info.get('rentZestimate', 0) or 0
+    purchase_price = property_info.get('price', 1)
+    purchase_price = int(purchase_price) if purchase_price else 1
+    year_built = property_info.get('yearBuilt', 1960) or 1960
+    bedrooms = property_info.get('bedrooms', 0) or 0
+    bathrooms = property_info.get('bathrooms', 0) or 0
+    annual_property_tax_rate = property_info.get('propertyTaxRate', 0) or 0
+    living_area = property_info.get('livingArea', 0)
+    living_area = int(living_area) if living_area else 0
+    lot_size = property_info.get('lotSize', 0) or living_area
+    home_type = property_info.get('homeType', 'SINGLE_FAMILY') or 'SINGLE_FAMILY'
+    annual_mortgage_rate = property_info.get('mortgageRates', {"thirtyYearFixedRate": 6})
+    if annual_mortgage_rate:
+        annual_mortgage_rate = annual_mortgage_rate.get('thirtyYearFixedRate', 6)
+    annual_mortgage_rate = annual_mortgage_rate or 6
+    annual_homeowners_insurance = property_info.get('annualHomeownersInsurance', 0) or 0
+    monthly_hoa = property_info.get("monthlyHoaFee", 0) or 0
+    try:
+        image_url = property_info['originalPhotos'][0]['mixedSources']['jpeg'][1]['url']
+    except (KeyError, IndexError):
+        image_url = ''
+    return {
+        'zpid': int(zpid),
+        'street_address': property_info.get('streetAddress', 'No Property Address Located'),
+        'zip_code': int(zip_code),
+        'purchase_price': purchase_price,
+        'monthly_restimate': float(monthly_restimate),
+        'gross_rent_multiplier': purchase_price / (MONTHS_IN_YEAR * monthly_restimate) if monthly_restimate != 0 else -1,
+        'year_built': int(year_built),
+        'bedrooms': int(bedrooms), 'bathrooms': int(bathrooms),
+        'annual_property_tax_rate': float(annual_property_tax_rate),
+        'living_area': int(living_area), 'lot_size': int(lot_size),
+        'home_type': str(home_type),
+        'annual_mortgage_rate': float(annual_mortgage_rate),
+        'monthly_homeowners_insurance': float(annual_homeowners_insurance / MONTHS_IN_YEAR),
+        'monthly_hoa': float(monthly_hoa),
+        'city': property_info.get('city', ''),
+        'image_url': image_url,
+        'property_url': 'https://zillow.com' + property_info.get('hdpUrl', ''),
+        'price_per_sqft': purchase_price / living_area if living_area else purchase_price,
+    }
+
+
+def _row_metrics_df(property_infos):
+    return pd.DataFrame([_row_metrics(property_info) for property_info in property_infos if property_info])
+
+
+def _same_values(row_df, column_df):
+    for column in row_df.columns:
+        expected, actual = row_df[column], column_df[column]
+        if pd.api.types.is_float_dtype(actual):
+            if not np.allclose(expected.to_numpy(dtype=np.float64), actual.to_numpy(dtype=np.float64), rtol=1e-6):
+                return False
+        elif expected.tolist() != actual.astype(object).tolist():
+            return False
+    return True
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def run_benchmark(property_count):
+    property_infos = synthetic_property_infos(property_count)
+    row_df, row_seconds = _timed(_row_metrics_df, property_infos)
+    column_df, column_seconds = _timed(re_metrics_processor.property_metrics_df, property_infos)
+    row_mb = row_df.memory_usage(deep=True).sum() / 1e6
+    column_mb = column_df.memory_usage(deep=True).sum() / 1e6
+    print(f"properties={property_count}")
+    print(f"per-row dicts: {row_seconds:.3f}s memory_mb={row_mb:.1f}")
+    print(f"columnar: {column_seconds:.3f}s memory_mb={column_mb:.1f}")
+    print(f"same_values={_same_values(row_df, column_df)}")
+    print(f"speedup={row_seconds / max(column_seconds, 1e-9):.1f}x")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs columnar metrics DataFrame builds.")
+    parser.add_argument("--properties", type=int, default=100_000)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.properties)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark source reconciliation cluster merging on a synthetic dense ZIP.
+
+Usage:
+    python benchmarks/source_reconciler_benchmark.py --records 20000
+
+Builds one synthetic condo-heavy ZIP, runs the initial clustering once, then times
+``_merge_clusters_with_evidence`` and ``_provider_only_near_misses`` with the blocked
+candidate index against the original all-pairs comparison and checks that both
+produce identical output.
+"""
+
+import argparse
+import random
+import time
+from contextlib import contextmanager
+
+from re_analyzer.scrapers import source_reconciler
+
+
+ZIP_CODE = "33131"
+STREETS = (
+    "Brickell Bay Drive",
+    "Brickell Avenue",
+    "SW 8th Street",
+    "SE 2nd Avenue",
+    "Biscayne Boulevard",
+    "NE 1st Court",
+    "Collins Avenue",
+    "Ocean Drive",
+)
+UNIT_STYLES = ("Apt {unit}", "Unit {unit}", "#{unit}")
+
+
+def _street_variant(street, rng):
+    roll = rng.random()
+    if roll < 0.08:
+        return street.replace("Drive", "Dr").replace("Avenue", "Ave").replace("Street", "St")
+    if roll < 0.12:
+        # Typo variants land in the same block but miss the exact match keys.
+        return street[:-2] + street[-1]
+    if roll < 0.15 and street.split()[0] in {"SW", "SE", "NE"}:
+        return " ".join(street.split()[1:])
+    return street
+
+
+def synthetic_records(record_count, seed=7):
+    rng = random.Random(seed)
+    records = []
+    property_index = 0
+    while len(records) < record_count:
+        street = STREETS[property_index % len(STREETS)]
+        street_number = 100 + (property_index // 400) * 10
+        unit = "" if property_index % 9 == 0 else str(100 + property_index % 400)
+        price = rng.randrange(180_000, 2_500_000, 500)
+        providers = [provider for provider in source_reconciler.DEFAULT_PROVIDERS if rng.random() < 0.7] or ["zillow"]
+        for provider in providers:
+            address = f"{street_number} {_street_variant(street, rng)}"
+            if unit:
+                address = f"{address} {rng.choice(UNIT_STYLES).format(unit=unit)}"
+            item = {
+                "source_property_id": f"{provider}-{property_index}",
+                "address": f"{address}, Miami, FL {ZIP_CODE}",
+                "city": "Miami",
+                "state": "FL",
+                "zip_code": ZIP_CODE,
+                "price": price if rng.random() < 0.9 else round(price * rng.uniform(0.97, 1.03)),
+                "home_type": "CONDO" if unit else "SINGLE_FAMILY",
+                "raw": {},
+            }
+            records.append(source_reconciler._record_from_dict(provider, item))
+        property_index += 1
+    return records[:record_count]
+
+
+def _single_block(summaries):
+    return [0] * len(summaries), {0: list(range(len(summaries)))}
+
+
+@contextmanager
+def all_pairs_baseline():
+    """Put every summary in one block with no prefilter, i.e. the original all-pairs scan."""
+    similarity_blocks = source_reconciler._similarity_blocks
+    similarity_upper_bound = source_reconciler._similarity_upper_bound
+    source_reconciler._similarity_blocks = _single_block
+    source_reconciler._similarity_upper_bound = lambda left, right: 1.0
+    try:
+        yield
+    finally:
+        source_reconciler._similarity_blocks = similarity_blocks
+        source_reconciler._similarity_upper_bound = similarity_upper_bound
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def run_benchmark(record_count, skip_baseline=False):
+    records = synthetic_records(record_count)
+    fallback_rent_ratio = source_reconciler._rent_to_value_ratio(records)
+    clusters = source_reconciler._cluster_records(records)
+    summaries = [
+        source_reconciler._cluster_summary(cluster, fallback_rent_ratio=fallback_rent_ratio)
+        for cluster in clusters
+    ]
+    print(f"records={len(records)} initial_clusters={len(summaries)}")
+
+    (blocked_clusters, blocked_evidence), blocked_merge_seconds = _timed(
+        source_reconciler._merge_clusters_with_evidence, summaries, fallback_rent_ratio,
+    )
+    blocked_near_misses, blocked_near_miss_seconds = _timed(
+        source_reconciler._provider_only_near_misses, blocked_clusters, source_reconciler.DEFAULT_PROVIDERS,
+    )
+    print(f"blocked merge: {blocked_merge_seconds:.3f}s merged_clusters={len(blocked_clusters)} evidence={len(blocked_evidence)}")
+    print(f"blocked near misses: {blocked_near_miss_seconds:.3f}s counts={blocked_near_misses['counts']}")
+    if skip_baseline:
+        return
+
+    with all_pairs_baseline():
+        (baseline_clusters, baseline_evidence), baseline_merge_seconds = _timed(
+            source_reconciler._merge_clusters_with_evidence, summaries, fallback_rent_ratio,
+        )
+        baseline_near_misses, baseline_near_miss_seconds = _timed(
+            source_reconciler._provider_only_near_misses, baseline_clusters, source_reconciler.DEFAULT_PROVIDERS,
+        )
+    print(f"all-pairs merge: {baseline_merge_seconds:.3f}s merged_clusters={len(baseline_clusters)} evidence={len(baseline_evidence)}")
+    print(f"all-pairs near misses: {baseline_near_miss_seconds:.3f}s counts={baseline_near_misses['counts']}")
+    print(f"identical_evidence={blocked_evidence == baseline_evidence} identical_clusters={blocked_clusters == baseline_clusters}")
+    print(f"identical_near_misses={blocked_near_misses == baseline_near_misses}")
+    print(f"merge_speedup={baseline_merge_seconds / max(blocked_merge_seconds, 1e-9):.1f}x")
+    print(f"near_miss_speedup={baseline_near_miss_seconds / max(blocked_near_miss_seconds, 1e-9):.1f}x")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark blocked vs all-pairs reconciliation cluster merging and near-miss detection.")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--skip-baseline", action="store_true", help="Only time the blocked candidate index.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.records, skip_baseline=args.skip_baseline)
+
+
+if __name__ == "__main__":
+    main()
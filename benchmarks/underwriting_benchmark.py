@@ -0,0 +1,107 @@
+"""Benchmark catalog-wide underwriting and ranking.
+
+Usage:
+    python benchmarks/underwriting_benchmark.py --listings 500000
+    python benchmarks/underwriting_benchmark.py --listings 100000 --sweep-rates 40 --sweep-down-payments 25
+
+Builds a synthetic property_static_df-shaped frame, then times ``underwrite_df``
+over every row and ``rank_by_underwriting`` for a full sort and a top-N cut, and
+checks one row against the scalar annuity formula. Also times
+``equity_after_years`` (cached amortization lookups) against the closed-form
+balance computed per row. With --sweep-rates, also times
+``sweep_scenarios`` over a rate x down payment grid and checks one scenario against
+a direct ranking.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from re_analyzer.analyzers import underwriting
+
+
+def synthetic_catalog(listing_count, seed=7):
+    rng = np.random.default_rng(seed)
+    price = rng.integers(120_000, 3_000_000, listing_count).astype(np.int64)
+    return pd.DataFrame({
+        "purchase_price": price,
+        "monthly_restimate": (price * rng.uniform(0.004, 0.009, listing_count)).astype(np.float32),
+        "annual_property_tax_rate": rng.uniform(0.8, 2.2, listing_count).astype(np.float32),
+        "annual_mortgage_rate": rng.choice(np.array([6.1, 6.5, 7.0], dtype=np.float32), listing_count),
+        "monthly_homeowners_insurance": (price * 0.012 / 12).astype(np.float32),
+        "monthly_hoa": np.where(rng.random(listing_count) < 0.4, rng.integers(0, 900, listing_count), 0).astype(np.float32),
+        "living_area": rng.integers(400, 6000, listing_count).astype(np.int32),
+    })
+
+
+def _scalar_payment(loan_amount, annual_rate_pct, years=30):
+    monthly_rate = annual_rate_pct / 100 / 12
+    return loan_amount * monthly_rate / (1 - (1 + monthly_rate) ** -(years * 12))
+
+
+def _direct_balance(catalog_df, years, term_years=30):
+    loan_amount = catalog_df["purchase_price"].to_numpy(dtype=np.float64) * 0.8
+    monthly_rate = catalog_df["annual_mortgage_rate"].to_numpy(dtype=np.float64) / 100 / 12
+    growth, total_growth = (1 + monthly_rate) ** (years * 12), (1 + monthly_rate) ** (term_years * 12)
+    return loan_amount * (total_growth - growth) / (total_growth - 1)
+
+
+def _timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def run_sweep(catalog_df, rate_count, down_payment_count, limit):
+    scenarios = underwriting.scenario_grid(
+        annual_mortgage_rate=np.linspace(4.0, 9.0, rate_count),
+        down_payment_pct=np.linspace(0.05, 1.0, down_payment_count),
+    )
+    sweep_df, sweep_seconds = _timed(underwriting.sweep_scenarios, catalog_df, scenarios, top_k=limit)
+    last = scenarios.iloc[-1]
+    expected = underwriting.rank_by_underwriting(
+        catalog_df.assign(annual_mortgage_rate=last["annual_mortgage_rate"]), limit=limit, down_payment_pct=last["down_payment_pct"],
+    )
+    pairs = len(catalog_df) * len(scenarios)
+    print(f"sweep scenarios={len(scenarios)} pairs={pairs:,}: {sweep_seconds:.3f}s pairs_per_second={pairs / max(sweep_seconds, 1e-9):,.0f}")
+    print(f"sweep_matches_direct_ranking={list(sweep_df[sweep_df['scenario'] == len(scenarios) - 1]['listing']) == list(expected.index)}")
+
+
+def run_benchmark(listing_count, limit):
+    catalog_df = synthetic_catalog(listing_count)
+    underwriting_df, underwrite_seconds = _timed(underwriting.underwrite_df, catalog_df)
+    _, rank_seconds = _timed(underwriting.rank_by_underwriting, catalog_df)
+    _, top_seconds = _timed(underwriting.rank_by_underwriting, catalog_df, limit=limit)
+    equity_df, equity_seconds = _timed(underwriting.equity_after_years, catalog_df, 5)
+    direct_balance, direct_seconds = _timed(_direct_balance, catalog_df, 5)
+    first = catalog_df.iloc[0]
+    expected_payment = _scalar_payment(float(first["purchase_price"]) * 0.8, float(first["annual_mortgage_rate"]))
+    print(f"listings={listing_count}")
+    print(f"underwrite_df: {underwrite_seconds:.3f}s rows_per_second={listing_count / max(underwrite_seconds, 1e-9):,.0f}")
+    print(f"rank (full sort): {rank_seconds:.3f}s")
+    print(f"rank (top {limit}): {top_seconds:.3f}s")
+    print(f"equity after 5 years: cached schedules {equity_seconds:.3f}s, direct closed form {direct_seconds:.3f}s")
+    print(f"equity_matches_closed_form={np.allclose(equity_df['remaining_balance'], direct_balance, rtol=1e-5)}")
+    print(f"payment_matches_scalar={np.isclose(underwriting_df['principal_and_interest'].iloc[0], expected_payment)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark catalog-wide underwriting.")
+    parser.add_argument("--listings", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--sweep-rates", type=int, default=0, help="Rates in the scenario grid (0 skips the sweep).")
+    parser.add_argument("--sweep-down-payments", type=int, default=25)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_benchmark(args.listings, args.limit)
+    if args.sweep_rates:
+        run_sweep(synthetic_catalog(args.listings), args.sweep_rates, args.sweep_down_payments, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,39 @@
 import glob
 import os
 import json
+import re
+import sqlite3
 import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import timedelta
+from itertools import repeat
 
-from re_analyzer.utility.utility import PROPERTY_DETAILS_PATH
+from re_analyzer.utility import json_codec
+from re_analyzer.utility.utility import PROPERTY_DATA_PATH, PROPERTY_DETAILS_PATH, ensure_directory_exists
+
+
+PROPERTY_DETAILS_CACHE_PATH = os.path.join(PROPERTY_DATA_PATH, 'property_details_cache.sqlite')
+# The property_info fields read by the processors; everything else in the page payload is dropped.
+PROPERTY_INFO_FIELDS = (
+    'zpid', 'zipcode', 'streetAddress', 'city', 'hdpUrl', 'price', 'rentZestimate', 'yearBuilt',
+    'bedrooms', 'bathrooms', 'propertyTaxRate', 'livingArea', 'lotSize', 'homeType', 'mortgageRates',
+    'annualHomeownersInsurance', 'monthlyHoaFee', 'originalPhotos', 'resoFacts',
+)
+# Bump when the cache's row layout or slim_property_info changes; PROPERTY_INFO_FIELDS is folded in.
+PROPERTY_DETAILS_CACHE_SCHEMA = 1
+# Files handed to a worker process at a time in the parallel modes.
+PARSE_CHUNK_SIZE = 64
+
+_JSON_DECODER = json.JSONDecoder()
+_DOCUMENT_START_RE = re.compile(r'\s*\{')
+# Key path from the top-level object down to the gdp/gdpClientCache objects.
+_COMPONENT_PROPS_PATH = ('props', 'pageProps', 'componentProps')
+_OBJECT_MEMBER_RES = {
+    key: re.compile(r'"%s"\s*:\s*\{' % key) for key in _COMPONENT_PROPS_PATH + ('gdp', 'gdpClientCache')
+}
+_FIRST_ENTRY_RE = re.compile(r'\s*"(?:[^"\\]|\\.)*"\s*:\s*(?=\{)')
+_KEY_SEPARATOR_RE = re.compile(r'\s*:\s*')
 
 
 def print_analysis_progress(start_time, analysis_index, analysis_len):
@@ -18,23 +47,156 @@ def print_analysis_progress(start_time, analysis_index, analysis_len):
     progress_percentage = 100 * (analysis_index+1) / analysis_len
     print(f"Analysing property [{analysis_index+1} | {analysis_len}]. {progress_percentage:.2f}% analyzed, time remaining: ~{formatted_time_remaining}", end=' '*30 + '\r')
 
-def property_details_iterator():
+def property_details_files():
     pattern = os.path.join(PROPERTY_DETAILS_PATH, "*", "*_property_details.json")
-    property_detail_files = glob.glob(pattern)
-    num_properties = len(property_detail_files)
+    return glob.glob(pattern)
+
+def _apply_to_chunk(function, json_file_paths):
+    return [(json_file_path, function(json_file_path)) for json_file_path in json_file_paths]
+
+def iter_property_details_files(function, json_file_paths, workers=1, ordered=True):
+    """Yield (path, function(path)) for each file, sharding the files across a process pool when workers != 1.
 
+    workers <= 0 uses one process per CPU. With ordered=False results come back as
+    soon as each chunk finishes. Progress is printed per file either way.
+    """
+    if not workers or workers < 0:
+        workers = os.cpu_count() or 1
+    num_files = len(json_file_paths)
     start_time = time.time()
+    if workers == 1:
+        results = ((json_file_path, function(json_file_path)) for json_file_path in json_file_paths)
+        for json_file_index, result in enumerate(results):
+            print_analysis_progress(start_time, json_file_index, num_files)
+            yield result
+        return
+
+    chunks = [json_file_paths[index:index + PARSE_CHUNK_SIZE] for index in range(0, num_files, PARSE_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            chunk_results = executor.map(_apply_to_chunk, repeat(function), chunks)
+        else:
+            futures = [executor.submit(_apply_to_chunk, function, chunk) for chunk in chunks]
+            chunk_results = (future.result() for future in as_completed(futures))
+        json_file_index = 0
+        for chunk_result in chunk_results:
+            for result in chunk_result:
+                print_analysis_progress(start_time, json_file_index, num_files)
+                json_file_index += 1
+                yield result
+
+def _load_property_details(json_file_path):
+    return json_codec.load_file(json_file_path)
+
+def _nested_at_depth(text, start, end, depth):
+    """Whether the JSON value spanning text[start:end] is a member ``depth`` objects deep.
+
+    Checks whichever side of the value is shorter: the text before it must open
+    exactly ``depth`` objects, or the text after it must close exactly that many.
+    """
+    if start <= len(text) - end:
+        probe = text[:start] + '0' + '}' * depth
+    else:
+        probe = '{"":' * depth + '0' + text[end:]
+    try:
+        json.loads(probe)
+    except ValueError:
+        return False
+    return True
+
+def _decode_value(text, value_start, depth):
+    """(value,) for the value at value_start if it sits ``depth`` objects deep, else None."""
+    try:
+        value, end = _JSON_DECODER.raw_decode(text, value_start)
+    except ValueError:
+        return None
+    return (value,) if _nested_at_depth(text, value_start, end, depth) else None
+
+def _member_object(text, body_start, key):
+    """(found, body_start) of object member ``key`` in the object whose body starts at body_start.
+
+    Only the first "key": { after body_start is considered. It is accepted when
+    the text before it in the enclosing object is whole members, i.e. the key
+    is a direct member; otherwise body_start is None. found is False when the
+    key does not occur at all.
+    """
+    match = _OBJECT_MEMBER_RES[key].search(text, body_start)
+    if match is None:
+        return False, None
+    try:
+        json.loads('{' + text[body_start:match.start()] + '"":0}')
+    except ValueError:
+        return True, None
+    return True, match.end()
+
+def _property_info_from_text(text):
+    """(property_info,) decoded from the first gdp entry alone, or None if it cannot be located unambiguously."""
+    document = _DOCUMENT_START_RE.match(text)
+    body_start = document and document.end()
+    for key in _COMPONENT_PROPS_PATH:
+        if body_start is None:
+            return None
+        _, body_start = _member_object(text, body_start, key)
+    if body_start is None:
+        return None
+    # gdp wins over gdpClientCache, so gdpClientCache is only tried when no gdp key follows.
+    for key in ('gdp', 'gdpClientCache'):
+        found, property_cache_start = _member_object(text, body_start, key)
+        if not found:
+            continue
+        first_entry = property_cache_start and _FIRST_ENTRY_RE.match(text, property_cache_start)
+        if not first_entry:
+            return None
+        try:
+            entry, _ = _JSON_DECODER.raw_decode(text, first_entry.end())
+        except ValueError:
+            return None
+        return (entry.get('property') or None,)
+    return None
+
+def _zestimate_history_from_text(text):
+    key_start = text.rfind('"zestimateHistory"')
+    if key_start == -1:
+        return None, False
+    separator = _KEY_SEPARATOR_RE.match(text, key_start + len('"zestimateHistory"'))
+    zestimate_history = separator and _decode_value(text, separator.end(), 1)
+    return (zestimate_history[0], True) if zestimate_history else (None, None)
+
+def load_slim_property_details(json_file_path):
+    """slim_property_details() of a PropertyDetails file, decoding only the property subtree and zestimateHistory.
+
+    The first gdp/gdpClientCache entry and zestimateHistory are found by key and
+    decoded on their own. The entry is only accepted when each key on its path
+    (props > pageProps > componentProps > gdp|gdpClientCache) is a direct member
+    of its parent, and zestimateHistory once the rest of the document confirms it
+    is top-level; any page where either check fails is decoded in full.
+    """
+    with open(json_file_path, 'r', encoding='utf-8') as json_file:
+        text = json_file.read()
+    property_info = _property_info_from_text(text)
+    zestimate_history, has_zestimate_history = _zestimate_history_from_text(text) if property_info else (None, None)
+    if has_zestimate_history is None:
+        property_details = json_codec.loads(text)
+        return slim_property_details(property_details) if 'props' in property_details else {}
+    property_info = property_info[0]
+    component_props = {'gdp': {'property': {'property': slim_property_info(property_info)}}} if property_info else {}
+    slim_details = {'props': {'pageProps': {'componentProps': component_props}}}
+    if has_zestimate_history:
+        slim_details['zestimateHistory'] = zestimate_history
+    return slim_details
+
+def property_details_iterator(workers=1, ordered=True):
+    """Yield the page JSON of every PropertyDetails file that has page props.
 
-    # Use glob to find all matching files
-    for json_file_index, json_file_path in enumerate(property_detail_files):
-        print_analysis_progress(start_time, json_file_index, num_properties)
-        # Open and load JSON data from the file
-        with open(json_file_path, 'r') as json_file:
-            property_details = json.load(json_file)
-            # Yield the loaded JSON data
-            if 'props' not in property_details:
-                continue
-            yield property_details
+    With workers != 1 the files are decoded in a process pool and each worker sends
+    back only slim_property_details(), which get_property_info_from_property_details
+    reads like the full page.
+    """
+    loader = _load_property_details if workers == 1 else load_slim_property_details
+    for _, property_details in iter_property_details_files(loader, property_details_files(), workers=workers, ordered=ordered):
+        if 'props' not in property_details:
+            continue
+        yield property_details
 
 def get_property_info_from_property_details(property_details):
     property_data = property_details['props']['pageProps']['componentProps']
@@ -50,3 +212,142 @@ def get_property_info_from_property_details(property_details):
     if not property_info:
         return None
     return property_info
+
+
+def slim_property_info(property_info):
+    slim_info = {field: property_info[field] for field in PROPERTY_INFO_FIELDS if field in property_info}
+    # Only the first photo is ever used (for the listing image).
+    if slim_info.get('originalPhotos'):
+        slim_info['originalPhotos'] = slim_info['originalPhotos'][:1]
+    return slim_info
+
+
+def slim_property_details(property_details):
+    """Minimal page JSON holding only the slim property_info and zestimateHistory."""
+    property_info = get_property_info_from_property_details(property_details)
+    component_props = {'gdp': {'property': {'property': slim_property_info(property_info)}}} if property_info else {}
+    slim_details = {'props': {'pageProps': {'componentProps': component_props}}}
+    if 'zestimateHistory' in property_details:
+        slim_details['zestimateHistory'] = property_details['zestimateHistory']
+    return slim_details
+
+
+# Cache paths already refreshed by this process. Files changed after that are only picked
+# up with force=True; a cache rebuilt for a new version drops out and is refreshed again.
+_REFRESHED_CACHE_PATHS = set()
+
+def property_details_cache_version():
+    """Version stamp of the cache rows (SQLite user_version): the schema number and the slim fields."""
+    stamp = json.dumps([PROPERTY_DETAILS_CACHE_SCHEMA, list(PROPERTY_INFO_FIELDS)]).encode('utf-8')
+    return zlib.crc32(stamp) & 0x7fffffff or 1
+
+
+def _open_property_details_cache(cache_path):
+    ensure_directory_exists(os.path.dirname(cache_path))
+    connection = sqlite3.connect(cache_path)
+    version = property_details_cache_version()
+    if connection.execute("PRAGMA user_version").fetchone()[0] != version:
+        # Rows slimmed to other fields (or a cache from before versioning): rebuild from the JSON files.
+        connection.execute("DROP TABLE IF EXISTS property_details")
+        connection.execute(f"PRAGMA user_version = {version}")
+        _REFRESHED_CACHE_PATHS.discard(cache_path)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS property_details (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            has_props INTEGER NOT NULL,
+            zpid INTEGER,
+            property_info TEXT,
+            zestimate_history TEXT
+        )
+    """)
+    connection.execute("CREATE INDEX IF NOT EXISTS property_details_zpid ON property_details (zpid)")
+    connection.commit()
+    return connection
+
+
+def _cached_property_details_row(json_file_path):
+    stat = os.stat(json_file_path)
+    property_details = load_slim_property_details(json_file_path)
+    if 'props' not in property_details:
+        return (json_file_path, stat.st_size, stat.st_mtime_ns, 0, None, None, None)
+    property_info = get_property_info_from_property_details(property_details)
+    return (
+        json_file_path,
+        stat.st_size,
+        stat.st_mtime_ns,
+        1,
+        int(property_info.get('zpid') or 0) if property_info else None,
+        json_codec.dumps(slim_property_info(property_info)) if property_info else None,
+        json_codec.dumps(property_details['zestimateHistory']) if 'zestimateHistory' in property_details else None,
+    )
+
+
+def refresh_property_details_cache(cache_path=PROPERTY_DETAILS_CACHE_PATH, force=False, workers=1):
+    """Parse new or changed PropertyDetails files into the cache, at most once per process unless forced."""
+    connection = _open_property_details_cache(cache_path)
+    try:
+        if cache_path in _REFRESHED_CACHE_PATHS and not force:
+            return {'parsed': 0, 'reused': None, 'removed': 0}
+        known = {path: (size, mtime_ns) for path, size, mtime_ns in connection.execute("SELECT path, size, mtime_ns FROM property_details")}
+        stats = {'parsed': 0, 'reused': 0, 'removed': 0}
+        changed_files = []
+        for json_file_path in property_details_files():
+            stat = os.stat(json_file_path)
+            if known.pop(json_file_path, None) == (stat.st_size, stat.st_mtime_ns):
+                stats['reused'] += 1
+            else:
+                changed_files.append(json_file_path)
+        for _, row in iter_property_details_files(_cached_property_details_row, changed_files, workers=workers, ordered=False):
+            connection.execute("INSERT OR REPLACE INTO property_details VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            stats['parsed'] += 1
+        # Whatever is left in `known` no longer exists on disk.
+        connection.executemany("DELETE FROM property_details WHERE path = ?", [(path,) for path in known])
+        stats['removed'] = len(known)
+        connection.commit()
+    finally:
+        connection.close()
+    _REFRESHED_CACHE_PATHS.add(cache_path)
+    return stats
+
+
+def cached_property_details_iterator(cache_path=PROPERTY_DETAILS_CACHE_PATH, workers=1):
+    """Yield (property_info, zestimate_history) per PropertyDetails file with page props.
+
+    property_info is the slim dict from slim_property_info (None if the page had none),
+    zestimate_history is None when the file had no zestimateHistory. The first call in
+    a process refreshes the cache (decoding with ``workers`` processes), so each JSON
+    file is decoded at most once per run.
+    """
+    refresh_property_details_cache(cache_path, workers=workers)
+    connection = _open_property_details_cache(cache_path)
+    try:
+        rows = connection.execute(
+            "SELECT property_info, zestimate_history FROM property_details WHERE has_props ORDER BY path"
+        )
+        for property_info, zestimate_history in rows:
+            yield (
+                json_codec.loads(property_info) if property_info is not None else None,
+                json_codec.loads(zestimate_history) if zestimate_history is not None else None,
+            )
+    finally:
+        connection.close()
+
+
+def cached_property_details_records(cache_path=PROPERTY_DETAILS_CACHE_PATH, workers=1):
+    """Yield (zpid, mtime_ns, property_info_json, zestimate_history_json) per cached file with a zpid.
+
+    The JSON columns are returned undecoded so callers can fingerprint records and
+    decode only the ones they need. Rows come in path order, like
+    cached_property_details_iterator.
+    """
+    refresh_property_details_cache(cache_path, workers=workers)
+    connection = _open_property_details_cache(cache_path)
+    try:
+        yield from connection.execute(
+            "SELECT zpid, mtime_ns, property_info, zestimate_history FROM property_details "
+            "WHERE has_props AND zpid ORDER BY path"
+        )
+    finally:
+        connection.close()
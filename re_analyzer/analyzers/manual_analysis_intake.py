@@ -3,6 +3,7 @@ import json
 from pathlib import Path
 import re
 
+from re_analyzer.analyzers import mortgage
 from re_analyzer.utility.utility import DATA_PATH, ensure_directory_exists, load_json, save_json
 
 
@@ -62,6 +63,8 @@ def save_manual_analysis_report(report, slug=None):
     ensure_directory_exists(output_dir)
     payload = dict(report)
     payload.setdefault("generated_at", datetime.now().isoformat())
+    if payload.get("input_assumptions"):
+        payload["input_assumptions"] = _with_loan_terms(payload["input_assumptions"])
     output_path = output_dir / f"{_slugify(slug or payload.get('address'))}.json"
     save_json(payload, output_path)
     return str(output_path)
@@ -80,6 +83,33 @@ def load_manual_analysis_reports():
     return reports
 
 
+def _with_loan_terms(assumptions):
+    """assumptions plus the loan_amount, loan_term_years and monthly P&I implied by its price, down payment and rate."""
+    assumptions = dict(assumptions)
+    if assumptions.get("loan_amount") is None and None not in (assumptions.get("price"), assumptions.get("down_payment_pct")):
+        assumptions["loan_amount"] = assumptions["price"] * (1 - assumptions["down_payment_pct"])
+    if assumptions.get("annual_mortgage_rate") is not None:
+        assumptions.setdefault("loan_term_years", mortgage.DEFAULT_LOAN_TERM_YEARS)
+    principal_and_interest = _principal_and_interest(assumptions)
+    if principal_and_interest is not None:
+        assumptions["principal_and_interest_monthly"] = principal_and_interest
+    return assumptions
+
+
+def _principal_and_interest(assumptions):
+    """The report's monthly P&I, or the cached mortgage kernel's payment when only the loan terms were recorded."""
+    principal_and_interest = assumptions.get("principal_and_interest_monthly")
+    if principal_and_interest is not None or assumptions.get("annual_mortgage_rate") is None:
+        return principal_and_interest
+    loan_amount = assumptions.get("loan_amount")
+    if loan_amount is None:
+        if assumptions.get("price") is None or assumptions.get("down_payment_pct") is None:
+            return None
+        loan_amount = assumptions["price"] * (1 - assumptions["down_payment_pct"])
+    loan_term_years = assumptions.get("loan_term_years") or mortgage.DEFAULT_LOAN_TERM_YEARS
+    return round(float(mortgage.monthly_payment(loan_amount, assumptions["annual_mortgage_rate"], loan_term_years)), 2)
+
+
 def manual_analysis_to_ranking_row(report):
     assumptions = report.get("input_assumptions") or {}
     metrics = report.get("investment_metrics") or {}
@@ -97,7 +127,7 @@ def manual_analysis_to_ranking_row(report):
         "down_payment_pct": assumptions.get("down_payment_pct"),
         "closing_cost_pct": assumptions.get("closing_cost_pct"),
         "cash_in": assumptions.get("cash_in"),
-        "principal_and_interest": assumptions.get("principal_and_interest_monthly"),
+        "principal_and_interest": _principal_and_interest(assumptions),
         "tax_current_annual": assumptions.get("tax_current_annual"),
         "tax_reassessed_annual": assumptions.get("tax_reassessed_annual"),
         "insurance_monthly": assumptions.get("insurance_monthly"),
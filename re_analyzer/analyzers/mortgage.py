@@ -0,0 +1,135 @@
+"""Cached mortgage kernel shared by the underwriting engine and manual analysis.
+
+A catalog holds a handful of distinct (rate, term) pairs, so payments and
+amortization are computed once per pair and then looked up for every loan:
+
+- ``annuity_factor`` is the monthly payment per dollar borrowed, memoized per pair.
+- ``amortization_schedule`` is the per-dollar balance and cumulative interest after
+  each month, memoized per pair as read-only float32 arrays.
+
+The array functions take scalars or arrays broadcast against each other. Rates are
+annual percentages (6.5 = 6.5%), terms are in years.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+MONTHS_IN_YEAR = 12
+DEFAULT_LOAN_TERM_YEARS = 30
+
+AmortizationSchedule = namedtuple('AmortizationSchedule', ['balance', 'cumulative_interest'])
+
+
+@lru_cache(maxsize=4096)
+def annuity_factor(rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS):
+    """Level monthly payment per dollar of a fully amortizing loan."""
+    if not (np.isfinite(rate_pct) and np.isfinite(term_years)) or round(term_years * MONTHS_IN_YEAR) <= 0:
+        return float('nan')
+    payments = round(term_years * MONTHS_IN_YEAR)
+    monthly_rate = rate_pct / 100 / MONTHS_IN_YEAR
+    if monthly_rate == 0:
+        return 1 / payments
+    return float(monthly_rate / -np.expm1(-payments * np.log1p(monthly_rate)))
+
+
+@lru_cache(maxsize=256)
+def amortization_schedule(rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS):
+    """Per-dollar AmortizationSchedule; index k holds the values after k monthly payments."""
+    if np.isnan(annuity_factor(rate_pct, term_years)):
+        schedule = AmortizationSchedule(np.full(1, np.nan, dtype=np.float32), np.full(1, np.nan, dtype=np.float32))
+        for values in schedule:
+            values.setflags(write=False)
+        return schedule
+    payments = round(term_years * MONTHS_IN_YEAR)
+    monthly_rate = rate_pct / 100 / MONTHS_IN_YEAR
+    months = np.arange(payments + 1)
+    if monthly_rate == 0:
+        balance = 1 - months / max(payments, 1)
+    else:
+        growth = np.power(1 + monthly_rate, months, dtype=np.float64)
+        balance = growth - (growth - 1) / monthly_rate * annuity_factor(rate_pct, term_years)
+    balance = np.maximum(balance, 0)
+    # Each payment's interest is the rate times the balance it was charged on.
+    cumulative_interest = np.concatenate([[0.0], np.cumsum(balance[:-1] * monthly_rate)])
+    schedule = AmortizationSchedule(balance.astype(np.float32), cumulative_interest.astype(np.float32))
+    for values in schedule:
+        values.setflags(write=False)
+    return schedule
+
+
+def _factorize(values):
+    values = np.asarray(values, dtype=np.float64)
+    codes, uniques = pd.factorize(values.ravel(), use_na_sentinel=False)
+    return codes.reshape(values.shape), uniques
+
+
+def _unique_pairs(rate_pct, term_years):
+    """((rate, term) per distinct pair, inverse indices, broadcast shape) of broadcast rates and terms."""
+    # Hash-based factorizing stays linear; catalogs hold few distinct rates and terms,
+    # and each input is factorized before broadcasting so scalars cost nothing.
+    rate_codes, rates = _factorize(rate_pct)
+    term_codes, terms = _factorize(term_years)
+    shape = np.broadcast_shapes(rate_codes.shape, term_codes.shape)
+    if len(rates) == 1 or len(terms) == 1:
+        inverse = np.broadcast_to(rate_codes * len(terms) + term_codes, shape).ravel()
+        pair_codes = np.arange(len(rates) * len(terms))
+    else:
+        inverse, pair_codes = pd.factorize(np.broadcast_to(rate_codes * len(terms) + term_codes, shape).ravel())
+    pairs = [(float(rates[code // len(terms)]), float(terms[code % len(terms)])) for code in pair_codes]
+    return pairs, inverse, shape
+
+
+def annuity_factors(rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS):
+    """annuity_factor for arrays of rates and terms, computed once per distinct pair."""
+    pairs, inverse, shape = _unique_pairs(rate_pct, term_years)
+    factors = np.array([annuity_factor(rate, term) for rate, term in pairs], dtype=np.float64)
+    return factors[inverse].reshape(shape)
+
+
+def monthly_payment(loan_amount, rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS):
+    """Monthly principal and interest of each loan."""
+    return np.asarray(loan_amount, dtype=np.float64) * annuity_factors(rate_pct, term_years)
+
+
+def amortization_at(loan_amount, rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS, months_elapsed=0):
+    """AmortizationSchedule of arrays: each loan's balance and interest paid after ``months_elapsed`` payments."""
+    loan_amount = np.asarray(loan_amount, dtype=np.float64)
+    pairs, inverse, pair_shape = _unique_pairs(rate_pct, term_years)
+    shape = np.broadcast_shapes(pair_shape, loan_amount.shape, np.shape(months_elapsed))
+    inverse = np.broadcast_to(inverse.reshape(pair_shape), shape).ravel()
+    schedules = [amortization_schedule(rate, term) for rate, term in pairs]
+    length = max(len(schedule.balance) for schedule in schedules)
+    months = np.broadcast_to(np.asarray(months_elapsed), shape).ravel()
+    months = np.clip(np.rint(months), 0, length - 1).astype(np.intp)
+    lookups = []
+    for field in AmortizationSchedule._fields:
+        table = np.empty((len(schedules), length), dtype=np.float32)
+        for row, schedule in enumerate(schedules):
+            values = getattr(schedule, field)
+            table[row, :len(values)] = values
+            # Past the last payment the values stay where the schedule ended.
+            table[row, len(values):] = values[-1]
+        lookups.append(loan_amount * table[inverse, months].reshape(shape))
+    return AmortizationSchedule(*lookups)
+
+
+def remaining_balance(loan_amount, rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS, months_elapsed=0):
+    """Balance left on each loan after ``months_elapsed`` payments."""
+    return amortization_at(loan_amount, rate_pct, term_years, months_elapsed).balance
+
+
+def interest_paid(loan_amount, rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS, months_elapsed=0):
+    """Total interest paid on each loan over its first ``months_elapsed`` payments."""
+    return amortization_at(loan_amount, rate_pct, term_years, months_elapsed).cumulative_interest
+
+
+def payment_split(loan_amount, rate_pct, term_years=DEFAULT_LOAN_TERM_YEARS, month=1):
+    """(principal, interest) portions of payment number ``month`` (1-based) of each loan."""
+    balance_before = remaining_balance(loan_amount, rate_pct, term_years, np.asarray(month) - 1)
+    balance_after = remaining_balance(loan_amount, rate_pct, term_years, month)
+    principal = balance_before - balance_after
+    interest = np.where(principal > 0, monthly_payment(loan_amount, rate_pct, term_years) - principal, 0.0)
+    return principal, interest
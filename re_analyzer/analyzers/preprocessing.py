@@ -177,7 +177,7 @@ class InvertibleColumnTransformer(ColumnTransformer):
         return inverted_df
 
 def preprocess_dataframe(df, filter_method=FilterMethod.FILTER_NONE, cols_to_keep=set()):
-    num_cols = set(df.select_dtypes(include=['int64', 'float32', 'float64']).columns)
+    num_cols = set(df.select_dtypes(include=['int32', 'int64', 'float32', 'float64']).columns)
     cat_cols = [column for column in df.columns if column not in num_cols]
     num_cols = list(num_cols)
 
@@ -0,0 +1,281 @@
+"""Vectorized underwriting for whole property catalogs.
+
+Computes the deal metrics of ``manual_analysis_intake.RANKING_FIELDS`` (P&I, NOI,
+cash flow, cash-on-cash, cap rate, DSCR, break-even rent) for every row of
+``property_static_df`` or the canonical listings Parquet at once. Both share the
+column names read here (purchase_price, monthly_restimate, annual_property_tax_rate,
+annual_mortgage_rate, monthly_homeowners_insurance, monthly_hoa, living_area).
+
+Assumptions use the RANKING_FIELDS names; percentages are fractions (0.2 = 20%),
+except the tax and mortgage rates, which follow the catalog columns in percent.
+Each metric comes in a current-tax and a reassessed-tax variant: current tax is the
+row's ``tax_current_annual`` when the frame has one and otherwise its tax rate
+applied to the price; reassessed tax applies ``reassessed_tax_rate_pct`` to the
+price, as happens after a sale.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from re_analyzer.analyzers import mortgage
+
+
+MONTHS_IN_YEAR = 12
+DEFAULT_ASSUMPTIONS = {
+    'down_payment_pct': 0.20,
+    'closing_cost_pct': 0.03,
+    'vacancy_pct': 0.05,
+    'management_pct': 0.08,
+    'repairs_pct': 0.05,
+    'capex_pct': 0.05,
+    'loan_term_years': 30,
+    # Typical Florida non-homestead millage, applied to the purchase price.
+    'reassessed_tax_rate_pct': 2.0,
+}
+TAX_BASES = ('current_tax', 'reassessed_tax')
+# Listing x scenario pairs evaluated at once by sweep_scenarios.
+SWEEP_CHUNK_CELLS = 1_000_000
+UNDERWRITING_COLUMNS = (
+    'cash_in', 'principal_and_interest', 'tax_current_annual', 'tax_reassessed_annual',
+    *(f'{metric}_{tax_basis}' for metric in ('noi', 'cash_flow', 'cash_on_cash', 'cap_rate', 'dscr', 'break_even_rent') for tax_basis in TAX_BASES),
+    'rent_per_sqft',
+)
+
+
+def _array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, NaN wherever the denominator is zero."""
+    numerator, denominator = np.broadcast_arrays(_array(numerator), _array(denominator))
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator != 0)
+
+
+def monthly_principal_and_interest(loan_amount, annual_rate_pct, loan_term_years=30):
+    """Level monthly payment of a fully amortizing loan; annual_rate_pct is in percent."""
+    return mortgage.monthly_payment(loan_amount, annual_rate_pct, loan_term_years)
+
+
+def underwrite(price, monthly_rent, tax_rate_pct, mortgage_rate_pct, insurance_monthly=0, hoa_monthly=0,
+               living_area=None, tax_current_annual=None, columns=UNDERWRITING_COLUMNS, **assumptions):
+    """Dict of ``columns`` arrays; every input may be a scalar or an array broadcast against the rest.
+
+    ``assumptions`` override DEFAULT_ASSUMPTIONS and may themselves be arrays.
+    Metrics outside ``columns`` are not computed.
+    """
+    unknown = set(assumptions) - set(DEFAULT_ASSUMPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown underwriting assumptions: {sorted(unknown)}")
+    unknown = set(columns) - set(UNDERWRITING_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown underwriting columns: {sorted(unknown)}")
+    assumptions = {**DEFAULT_ASSUMPTIONS, **assumptions}
+    price, monthly_rent = _array(price), _array(monthly_rent)
+    insurance_monthly, hoa_monthly = _array(insurance_monthly), _array(hoa_monthly)
+
+    cash_in = price * (_array(assumptions['down_payment_pct']) + _array(assumptions['closing_cost_pct']))
+    loan_amount = price * (1 - _array(assumptions['down_payment_pct']))
+    principal_and_interest = monthly_principal_and_interest(loan_amount, mortgage_rate_pct, assumptions['loan_term_years'])
+    annual_debt_service = principal_and_interest * MONTHS_IN_YEAR
+    reserve_pct = sum(_array(assumptions[name]) for name in ('vacancy_pct', 'management_pct', 'repairs_pct', 'capex_pct'))
+    # Operating costs that do not scale with rent.
+    fixed_monthly_costs = insurance_monthly + hoa_monthly
+
+    def annual_tax(tax_basis):
+        if tax_basis == 'reassessed_tax':
+            return price * _array(assumptions['reassessed_tax_rate_pct']) / 100
+        estimated_tax = price * _array(tax_rate_pct) / 100
+        if tax_current_annual is None:
+            return estimated_tax
+        current_tax = _array(tax_current_annual)
+        return np.where(np.isfinite(current_tax) & (current_tax > 0), current_tax, estimated_tax)
+
+    results = {'cash_in': cash_in, 'principal_and_interest': principal_and_interest}
+    effective_rent = monthly_rent * (1 - reserve_pct)
+    for tax_basis in TAX_BASES:
+        names = {metric: f'{metric}_{tax_basis}' for metric in ('noi', 'cash_flow', 'cash_on_cash', 'cap_rate', 'dscr', 'break_even_rent')}
+        tax_column = 'tax_current_annual' if tax_basis == 'current_tax' else 'tax_reassessed_annual'
+        if not set(columns) & {tax_column, *names.values()}:
+            continue
+        tax = results[tax_column] = annual_tax(tax_basis)
+        noi = (effective_rent - fixed_monthly_costs) * MONTHS_IN_YEAR - tax
+        results[names['noi']] = noi
+        if names['cash_flow'] in columns or names['cash_on_cash'] in columns:
+            results[names['cash_flow']] = cash_flow = noi - annual_debt_service
+            if names['cash_on_cash'] in columns:
+                results[names['cash_on_cash']] = _ratio(cash_flow, cash_in)
+        if names['cap_rate'] in columns:
+            results[names['cap_rate']] = _ratio(noi, price)
+        if names['dscr'] in columns:
+            results[names['dscr']] = _ratio(noi, annual_debt_service)
+        if names['break_even_rent'] in columns:
+            # Monthly rent at which cash flow (after reserves) is zero.
+            break_even_costs = fixed_monthly_costs + principal_and_interest + tax / MONTHS_IN_YEAR
+            results[names['break_even_rent']] = _ratio(break_even_costs, 1 - reserve_pct)
+    if 'rent_per_sqft' in columns:
+        results['rent_per_sqft'] = _ratio(monthly_rent, living_area) if living_area is not None else np.full(np.shape(price), np.nan)
+
+    shape = np.broadcast_shapes(*(np.shape(results[column]) for column in columns))
+    return {column: np.broadcast_to(results[column], shape) for column in columns}
+
+
+def _listing_inputs(df):
+    """underwrite() keyword arguments holding the per-listing columns of a catalog frame."""
+    def column(name, default=0.0):
+        return df[name].to_numpy(dtype=np.float64, na_value=np.nan) if name in df else default
+
+    return {
+        'price': column('purchase_price'),
+        'monthly_rent': column('monthly_restimate'),
+        'tax_rate_pct': column('annual_property_tax_rate'),
+        'mortgage_rate_pct': column('annual_mortgage_rate'),
+        'insurance_monthly': np.nan_to_num(column('monthly_homeowners_insurance')),
+        'hoa_monthly': np.nan_to_num(column('monthly_hoa')),
+        'living_area': column('living_area', None),
+        'tax_current_annual': column('tax_current_annual', None),
+    }
+
+
+def _sort_keys(values, ascending):
+    """Ascending sort keys that put the best values first and NaN last."""
+    return np.where(np.isnan(values), np.inf, values if ascending else -values)
+
+
+def underwrite_df(df, **assumptions):
+    """UNDERWRITING_COLUMNS for every row of a property_static_df/canonical listings frame, indexed like df."""
+    return pd.DataFrame(underwrite(**_listing_inputs(df), **assumptions), index=df.index)
+
+
+def rank_by_underwriting(df, metric='cash_on_cash_reassessed_tax', limit=None, ascending=False, **assumptions):
+    """df joined with its underwriting metrics, sorted by ``metric`` (NaN last) and cut to ``limit`` rows.
+
+    With a limit only the top rows are selected (argpartition) before sorting. Rows
+    are matched by position, so repeated index labels (zpids) are fine, and a df
+    column named like a metric (e.g. ``tax_current_annual``) is replaced by the
+    computed metric, which already falls back from it.
+    """
+    underwriting_df = underwrite_df(df, **assumptions)
+    keys = _sort_keys(underwriting_df[metric].to_numpy(), ascending)
+    if limit is not None and limit < len(keys):
+        candidates = np.argpartition(keys, limit)[:limit]
+        order = candidates[np.argsort(keys[candidates], kind='stable')]
+    else:
+        order = np.argsort(keys, kind='stable')
+    ranked_df = df.iloc[order].drop(columns=underwriting_df.columns, errors='ignore')
+    return pd.concat([ranked_df, underwriting_df.iloc[order].set_axis(ranked_df.index)], axis=1)
+
+
+def equity_after_years(df, years, **assumptions):
+    """Loan amount, principal and interest paid, remaining balance and equity of every row after ``years``.
+
+    Equity is the purchase price less the remaining balance (no appreciation). The
+    balances come from the cached per-(rate, term) schedules of ``mortgage``.
+    """
+    unknown = set(assumptions) - set(DEFAULT_ASSUMPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown underwriting assumptions: {sorted(unknown)}")
+    assumptions = {**DEFAULT_ASSUMPTIONS, **assumptions}
+    inputs = _listing_inputs(df)
+    price, rate_pct, term_years = inputs['price'], inputs['mortgage_rate_pct'], assumptions['loan_term_years']
+    loan_amount = price * (1 - _array(assumptions['down_payment_pct']))
+    months_elapsed = _array(years) * MONTHS_IN_YEAR
+    balance, interest_paid = mortgage.amortization_at(loan_amount, rate_pct, term_years, months_elapsed)
+    return pd.DataFrame({
+        'loan_amount': loan_amount,
+        'principal_paid': loan_amount - balance,
+        'interest_paid': interest_paid,
+        'remaining_balance': balance,
+        'equity': price - balance,
+    }, index=df.index)
+
+
+def scenario_grid(**axes):
+    """One row per combination of the given values, e.g.
+    ``scenario_grid(annual_mortgage_rate=[6.0, 7.0], down_payment_pct=DOWN_PAYMENT_PERCENTAGES)``.
+    """
+    return pd.MultiIndex.from_product(list(axes.values()), names=list(axes)).to_frame(index=False)
+
+
+def sweep_scenarios(df, scenarios, metric='cash_on_cash_reassessed_tax', top_k=10, ascending=False,
+                    chunk_cells=SWEEP_CHUNK_CELLS, **assumptions):
+    """Top ``top_k`` listings of df by ``metric`` under every scenario (row) of ``scenarios``.
+
+    Scenario columns are DEFAULT_ASSUMPTIONS names or ``annual_mortgage_rate``, which
+    replaces the listings' own rate; ``assumptions`` fix the remaining ones. Every
+    listing x scenario pair is evaluated by broadcasting, in blocks of about
+    ``chunk_cells`` pairs, keeping a running top-K per scenario. Returns one row per
+    (scenario, rank) with the scenario values, ``listing`` (the df index label) and
+    the metric; NaN metrics rank last.
+    """
+    scenarios = pd.DataFrame(scenarios).reset_index(drop=True)
+    unknown = set(scenarios.columns) - set(DEFAULT_ASSUMPTIONS) - {'annual_mortgage_rate'}
+    if unknown:
+        raise ValueError(f"Unknown scenario columns: {sorted(unknown)}")
+    inputs = _listing_inputs(df)
+    listing_count, scenario_count = len(df), len(scenarios)
+    top_k = min(top_k, listing_count)
+    listing_chunk = max(1, min(listing_count, chunk_cells))
+    scenario_chunk = max(1, chunk_cells // listing_chunk)
+
+    top_keys = np.empty((scenario_count, top_k))
+    top_positions = np.empty((scenario_count, top_k), dtype=np.int64)
+    for scenario_start in range(0, scenario_count if top_k else 0, scenario_chunk):
+        scenario_stop = min(scenario_start + scenario_chunk, scenario_count)
+        scenario_values = {
+            name: scenarios[name].to_numpy(dtype=np.float64)[scenario_start:scenario_stop, np.newaxis]
+            for name in scenarios.columns
+        }
+        best_keys = np.empty((scenario_stop - scenario_start, 0))
+        best_positions = np.empty((scenario_stop - scenario_start, 0), dtype=np.int64)
+        for listing_start in range(0, listing_count, listing_chunk):
+            listing_stop = min(listing_start + listing_chunk, listing_count)
+            chunk_inputs = {
+                name: values[np.newaxis, listing_start:listing_stop] if isinstance(values, np.ndarray) else values
+                for name, values in inputs.items()
+            }
+            chunk_assumptions = dict(assumptions)
+            for name, values in scenario_values.items():
+                if name == 'annual_mortgage_rate':
+                    chunk_inputs['mortgage_rate_pct'] = values
+                else:
+                    chunk_assumptions[name] = values
+            values = underwrite(**chunk_inputs, columns=(metric,), **chunk_assumptions)[metric]
+            keys = np.broadcast_to(_sort_keys(values, ascending), (scenario_stop - scenario_start, listing_stop - listing_start))
+            positions = np.broadcast_to(np.arange(listing_start, listing_stop), keys.shape)
+            best_keys = np.concatenate([best_keys, keys], axis=1)
+            best_positions = np.concatenate([best_positions, positions], axis=1)
+            if best_keys.shape[1] > top_k:
+                selected = np.argpartition(best_keys, top_k - 1, axis=1)[:, :top_k]
+                best_keys = np.take_along_axis(best_keys, selected, axis=1)
+                best_positions = np.take_along_axis(best_positions, selected, axis=1)
+        order = np.argsort(best_keys, axis=1, kind='stable')
+        top_keys[scenario_start:scenario_stop] = np.take_along_axis(best_keys, order, axis=1)
+        top_positions[scenario_start:scenario_stop] = np.take_along_axis(best_positions, order, axis=1)
+
+    top_values = np.where(np.isinf(top_keys), np.nan, top_keys if ascending else -top_keys)
+    sweep_df = scenarios.loc[scenarios.index.repeat(top_k)].reset_index(names='scenario')
+    sweep_df['rank'] = np.tile(np.arange(1, top_k + 1), scenario_count)
+    sweep_df['listing'] = df.index.to_numpy()[top_positions.ravel()]
+    sweep_df[metric] = top_values.ravel()
+    return sweep_df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a property catalog Parquet file by underwriting metrics.")
+    parser.add_argument("parquet_path", help="property_static_df.parquet or a canonical listings Parquet file/dataset.")
+    parser.add_argument("--metric", default="cash_on_cash_reassessed_tax", choices=UNDERWRITING_COLUMNS)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--ascending", action="store_true")
+    for name, default in DEFAULT_ASSUMPTIONS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=float, default=default)
+    args = parser.parse_args(argv)
+    assumptions = {name: getattr(args, name) for name in DEFAULT_ASSUMPTIONS}
+    ranked_df = rank_by_underwriting(pd.read_parquet(args.parquet_path), args.metric, args.limit, args.ascending, **assumptions)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(ranked_df)
+
+
+if __name__ == "__main__":
+    main()
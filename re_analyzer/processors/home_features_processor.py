@@ -8,8 +8,8 @@ import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
 
-from re_analyzer.utility.utility import VISUAL_DATA_PATH, HOME_FEATURES_DATAFRAME_PATH, ensure_directory_exists
-from re_analyzer.analyzers.iterator import property_details_iterator, get_property_info_from_property_details
+from re_analyzer.utility.utility import VISUAL_DATA_PATH, HOME_FEATURES_DATAFRAME_PATH, HOME_FEATURES_MODEL_PATH, ensure_directory_exists
+from re_analyzer.analyzers.iterator import cached_property_details_iterator
 from re_analyzer.analyzers.correlatory_data_analysis import visualize_pairwise_correlation, visualize_pairwise_distribution
 
 
@@ -55,16 +55,30 @@ def process_feature_value(feature, value, features_dict):
             features_dict[f'{feature}_{value}'] = 1
 
 
-def load_and_aggregate_features():
+def features_df_from_property_infos(property_infos):
     all_features = {}
-    for property_details in property_details_iterator():
-        property_info = get_property_info_from_property_details(property_details)
+    for property_info in property_infos:
         if not property_info:
             continue
         aggregate_features_from_json(property_info, all_features)
     return pd.DataFrame.from_dict(all_features, orient='index').fillna(0)
 
 
+def water_view_none(features_df):
+    """waterView_None per property from its own waterView columns: 1 unless it lists a view other than None.
+
+    A property with no waterView fact is not waterfront, whatever the other rows hold.
+    """
+    water_view_columns = [column for column in features_df.columns if column.startswith('waterView_')]
+    has_water_view = features_df[water_view_columns].sum(axis=1) > 0
+    listed_none = features_df['waterView_None'] == 1 if 'waterView_None' in features_df else False
+    return (listed_none | ~has_water_view).astype(float)
+
+
+def load_and_aggregate_features():
+    return features_df_from_property_infos(property_info for property_info, _ in cached_property_details_iterator())
+
+
 def filter_features_by_threshold(features_df, min_threshold=MIN_THRESHOLD):
     # Convert boolean columns to numerical (0s and 1s) if not already done
     for col in FEATURE_CATEGORIES['bool_features']:
@@ -120,16 +134,19 @@ def apply_XGB_on_home_features(features_df, predictor):
     return model
 
 
+def normalized_cumulative_shap_scores(shap_values):
+    # Aggregate SHAP values for each observation
+    cumulative_shap_scores = shap_values.values.sum(axis=1)
+    # Normalize SHAP values by the sum of absolute values for comparison (optional)
+    return cumulative_shap_scores / np.abs(shap_values.values).sum(axis=1)
+
+
 def add_shap_for_home_features(model, features_df, predictor):
     X = features_df.drop(predictor, axis=1)
     # Calculate SHAP values
     explainer = shap.Explainer(model)
     shap_values = explainer(X)
-    # Aggregate SHAP values for each observation
-    cumulative_shap_scores = shap_values.values.sum(axis=1)
-    # Normalize SHAP values by the sum of absolute values for comparison (optional)
-    normalized_cumulative_shap_scores = cumulative_shap_scores / np.abs(shap_values.values).sum(axis=1)
-    features_df['home_features_score'] = normalized_cumulative_shap_scores
+    features_df['home_features_score'] = normalized_cumulative_shap_scores(shap_values)
 
     mean_shap_values = np.abs(shap_values.values).mean(axis=0)
     shap_correlation_df = pd.DataFrame({
@@ -185,15 +202,19 @@ def plot_feature_histograms(features_df):
 
 def home_features_processing_pipeline():
     features_df = load_and_aggregate_features()
+    # Before the threshold filter, which may drop rare waterView columns.
+    property_water_view_none = water_view_none(features_df)
     features_df = filter_features_by_threshold(features_df)
     plot_feature_histograms(features_df.drop(columns=['purchase_price'], errors='ignore'))
 
     predictor = 'purchase_price'
     model = apply_XGB_on_home_features(features_df, predictor)
+    # Kept so incremental runs can score changed properties without retraining.
+    model.save_model(HOME_FEATURES_MODEL_PATH)
     shap_correlation_df = add_shap_for_home_features(model, features_df, predictor)
     print(shap_correlation_df)
 
-    property_features_df = features_df[['home_features_score', 'purchase_price', 'waterView_None']]
+    property_features_df = features_df[['home_features_score', 'purchase_price']].assign(waterView_None=property_water_view_none)
     # Save to Parquet (efficient and preserves data types well)
     property_features_df.to_parquet(HOME_FEATURES_DATAFRAME_PATH)
 
@@ -205,5 +226,32 @@ def home_features_processing_pipeline():
     return property_features_df
 
 
+def update_home_features(property_infos, removed_zpids=()):
+    """Score changed properties with the saved model and upsert them into the home features Parquet.
+
+    Properties absent from property_infos keep their previous scores; removed_zpids
+    are dropped. Returns the updated property features DataFrame.
+    """
+    model = xgb.XGBRegressor()
+    model.load_model(HOME_FEATURES_MODEL_PATH)
+    feature_names = model.get_booster().feature_names
+
+    features_df = features_df_from_property_infos(property_infos)
+    property_features_df = pd.read_parquet(HOME_FEATURES_DATAFRAME_PATH)
+    stale_zpids = set(features_df.index).union(removed_zpids)
+    property_features_df = property_features_df[~property_features_df.index.isin(stale_zpids)]
+    if not features_df.empty:
+        X = features_df.reindex(columns=feature_names, fill_value=0).astype(float)
+        changed_features_df = pd.DataFrame({
+            'home_features_score': normalized_cumulative_shap_scores(shap.Explainer(model)(X)),
+            'purchase_price': features_df['purchase_price'],
+            'waterView_None': water_view_none(features_df),
+        }, index=features_df.index)
+        property_features_df = pd.concat([property_features_df, changed_features_df])
+
+    property_features_df.to_parquet(HOME_FEATURES_DATAFRAME_PATH)
+    return property_features_df
+
+
 if __name__ == "__main__":
     property_features_df = home_features_processing_pipeline()
@@ -1,15 +1,26 @@
 import os
 import json
+import argparse
+import hashlib
+import sqlite3
 import numpy as np
 import pandas as pd
 
-from re_analyzer.processors.re_metrics_processor import real_estate_metrics_property_processing_pipeline
-from re_analyzer.processors.home_features_processor import home_features_processing_pipeline
-from re_analyzer.processors.zestimate_history_processor import save_zestimate_history_pipeline
-from re_analyzer.utility.utility import PROPERTY_DATA_PATH
+from re_analyzer.analyzers.iterator import cached_property_details_records, refresh_property_details_cache
+from re_analyzer.processors.re_metrics_processor import METRICS_DTYPES, property_metrics_df, real_estate_metrics_property_processing_pipeline
+from re_analyzer.processors.home_features_processor import home_features_processing_pipeline, update_home_features
+from re_analyzer.processors import zestimate_history_processor
+from re_analyzer.processors.zestimate_history_processor import build_zestimate_history_df, save_zestimate_history_pipeline
+from re_analyzer.utility.utility import PROPERTY_DATA_PATH, HOME_FEATURES_DATAFRAME_PATH, HOME_FEATURES_MODEL_PATH
+from re_analyzer.utility import json_codec
 
 
 PROPERTY_STATIC_DF_PATH = os.path.join(PROPERTY_DATA_PATH, 'property_static_df.parquet')
+# zpid -> (mtime, hash) of the property records behind the last successful run.
+PROCESSING_STATE_PATH = os.path.join(PROPERTY_DATA_PATH, 'processing_state.sqlite')
+# Retrain the home features model once more than this fraction of zpids changed.
+RETRAIN_CHANGE_FRACTION = 0.1
+HOME_FEATURES_COLUMNS = ['home_features_score', 'is_waterfront']
 
 
 def save_property_static_df(property_simple_metrics_df, property_features_df):
@@ -27,8 +38,157 @@ def save_property_static_df(property_simple_metrics_df, property_features_df):
     property_static_df.to_parquet(PROPERTY_STATIC_DF_PATH)
 
 
-if __name__ == '__main__':
+def property_snapshot():
+    """{zpid: (mtime_ns, sha256, property_info_json, zestimate_history_json)} from the PropertyDetails cache.
+
+    The hash covers the slim property_info and zestimateHistory, so page changes the
+    processors never read do not count as changes. When several files share a zpid
+    the last one in path order wins, as in the processors.
+    """
+    snapshot = {}
+    for zpid, mtime_ns, property_info_json, zestimate_history_json in cached_property_details_records():
+        digest = hashlib.sha256(f"{property_info_json}\0{zestimate_history_json}".encode('utf-8')).hexdigest()
+        snapshot[zpid] = (mtime_ns, digest, property_info_json, zestimate_history_json)
+    return snapshot
+
+
+def _open_processing_state(state_path):
+    connection = sqlite3.connect(state_path)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS processed_properties (
+            zpid INTEGER PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        )
+    """)
+    return connection
+
+
+def load_processing_state(state_path=None):
+    state_path = state_path or PROCESSING_STATE_PATH
+    if not os.path.exists(state_path):
+        return {}
+    connection = _open_processing_state(state_path)
+    try:
+        return {zpid: (mtime_ns, digest) for zpid, mtime_ns, digest in connection.execute("SELECT zpid, mtime_ns, sha256 FROM processed_properties")}
+    finally:
+        connection.close()
+
+
+def save_processing_state(snapshot, state_path=None):
+    connection = _open_processing_state(state_path or PROCESSING_STATE_PATH)
+    try:
+        connection.execute("DELETE FROM processed_properties")
+        connection.executemany(
+            "INSERT INTO processed_properties VALUES (?, ?, ?)",
+            ((zpid, mtime_ns, digest) for zpid, (mtime_ns, digest, _, _) in snapshot.items()),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def diff_property_snapshot(previous_state, snapshot):
+    """(changed zpids, removed zpids) between the saved state and the current snapshot."""
+    changed = [zpid for zpid, record in snapshot.items() if previous_state.get(zpid, (None, None))[1] != record[1]]
+    removed = [zpid for zpid in previous_state if zpid not in snapshot]
+    return changed, removed
+
+
+def _upsert_by_zpid(existing_df, changed_df, stale_zpids):
+    existing_df = existing_df[~existing_df['zpid'].isin(stale_zpids)]
+    if changed_df.empty:
+        return existing_df
+    return pd.concat([existing_df, changed_df], ignore_index=True)
+
+
+def _update_property_static_df(changed_property_infos, stale_zpids, property_features_df):
+    existing_df = pd.read_parquet(PROPERTY_STATIC_DF_PATH).drop(columns=HOME_FEATURES_COLUMNS).reset_index()
+    metrics_df = _upsert_by_zpid(existing_df, property_metrics_df(changed_property_infos), stale_zpids)
+    # Concatenating categoricals with different categories falls back to object.
+    metrics_df = metrics_df.astype({column: dtype for column, dtype in METRICS_DTYPES.items() if column in metrics_df})
+    save_property_static_df(metrics_df, property_features_df)
+
+
+def _update_zestimate_history(changed_records, stale_zpids):
+    parquet_path = zestimate_history_processor.ZESTIMATE_HISTORY_PARQUET_PATH
+    existing_df = pd.read_parquet(parquet_path).reset_index()
+    changed_df = build_zestimate_history_df({
+        zpid: json_codec.loads(zestimate_history_json)
+        for zpid, (_, _, _, zestimate_history_json) in changed_records.items()
+        if zestimate_history_json is not None
+    }).reset_index()
+    zestimate_history_df = _upsert_by_zpid(existing_df, changed_df, stale_zpids)
+    zestimate_history_df = zestimate_history_df.sort_values(by='Date', kind='stable').set_index('Date')
+    zestimate_history_df.to_parquet(parquet_path, compression='gzip')
+
+
+def _outputs_exist():
+    output_paths = (
+        PROPERTY_STATIC_DF_PATH, HOME_FEATURES_DATAFRAME_PATH, HOME_FEATURES_MODEL_PATH,
+        zestimate_history_processor.ZESTIMATE_HISTORY_PARQUET_PATH,
+    )
+    return all(os.path.exists(path) for path in output_paths)
+
+
+def run_full_pipeline():
     property_simple_metrics_df = real_estate_metrics_property_processing_pipeline()
     property_features_df = home_features_processing_pipeline()
     save_property_static_df(property_simple_metrics_df, property_features_df)
     save_zestimate_history_pipeline()
+
+
+def run_processing_pipeline(full=False, retrain_change_fraction=RETRAIN_CHANGE_FRACTION, workers=0):
+    """Bring the PropertyData Parquet outputs up to date with the PropertyDetails tree.
+
+    Without ``full`` (and once a previous run left its state and outputs behind) only
+    zpids whose cached records changed are re-extracted and upserted; removed zpids
+    are dropped. The home features model is retrained, rescoring every property,
+    only when the changed fraction exceeds ``retrain_change_fraction``; otherwise
+    changed properties are scored with the saved model.
+    """
+    # Decode the PropertyDetails tree once; the processors below read the cache.
+    print(refresh_property_details_cache(workers=workers))
+    snapshot = property_snapshot()
+    previous_state = {} if full else load_processing_state()
+    changed, removed = diff_property_snapshot(previous_state, snapshot)
+    change_fraction = (len(changed) + len(removed)) / max(len(snapshot), 1)
+    summary = {'properties': len(snapshot), 'changed': len(changed), 'removed': len(removed), 'change_fraction': change_fraction}
+
+    if not previous_state or not _outputs_exist():
+        run_full_pipeline()
+        save_processing_state(snapshot)
+        return {**summary, 'mode': 'full', 'retrained': True}
+    if not changed and not removed:
+        return {**summary, 'mode': 'unchanged', 'retrained': False}
+
+    changed_records = {zpid: snapshot[zpid] for zpid in changed}
+    changed_property_infos = [json_codec.loads(record[2]) for record in changed_records.values()]
+    stale_zpids = set(changed).union(removed)
+    retrained = change_fraction > retrain_change_fraction
+    if retrained:
+        property_features_df = home_features_processing_pipeline()
+    else:
+        property_features_df = update_home_features(changed_property_infos, removed)
+    _update_property_static_df(changed_property_infos, stale_zpids, property_features_df)
+    _update_zestimate_history(changed_records, stale_zpids)
+    save_processing_state(snapshot)
+    return {**summary, 'mode': 'incremental', 'retrained': retrained}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the PropertyData Parquet outputs from the PropertyDetails tree.")
+    parser.add_argument("--full", action="store_true", help="Recompute every output from scratch instead of only changed zpids.")
+    parser.add_argument(
+        "--retrain-change-fraction",
+        type=float,
+        default=RETRAIN_CHANGE_FRACTION,
+        help="Retrain the home features model when more than this fraction of zpids changed (default: %(default)s).",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="Processes used to decode changed PropertyDetails files (0 = one per CPU).")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    print(run_processing_pipeline(full=args.full, retrain_change_fraction=args.retrain_change_fraction, workers=args.workers))
@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 
-from re_analyzer.analyzers.iterator import property_details_iterator, get_property_info_from_property_details
+from re_analyzer.analyzers.iterator import cached_property_details_iterator
 
 
 # CONSTANTS
@@ -10,93 +11,98 @@ MIN_APR = 6.281
 DOWN_PAYMENT_PERCENTAGES = [0.05, 1.0]
 
 
+# The property_info fields the metrics are computed from.
+RAW_FIELDS = [
+    'zpid', 'zipcode', 'streetAddress', 'city', 'hdpUrl', 'price', 'rentZestimate', 'yearBuilt', 'bedrooms',
+    'bathrooms', 'propertyTaxRate', 'livingArea', 'lotSize', 'homeType', 'mortgageRates',
+    'annualHomeownersInsurance', 'monthlyHoaFee', 'originalPhotos',
+]
+# Column dtypes of the metrics DataFrame; the string columns keep pandas' default.
+# zpid, purchase_price and lot_size stay 64-bit: zpids and large lots overflow
+# int32, and prices feed integer arithmetic downstream.
+METRICS_DTYPES = {
+    'zpid': 'int64',
+    'zip_code': 'int32',
+    'purchase_price': 'int64',
+    'monthly_restimate': 'float32',
+    'gross_rent_multiplier': 'float32',
+    'year_built': 'int32',
+    'bedrooms': 'int32',
+    'bathrooms': 'int32',
+    'annual_property_tax_rate': 'float32',
+    'living_area': 'int32',
+    'lot_size': 'int64',
+    'home_type': 'category',
+    'annual_mortgage_rate': 'float32',
+    'monthly_homeowners_insurance': 'float32',
+    'monthly_hoa': 'float32',
+    'city': 'category',
+    'price_per_sqft': 'float32',
+}
+
+
+def _numeric(values, default):
+    """Float array of values, with missing, unparseable and falsy entries replaced by default."""
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+    return np.where(np.isnan(numbers) | (numbers == 0), default, numbers)
+
+
+def _thirty_year_fixed_rate(mortgage_rates):
+    return mortgage_rates.get('thirtyYearFixedRate') if isinstance(mortgage_rates, dict) else None
+
+
+def _image_url(original_photos):
+    try:
+        return original_photos[0]['mixedSources']['jpeg'][1]['url']
+    except (KeyError, IndexError, TypeError):
+        return ''
+
+
+def property_metrics_df(property_infos):
+    """Metrics DataFrame with one row per non-empty property_info.
+
+    The raw fields are extracted into columns in one pass; the defaulting and the
+    derived metrics are then computed on whole arrays.
+    """
+    raw = pd.DataFrame([property_info for property_info in property_infos if property_info], columns=RAW_FIELDS)
+
+    purchase_price = np.trunc(_numeric(raw['price'], 1))
+    monthly_restimate = _numeric(raw['rentZestimate'], 0)
+    living_area = np.trunc(_numeric(raw['livingArea'], 0))
+    lot_size = _numeric(raw['lotSize'], 0)
+    lot_size = np.where(lot_size == 0, living_area, lot_size)
+    home_type = raw['homeType'].fillna('').astype(str)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gross_rent_multiplier = np.where(monthly_restimate != 0, purchase_price / (MONTHS_IN_YEAR * monthly_restimate), -1)
+        price_per_sqft = np.where(living_area != 0, purchase_price / living_area, purchase_price)
+
+    metrics_df = pd.DataFrame({
+        'zpid': _numeric(raw['zpid'], 0),
+        'street_address': raw['streetAddress'].fillna('No Property Address Located'),
+        'zip_code': _numeric(raw['zipcode'], 0),
+        'purchase_price': purchase_price,
+        'monthly_restimate': monthly_restimate,
+        'gross_rent_multiplier': gross_rent_multiplier,
+        'year_built': _numeric(raw['yearBuilt'], 1960),
+        'bedrooms': _numeric(raw['bedrooms'], 0),
+        'bathrooms': _numeric(raw['bathrooms'], 0),
+        'annual_property_tax_rate': _numeric(raw['propertyTaxRate'], 0),
+        'living_area': living_area,
+        'lot_size': lot_size,
+        'home_type': home_type.where(home_type != '', 'SINGLE_FAMILY'),
+        'annual_mortgage_rate': _numeric(raw['mortgageRates'].map(_thirty_year_fixed_rate), 6),
+        'monthly_homeowners_insurance': _numeric(raw['annualHomeownersInsurance'], 0) / MONTHS_IN_YEAR,
+        'monthly_hoa': _numeric(raw['monthlyHoaFee'], 0),
+        'city': raw['city'].fillna(''),
+        'image_url': raw['originalPhotos'].map(_image_url),
+        'property_url': 'https://zillow.com' + raw['hdpUrl'].fillna(''),
+        'price_per_sqft': price_per_sqft,
+    })
+    return metrics_df.astype(METRICS_DTYPES)
+
+
 def real_estate_metrics_property_processing_pipeline():
-    results = {}
-
-    results = []
-    for property_details in property_details_iterator():
-        property_info = get_property_info_from_property_details(property_details)
-        if not property_info:
-            continue
-        zpid = property_info.get('zpid', 0)
-        if not zpid:
-            zpid = 0
-        zip_code = property_info.get('zipcode', 0)
-        if not zip_code:
-            zip_code = 0
-        monthly_restimate = property_info.get('rentZestimate', 0)
-        if not monthly_restimate:
-            monthly_restimate = 0
-        purchase_price = property_info.get('price', 1)
-        purchase_price = int(purchase_price) if purchase_price else 1
-        year_built = property_info.get('yearBuilt', 1960)
-        if not year_built:
-            year_built = 1960
-        bedrooms = property_info.get('bedrooms', 0)
-        if not bedrooms:
-            bedrooms = 0
-        bathrooms = property_info.get('bathrooms', 0)
-        if not bathrooms:
-            bathrooms = 0
-        annual_property_tax_rate = property_info.get('propertyTaxRate', 0)
-        if not annual_property_tax_rate:
-            annual_property_tax_rate = 0
-        living_area = property_info.get('livingArea', 0)
-        living_area = int(living_area) if living_area else 0
-        lot_size = property_info.get('lotSize', 0)
-        if not lot_size:
-            lot_size = living_area
-        home_type = property_info.get('homeType', 'SINGLE_FAMILY')
-        if not home_type:
-            home_type = 'SINGLE_FAMILY'
-        annual_mortgage_rate = property_info.get('mortgageRates', { "thirtyYearFixedRate": 6 })
-        if annual_mortgage_rate:
-            annual_mortgage_rate = annual_mortgage_rate.get('thirtyYearFixedRate', 6)
-        if not annual_mortgage_rate:
-            annual_mortgage_rate = 6
-        annual_homeowners_insurance = property_info.get('annualHomeownersInsurance', 0)
-        if not annual_homeowners_insurance:
-            annual_homeowners_insurance = 0
-        monthly_homeowners_insurance = annual_homeowners_insurance / MONTHS_IN_YEAR
-        monthly_hoa = property_info.get("monthlyHoaFee", 0)
-        if not monthly_hoa:
-            monthly_hoa = 0
-
-        try:
-            image_url = property_info['originalPhotos'][0]['mixedSources']['jpeg'][1]['url']
-        except (KeyError, IndexError):
-            image_url = ''
-        property_url = 'https://zillow.com' + property_info.get('hdpUrl', '')
-
-        metrics = {
-            'zpid' : int(zpid),
-            'street_address': property_info.get('streetAddress', 'No Property Address Located'),
-            'zip_code': int(zip_code),
-            'purchase_price': purchase_price,
-            'monthly_restimate': float(monthly_restimate),
-            'gross_rent_multiplier' : purchase_price / (MONTHS_IN_YEAR * monthly_restimate) if monthly_restimate != 0 else -1,
-            'year_built': int(year_built),
-            'bedrooms': int(bedrooms), 'bathrooms': int(bathrooms),
-            'annual_property_tax_rate': float(annual_property_tax_rate),
-            'living_area': int(living_area), 'lot_size': int(lot_size),
-            'home_type': str(home_type),
-            'annual_mortgage_rate': float(annual_mortgage_rate),
-            'monthly_homeowners_insurance': float(monthly_homeowners_insurance),
-            'monthly_hoa': float(monthly_hoa),
-            'city': property_info.get('city', ''),
-            'image_url': image_url,
-            'property_url': property_url,
-            'price_per_sqft': purchase_price / living_area if living_area else purchase_price,
-        }
-        results.append(metrics)
-
-    # Convert the list of dictionaries to a DataFrame
-    metrics_df = pd.DataFrame(results)
-
-    # Sort the DataFrame by 'restimate' column in descending order
-    # metrics_df = metrics_df.sort_values(by='restimate', ascending=False)
-
-    return metrics_df
+    return property_metrics_df(property_info for property_info, _ in cached_property_details_iterator())
 
 
 if __name__ == '__main__':
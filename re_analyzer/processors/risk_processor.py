@@ -1,16 +1,14 @@
 import pandas as pd
 import sys
 
-from re_analyzer.analyzers.iterator import property_details_iterator, get_property_info_from_property_details
+from re_analyzer.analyzers.iterator import cached_property_details_iterator
 
 
 cnt = 0
 property_details_list = []
-for property_details in property_details_iterator():
-    property_info = get_property_info_from_property_details(property_details)
-    if 'zestimateHistory' not in property_details:
+for property_info, zestimate_history in cached_property_details_iterator():
+    if zestimate_history is None:
         continue
-    zestimate_history = property_details['zestimateHistory']
     if len(zestimate_history) < 3:
         continue
     property_details_list.append({
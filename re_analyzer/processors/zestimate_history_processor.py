@@ -1,13 +1,13 @@
 import os
 import pandas as pd
 from re_analyzer.utility.utility import PROPERTY_DATA_PATH
-from re_analyzer.analyzers.iterator import property_details_iterator, get_property_info_from_property_details
+from re_analyzer.analyzers.iterator import cached_property_details_iterator
 
 
 ZESTIMATE_HISTORY_PARQUET_PATH = os.path.join(PROPERTY_DATA_PATH, 'zestimate_history_df.parquet')
 
 
-def save_zestimate_history(zestimate_history_data, parquet_path):
+def build_zestimate_history_df(zestimate_history_data):
     # Convert the zestimate history data to a DataFrame
     records = []
     for zpid, history in zestimate_history_data.items():
@@ -17,16 +17,19 @@ def save_zestimate_history(zestimate_history_data, parquet_path):
                 'Date': entry['Date'],
                 'Price': entry['Price']
             })
-    zestimate_history_df = pd.DataFrame(records)
+    zestimate_history_df = pd.DataFrame(records, columns=['zpid', 'Date', 'Price'])
     # Ensure 'Date' column is in datetime format
     zestimate_history_df['Date'] = pd.to_datetime(zestimate_history_df['Date'])
     # Sort the DataFrame by 'Date'
     zestimate_history_df.sort_values(by='Date', inplace=True)
     # Set 'Date' as the index
     zestimate_history_df.set_index('Date', inplace=True)
-    
+    return zestimate_history_df
+
+
+def save_zestimate_history(zestimate_history_data, parquet_path):
     # Save the DataFrame to a Parquet file
-    zestimate_history_df.to_parquet(parquet_path, compression='gzip')
+    build_zestimate_history_df(zestimate_history_data).to_parquet(parquet_path, compression='gzip')
 
 
 def save_zestimate_history_pipeline():
@@ -34,20 +37,18 @@ def save_zestimate_history_pipeline():
     total_properties = 0
     processed_properties = 0
 
-    for property_details in property_details_iterator():
+    for property_info, zestimate_history in cached_property_details_iterator():
         total_properties += 1
-        property_info = get_property_info_from_property_details(property_details)
         if not property_info:
-            print(f"Skipping property with missing info: {property_details}")
+            print(f"Skipping property with missing info (zestimateHistory: {zestimate_history})")
             continue
-        if 'zestimateHistory' not in property_details:
+        if zestimate_history is None:
             print(f"Skipping property without zestimateHistory: {property_info}")
             continue
         zpid = property_info.get("zpid", 0)
         if zpid == 0:
             print(f"Skipping property with invalid zpid: {property_info}")
             continue
-        zestimate_history = property_details['zestimateHistory']
         zestimate_history_data[zpid] = zestimate_history
         processed_properties += 1
 
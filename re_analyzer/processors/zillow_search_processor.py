@@ -1,8 +1,15 @@
 import os
 import json
 import csv
+import sqlite3
+import argparse
 from enum import Enum
-from re_analyzer.utility.utility import SEARCH_LISTINGS_DATA_PATH, SEARCH_LISTINGS_METADATA_PATH, SEARCH_RESULTS_PROCESSED_PATH
+from re_analyzer.utility.utility import (
+    SEARCH_LISTINGS_DATA_PATH,
+    SEARCH_LISTINGS_METADATA_PATH,
+    SEARCH_RANKING_INDEX_PATH,
+    SEARCH_RESULTS_PROCESSED_PATH,
+)
 
 
 class SortOrder(Enum):
@@ -11,6 +18,49 @@ class SortOrder(Enum):
 
 SORT_ORDER = SortOrder.SORT_ORDER_DESCENDING
 MAX_HOME_PRICE = 500000
+RANKING_FIELDS = ['zpid', 'address', 'home_type', 'zip_code', 'url', 'listing_price', 'restimate', 'is_active', 'rentZestimate_to_price_ratio', 'rentZestimate_to_Zestimate_ratio']
+# Metrics the ranking index keeps a sorted (B-tree) index on.
+RANKING_METRICS = ('rentZestimate_to_price_ratio', 'rentZestimate_to_Zestimate_ratio')
+# Bump when the ranked_listings layout changes; older index files are rebuilt from SearchResults.
+RANKING_INDEX_VERSION = 2
+
+
+def _ranking_row(listing, active_zpids_set):
+    """The ranking row of one search listing, or None when the listing is filtered out."""
+    listing_price = listing.get("unformattedPrice", 0)
+    Zestimate = listing.get("hdpData", {}).get("homeInfo", {}).get("zestimate", 0)
+    rentZestimate = listing.get("hdpData", {}).get("homeInfo", {}).get("rentZestimate", 0)
+    zpid = listing.get("zpid")
+    zip_code = int(listing.get("hdpData", {}).get("homeInfo", {}).get("zipcode", "00000"))
+    home_type = listing.get("hdpData", {}).get("homeInfo", {}).get("homeType", "NO_HOME_TYPE_PROVIDED")
+    area = listing.get("area", 0)
+    detailUrl = listing.get("detailUrl", "")
+
+    rentZestimate_to_area_ratio = rentZestimate / area if area != 0 else 0
+
+    # We filter out homes we do not want.
+    if listing_price == 0 or Zestimate == 0 or rentZestimate == 0 or home_type == "MANUFACTURED" or rentZestimate_to_area_ratio > 7.5 or detailUrl == "":
+        return None
+
+    rentZestimate_to_price_ratio = rentZestimate / listing_price if listing_price != 0 else 0
+    rentZestimate_to_Zestimate_ratio = rentZestimate / Zestimate if Zestimate != 0 else 0
+    return {
+        "zpid": zpid,
+        "address": listing.get("address", "NO_ADDRESS_PROVIDED"),
+        "home_type": home_type,
+        "zip_code": zip_code,
+        "url": detailUrl,
+        "listing_price": listing_price,
+        "restimate": rentZestimate,
+        "is_active": zpid in active_zpids_set,
+        "rentZestimate_to_price_ratio": rentZestimate_to_price_ratio,
+        "rentZestimate_to_Zestimate_ratio": rentZestimate_to_Zestimate_ratio
+    }
+
+
+def _listings_filenames(search_listings_path):
+    # Timestamped names sort chronologically.
+    return sorted(filename for filename in os.listdir(search_listings_path) if filename.endswith(".json") and filename.startswith("listings_"))
 
 
 def process_listings(search_listings_path, search_listings_metadata_path):
@@ -21,74 +71,207 @@ def process_listings(search_listings_path, search_listings_metadata_path):
         active_zpids_set = set(search_listings_metadata.get('active_zpids', {}))
 
     # Iterate through all files in the search_listings_path
-    for filename in os.listdir(search_listings_path):
-        if filename.endswith(".json") and filename.startswith("listings_"):
-            file_path = os.path.join(search_listings_path, filename)
-
-            # Read each JSON file
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-
-                # Process each listing in the JSON file
-                for listing in data:
-
-                    listing_price = listing.get("unformattedPrice", 0)
-                    Zestimate = listing.get("hdpData", {}).get("homeInfo", {}).get("zestimate", 0)
-                    rentZestimate = listing.get("hdpData", {}).get("homeInfo", {}).get("rentZestimate", 0)
-                    zpid = listing.get("zpid")
-                    zip_code = int(listing.get("hdpData", {}).get("homeInfo", {}).get("zipcode", "00000"))
-                    home_type = listing.get("hdpData", {}).get("homeInfo", {}).get("homeType", "NO_HOME_TYPE_PROVIDED")
-                    area = listing.get("area", 0)
-                    detailUrl = listing.get("detailUrl", "")
-
-                    rentZestimate_to_area_ratio = rentZestimate / area if area != 0 else 0
-
-                    # We filter out homes we do not want.
-                    if listing_price == 0 or Zestimate == 0 or rentZestimate == 0 or home_type == "MANUFACTURED" or rentZestimate_to_area_ratio > 7.5 or detailUrl == "":
-                        continue
-
-                    rentZestimate_to_price_ratio = rentZestimate / listing_price if listing_price != 0 else 0
-                    rentZestimate_to_Zestimate_ratio = rentZestimate / Zestimate if Zestimate != 0 else 0
-                    results.append({
-                        "zpid": zpid,
-                        "address": listing.get("address", "NO_ADDRESS_PROVIDED"),
-                        "home_type": home_type,
-                        "zip_code": zip_code,
-                        "url": detailUrl,
-                        "listing_price": listing_price,
-                        "restimate": rentZestimate,
-                        "is_active": zpid in active_zpids_set,
-                        "rentZestimate_to_price_ratio": rentZestimate_to_price_ratio,
-                        "rentZestimate_to_Zestimate_ratio": rentZestimate_to_Zestimate_ratio
-                    })
+    for filename in _listings_filenames(search_listings_path):
+        file_path = os.path.join(search_listings_path, filename)
+
+        # Read each JSON file
+        with open(file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+            # Process each listing in the JSON file
+            for listing in data:
+                row = _ranking_row(listing, active_zpids_set)
+                if row is not None:
+                    results.append(row)
     return results
 
-def process_all_zip_codes():
-    all_results = []
 
-    # Iterate through each subdirectory in the root directory
-    for zip_code_folder in os.listdir(SEARCH_LISTINGS_DATA_PATH):
-        search_listings_path = os.path.join(SEARCH_LISTINGS_DATA_PATH, zip_code_folder)
-        search_listings_metadata_path = os.path.join(SEARCH_LISTINGS_METADATA_PATH, f'{zip_code_folder}_metadata.json')
+#####################
+## RANKING INDEX   ##
+#####################
+
+def open_ranking_index(index_path=None):
+    """Connect to the persisted ranking index, creating its tables and metric indexes."""
+    connection = sqlite3.connect(index_path or SEARCH_RANKING_INDEX_PATH)
+    connection.row_factory = sqlite3.Row
+    if connection.execute("PRAGMA user_version").fetchone()[0] != RANKING_INDEX_VERSION:
+        connection.executescript(f"""
+            DROP TABLE IF EXISTS ranked_listings;
+            DROP TABLE IF EXISTS indexed_zip_folders;
+            PRAGMA user_version = {RANKING_INDEX_VERSION};
+        """)
+    # zpid stays the scraped string and the untyped price columns keep ints as ints, so rows
+    # read back exactly as process_listings built them. Every scraped row is kept, in order:
+    # (source_zip, position) rather than zpid is the key, and it breaks metric ties.
+    connection.executescript(f"""
+        CREATE TABLE IF NOT EXISTS ranked_listings (
+            source_zip TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            zpid TEXT,
+            address TEXT,
+            home_type TEXT,
+            zip_code INTEGER,
+            url TEXT,
+            listing_price,
+            restimate,
+            is_active INTEGER,
+            rentZestimate_to_price_ratio REAL,
+            rentZestimate_to_Zestimate_ratio REAL,
+            PRIMARY KEY (source_zip, position)
+        );
+        CREATE TABLE IF NOT EXISTS indexed_zip_folders (
+            source_zip TEXT PRIMARY KEY,
+            signature TEXT NOT NULL
+        );
+        {''.join(f'CREATE INDEX IF NOT EXISTS ranked_listings_{metric} ON ranked_listings ({metric});' for metric in RANKING_METRICS)}
+    """)
+    return connection
+
+
+def insert_listings(connection, source_zip, rows):
+    """Append ranking rows scraped from ZIP folder ``source_zip`` after the folder's existing rows."""
+    start = connection.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM ranked_listings WHERE source_zip = ?", (str(source_zip),)).fetchone()[0]
+    connection.executemany(
+        f"INSERT INTO ranked_listings (source_zip, position, {', '.join(RANKING_FIELDS)}) VALUES (?, ?{', ?' * len(RANKING_FIELDS)})",
+        ((str(source_zip), start + offset, *(row[field] for field in RANKING_FIELDS)) for offset, row in enumerate(rows)),
+    )
+
+
+def delete_listings(connection, source_zip, zpids=None):
+    """Remove the given zpids of ZIP folder ``source_zip``, or the whole folder when zpids is None."""
+    if zpids is None:
+        connection.execute("DELETE FROM ranked_listings WHERE source_zip = ?", (str(source_zip),))
+        connection.execute("DELETE FROM indexed_zip_folders WHERE source_zip = ?", (str(source_zip),))
+    else:
+        connection.executemany("DELETE FROM ranked_listings WHERE source_zip = ? AND zpid = ?", ((str(source_zip), str(zpid)) for zpid in zpids))
+
 
-        # Check if it's a directory
-        if os.path.isdir(search_listings_path):
-            print(f"Processing listings in {search_listings_path}...")
-            results = process_listings(search_listings_path, search_listings_metadata_path)
-            all_results.extend(results)
+def _zip_folder_signature(search_listings_path, search_listings_metadata_path):
+    """Names, sizes and mtimes of a ZIP folder's listings files and its metadata file."""
+    paths = [os.path.join(search_listings_path, filename) for filename in _listings_filenames(search_listings_path)]
+    paths.append(search_listings_metadata_path)
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return json.dumps(signature)
 
-    reverse_sort = True if SORT_ORDER == SortOrder.SORT_ORDER_DESCENDING else False
-    sorted_results = sorted(all_results, key=lambda x: x['rentZestimate_to_price_ratio'], reverse=reverse_sort)
+
+def index_zip_folder(connection, zip_code_folder, search_listings_data_path=None, search_listings_metadata_path=None):
+    """Re-index one SearchResults ZIP folder if its files changed since it was last indexed.
+
+    Returns True when the folder was re-indexed. The folder's previous rows are
+    replaced, so zpids dropped from the scrape leave the ranking.
+    """
+    search_listings_path = os.path.join(search_listings_data_path or SEARCH_LISTINGS_DATA_PATH, zip_code_folder)
+    metadata_path = os.path.join(search_listings_metadata_path or SEARCH_LISTINGS_METADATA_PATH, f'{zip_code_folder}_metadata.json')
+    signature = _zip_folder_signature(search_listings_path, metadata_path)
+    indexed = connection.execute("SELECT signature FROM indexed_zip_folders WHERE source_zip = ?", (zip_code_folder,)).fetchone()
+    if indexed is not None and indexed['signature'] == signature:
+        return False
+    rows = process_listings(search_listings_path, metadata_path)
+    with connection:
+        delete_listings(connection, zip_code_folder)
+        insert_listings(connection, zip_code_folder, rows)
+        connection.execute("INSERT INTO indexed_zip_folders VALUES (?, ?)", (zip_code_folder, signature))
+    return True
+
+
+def sync_ranking_index(connection, search_listings_data_path=None, search_listings_metadata_path=None):
+    """Bring the ranking index up to date with the SearchResults tree, touching only changed ZIP folders."""
+    search_listings_data_path = search_listings_data_path or SEARCH_LISTINGS_DATA_PATH
+    zip_code_folders = {
+        zip_code_folder for zip_code_folder in os.listdir(search_listings_data_path)
+        if os.path.isdir(os.path.join(search_listings_data_path, zip_code_folder))
+    } if os.path.isdir(search_listings_data_path) else set()
+
+    reindexed = 0
+    for zip_code_folder in sorted(zip_code_folders):
+        if index_zip_folder(connection, zip_code_folder, search_listings_data_path, search_listings_metadata_path):
+            print(f"Indexed listings in {os.path.join(search_listings_data_path, zip_code_folder)}...")
+            reindexed += 1
+    removed = [row['source_zip'] for row in connection.execute("SELECT source_zip FROM indexed_zip_folders") if row['source_zip'] not in zip_code_folders]
+    with connection:
+        for zip_code_folder in removed:
+            delete_listings(connection, zip_code_folder)
+    return {'zip_folders': len(zip_code_folders), 'reindexed': reindexed, 'removed': len(removed)}
+
+
+def top_listings(connection, metric='rentZestimate_to_price_ratio', limit=None, zip_codes=None, home_types=None, max_price=None, ascending=False):
+    """Ranking rows ordered by ``metric``, optionally filtered and cut to ``limit``.
+
+    Rows are read in the metric's index order and the scan stops after ``limit``
+    matches, so top-N queries never sort the whole catalog.
+    """
+    if metric not in RANKING_METRICS:
+        raise ValueError(f"Unknown ranking metric: {metric}")
+    conditions, parameters = [], []
+    if zip_codes is not None:
+        zip_codes = [int(zip_code) for zip_code in zip_codes]
+        conditions.append(f"zip_code IN ({', '.join('?' * len(zip_codes))})")
+        parameters.extend(zip_codes)
+    if home_types is not None:
+        home_types = list(home_types)
+        conditions.append(f"home_type IN ({', '.join('?' * len(home_types))})")
+        parameters.extend(home_types)
+    if max_price is not None:
+        conditions.append("listing_price <= ?")
+        parameters.append(max_price)
+    query = f"SELECT {', '.join(RANKING_FIELDS)} FROM ranked_listings INDEXED BY ranked_listings_{metric}"
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+    # Ties keep scrape order, like the stable sort of the all-in-memory ranking.
+    query += f" ORDER BY {metric} {'ASC' if ascending else 'DESC'}, source_zip, position"
+    if limit is not None:
+        query += " LIMIT ?"
+        parameters.append(limit)
+    results = []
+    for row in connection.execute(query, parameters):
+        result = dict(row)
+        result['is_active'] = bool(result['is_active'])
+        results.append(result)
+    return results
+
+
+def process_all_zip_codes(index_path=None):
+    connection = open_ranking_index(index_path)
+    try:
+        print(sync_ranking_index(connection))
+        sorted_results = top_listings(connection, ascending=SORT_ORDER == SortOrder.SORT_ORDER_ASCENDING)
+    finally:
+        connection.close()
 
     # Save all results to a new file
     with open(SEARCH_RESULTS_PROCESSED_PATH, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['zpid', 'address', 'home_type', 'zip_code', 'url', 'listing_price', 'restimate', 'is_active', 'rentZestimate_to_price_ratio', 'rentZestimate_to_Zestimate_ratio']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=RANKING_FIELDS)
 
         writer.writeheader()
         for result in sorted_results:
             writer.writerow(result)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank Zillow search listings, re-indexing only ZIP folders that changed.")
+    parser.add_argument("--top", type=int, default=0, help="Print the top N listings instead of writing the full CSV (0 writes the CSV).")
+    parser.add_argument("--metric", choices=RANKING_METRICS, default=RANKING_METRICS[0])
+    parser.add_argument("--zip-codes", nargs="*", help="Only rank listings in these ZIP codes.")
+    parser.add_argument("--home-types", nargs="*", help="Only rank these home types, e.g. SINGLE_FAMILY CONDO.")
+    parser.add_argument("--max-price", type=float, help="Only rank listings at or below this price.")
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    process_all_zip_codes()
+    args = parse_args()
+    if args.top:
+        ranking_index = open_ranking_index()
+        try:
+            sync_ranking_index(ranking_index)
+            for ranked_listing in top_listings(ranking_index, args.metric, args.top, args.zip_codes, args.home_types, args.max_price):
+                print(ranked_listing)
+        finally:
+            ranking_index.close()
+    else:
+        process_all_zip_codes()
@@ -31,8 +31,9 @@ import shutil
 import sys
 import time
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
+from re_analyzer.scrapers.fetched_inventory import FetchedInventory, ZipInventory, scan_fetched_tree
 from re_analyzer.utility.utility import DATA_PATH
 
 DATA_ROOT = Path(DATA_PATH)
@@ -67,20 +68,6 @@ def _fmt_size(n_bytes: int) -> str:
     return f"{n_bytes} B"
 
 
-def _newest_listing_mtime(zip_dir: Path) -> Optional[float]:
-    """Return the mtime of the newest canonical or raw listing file in a ZIP dir."""
-    best: Optional[float] = None
-    for pattern in ("canonical_listings_*.json", "listings_*.json"):
-        for f in zip_dir.glob(pattern):
-            try:
-                mtime = f.stat().st_mtime
-                if best is None or mtime > best:
-                    best = mtime
-            except OSError:
-                pass
-    return best
-
-
 def _age_days(mtime: float) -> float:
     return (time.time() - mtime) / 86400
 
@@ -131,29 +118,38 @@ def _scan_diagnostics() -> CleanTarget:
     )
 
 
-def _scan_old_listings() -> CleanTarget:
-    paths: List[Path] = []
-    if FETCHED_ROOT.exists():
-        for provider_dir in sorted(FETCHED_ROOT.iterdir()):
-            if not provider_dir.is_dir() or provider_dir.name not in KNOWN_PROVIDERS:
-                continue
-            for zip_dir in sorted(provider_dir.iterdir()):
-                if not zip_dir.is_dir():
-                    continue
-                for pattern in ("listings_*.json", "canonical_listings_*.json"):
-                    candidates = sorted(zip_dir.glob(pattern), reverse=True)
-                    paths.extend(candidates[1:])
-    total = sum(p.stat().st_size for p in paths if p.exists())
+def _fetched_zip_dirs(inventory: Optional[FetchedInventory]) -> Iterator[ZipInventory]:
+    if inventory is None:
+        inventory = scan_fetched_tree(FETCHED_ROOT, KNOWN_PROVIDERS)
+    return inventory.zip_dirs(sorted(KNOWN_PROVIDERS))
+
+
+def _scan_old_listings(inventory: Optional[FetchedInventory] = None) -> CleanTarget:
+    snapshots: List[Path] = []
+    descriptors: List[Path] = []
+    total = 0
+    for zip_inventory in _fetched_zip_dirs(inventory):
+        for old in zip_inventory.raw_files[1:] + zip_inventory.canonical_files[1:]:
+            snapshots.append(old.path)
+            total += old.size
+            # Scrape-time descriptors go with their payloads.
+            descriptor = zip_inventory.descriptor_for(old)
+            if descriptor is not None:
+                descriptors.append(descriptor.path)
+                total += descriptor.size
     return CleanTarget(
         name="old_listings",
         label="Outdated listing snapshots",
-        description=f"Data/Fetched/{{provider}}/{{zip}}/listings_*.json ({len(paths)} older files)",
-        size_bytes=total, item_count=len(paths), item_label="files",
-        paths=paths, freshness_detail=[],
+        description=f"Data/Fetched/{{provider}}/{{zip}}/listings_*.json ({len(snapshots)} older files)",
+        size_bytes=total, item_count=len(snapshots), item_label="files",
+        paths=snapshots + descriptors, freshness_detail=[],
     )
 
 
-def _scan_fetched_data(older_than_days: Optional[float] = None) -> CleanTarget:
+def _scan_fetched_data(
+    older_than_days: Optional[float] = None,
+    inventory: Optional[FetchedInventory] = None,
+) -> CleanTarget:
     """
     ZIP-level listing directories under Data/Fetched/{provider}/.
 
@@ -170,24 +166,18 @@ def _scan_fetched_data(older_than_days: Optional[float] = None) -> CleanTarget:
             paths=[], freshness_detail=[],
         )
 
-    for provider_dir in sorted(FETCHED_ROOT.iterdir()):
-        if not provider_dir.is_dir() or provider_dir.name not in KNOWN_PROVIDERS:
+    total = 0
+    for zip_inventory in _fetched_zip_dirs(inventory):
+        mtime = zip_inventory.newest_listing_mtime
+        if mtime is None:
+            continue  # no listing files, skip
+        age = _age_days(mtime)
+        if older_than_days is not None and age < older_than_days:
             continue
-        provider = provider_dir.name
-        for zip_dir in sorted(provider_dir.iterdir()):
-            if not zip_dir.is_dir():
-                continue
-            zip_code = zip_dir.name
-            mtime = _newest_listing_mtime(zip_dir)
-            if mtime is None:
-                continue  # no listing files, skip
-            age = _age_days(mtime)
-            if older_than_days is not None and age < older_than_days:
-                continue
-            paths.append(zip_dir)
-            detail.append((provider, zip_code, age))
+        paths.append(zip_inventory.path)
+        detail.append((zip_inventory.provider, zip_inventory.zip_code, age))
+        total += zip_inventory.total_bytes
 
-    total = sum(_dir_size(p) for p in paths)
     freshness_note = (
         f" older than {older_than_days:.0f}d" if older_than_days is not None else ""
     )
@@ -218,18 +208,22 @@ def _scan_archive() -> CleanTarget:
 def scan(
     targets: Optional[List[str]] = None,
     older_than_days: Optional[float] = None,
+    inventory: Optional[FetchedInventory] = None,
 ) -> Dict[str, CleanTarget]:
     selected = targets if targets else ALL_TARGETS
+    if inventory is None and ("fetched_data" in selected or "old_listings" in selected):
+        # old_listings and fetched_data share one walk of the Fetched tree.
+        inventory = scan_fetched_tree(FETCHED_ROOT, KNOWN_PROVIDERS)
     result = {}
     for name in selected:
         if name == "fetched_data":
-            result[name] = _scan_fetched_data(older_than_days)
+            result[name] = _scan_fetched_data(older_than_days, inventory)
         elif name == "chrome_profiles":
             result[name] = _scan_chrome_profiles()
         elif name == "diagnostics":
             result[name] = _scan_diagnostics()
         elif name == "old_listings":
-            result[name] = _scan_old_listings()
+            result[name] = _scan_old_listings(inventory)
         elif name == "archive":
             result[name] = _scan_archive()
     return result
@@ -20,8 +20,11 @@ import sys
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from re_analyzer.scrapers.fetched_inventory import FetchedInventory, ZipInventory, scan_fetched_tree
+from re_analyzer.scrapers.injection_manifest import load_payload_descriptor
+from re_analyzer.utility import json_codec
 from re_analyzer.utility.utility import DATA_PATH
 
 FETCHED_ROOT = Path(DATA_PATH) / "Fetched"
@@ -100,36 +103,32 @@ def _age_days(mtime: float) -> float:
     return (time.time() - mtime) / 86400
 
 
+def _zip_dirs(
+    provider_filter: Optional[List[str]],
+    zip_filter: Optional[List[str]],
+    inventory: Optional[FetchedInventory] = None,
+) -> Iterator[ZipInventory]:
+    """ZIP directories of the known (and selected) providers, from one scan of FETCHED_ROOT."""
+    if inventory is None:
+        inventory = scan_fetched_tree(FETCHED_ROOT, KNOWN_PROVIDERS)
+    providers = sorted(p for p in KNOWN_PROVIDERS if not provider_filter or p in provider_filter)
+    return inventory.zip_dirs(providers, zip_filter)
+
+
 def _latest_canonical_files(
     provider_filter: Optional[List[str]],
     zip_filter: Optional[List[str]],
+    inventory: Optional[FetchedInventory] = None,
 ):
     """Yield (provider, zip_code, path) for the most recent canonical JSON per provider/zip."""
-    if not FETCHED_ROOT.exists():
-        return
-    for provider_dir in sorted(FETCHED_ROOT.iterdir()):
-        if not provider_dir.is_dir():
-            continue
-        provider = provider_dir.name
-        if provider not in KNOWN_PROVIDERS:
-            continue
-        if provider_filter and provider not in provider_filter:
-            continue
-        for zip_dir in sorted(provider_dir.iterdir()):
-            if not zip_dir.is_dir():
-                continue
-            zip_code = zip_dir.name
-            if zip_filter and zip_code not in zip_filter:
-                continue
-            candidates = sorted(zip_dir.glob("canonical_listings_*.json"), reverse=True)
-            if candidates:
-                yield provider, zip_code, candidates[0]
+    for zip_inventory in _zip_dirs(provider_filter, zip_filter, inventory):
+        if zip_inventory.latest_canonical:
+            yield zip_inventory.provider, zip_inventory.zip_code, zip_inventory.latest_canonical.path
 
 
 def _load_listings(path: Path) -> List[dict]:
     try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_codec.load_file(path)
         return data if isinstance(data, list) else []
     except Exception:
         return []
@@ -169,9 +168,10 @@ class ProviderStats:
 def analyze(
     provider_filter: Optional[List[str]] = None,
     zip_filter: Optional[List[str]] = None,
+    inventory: Optional[FetchedInventory] = None,
 ) -> Dict[str, ProviderStats]:
     stats: Dict[str, ProviderStats] = {}
-    for provider, zip_code, path in _latest_canonical_files(provider_filter, zip_filter):
+    for provider, zip_code, path in _latest_canonical_files(provider_filter, zip_filter, inventory):
         if provider not in stats:
             stats[provider] = ProviderStats(provider)
         stats[provider].zip_count += 1
@@ -210,57 +210,38 @@ class ZipResourceInfo:
 def analyze_resources(
     provider_filter: Optional[List[str]] = None,
     zip_filter: Optional[List[str]] = None,
+    inventory: Optional[FetchedInventory] = None,
 ) -> List[ZipResourceInfo]:
     rows: List[ZipResourceInfo] = []
-    if not FETCHED_ROOT.exists():
-        return rows
-    for provider_dir in sorted(FETCHED_ROOT.iterdir()):
-        if not provider_dir.is_dir() or provider_dir.name not in KNOWN_PROVIDERS:
-            continue
-        provider = provider_dir.name
-        if provider_filter and provider not in provider_filter:
+    for zip_inventory in _zip_dirs(provider_filter, zip_filter, inventory):
+        newest = zip_inventory.latest_canonical
+        if newest is None and zip_inventory.latest_raw is None:
             continue
-        for zip_dir in sorted(provider_dir.iterdir()):
-            if not zip_dir.is_dir():
-                continue
-            zip_code = zip_dir.name
-            if zip_filter and zip_code not in zip_filter:
-                continue
-
-            canonical_files = sorted(zip_dir.glob("canonical_listings_*.json"), reverse=True)
-            raw_files = sorted(zip_dir.glob("listings_*.json"), reverse=True)
-            if not canonical_files and not raw_files:
-                continue
-
-            # Listing count from newest canonical file
-            listing_count = 0
-            newest_mtime = 0.0
-            if canonical_files:
-                newest_mtime = canonical_files[0].stat().st_mtime
-                listings = _load_listings(canonical_files[0])
-                listing_count = len(listings)
 
+        # Listing count from newest canonical file
+        listing_count = 0
+        newest_mtime = 0.0
+        if newest is not None:
+            newest_mtime = newest.mtime
+            # Scrape-time descriptors carry the count; only older files are decoded.
+            descriptor = load_payload_descriptor(newest.path, newest.stat)
+            if descriptor is not None:
+                listing_count = int(descriptor.get("record_count") or 0)
+            else:
+                listing_count = len(_load_listings(newest.path))
+
+        # Age from newest canonical file mtime
+        age = _age_days(newest_mtime) if newest_mtime else 0.0
+
+        rows.append(ZipResourceInfo(
+            provider=zip_inventory.provider,
+            zip_code=zip_inventory.zip_code,
+            listing_count=listing_count,
             # Sizes (all versions, not just newest)
-            raw_bytes = sum(
-                f.stat().st_size for f in zip_dir.glob("listings_*.json")
-                if f.is_file()
-            )
-            canonical_bytes = sum(
-                f.stat().st_size for f in zip_dir.glob("canonical_listings_*.json")
-                if f.is_file()
-            )
-
-            # Age from newest canonical file mtime
-            age = _age_days(newest_mtime) if newest_mtime else 0.0
-
-            rows.append(ZipResourceInfo(
-                provider=provider,
-                zip_code=zip_code,
-                listing_count=listing_count,
-                raw_bytes=raw_bytes,
-                canonical_bytes=canonical_bytes,
-                age_days=age,
-            ))
+            raw_bytes=zip_inventory.raw_bytes,
+            canonical_bytes=zip_inventory.canonical_bytes,
+            age_days=age,
+        ))
     return rows
 
 
@@ -509,8 +490,10 @@ def main(argv=None):
     provider_filter = [p.lower() for p in args.provider] if args.provider else None
     zip_filter = [str(z).zfill(5) for z in args.zip] if args.zip else None
 
-    all_stats = analyze(provider_filter, zip_filter)
-    resource_rows = analyze_resources(provider_filter, zip_filter) if args.resource else None
+    # One walk of the Fetched tree serves both sections.
+    inventory = scan_fetched_tree(FETCHED_ROOT, KNOWN_PROVIDERS)
+    all_stats = analyze(provider_filter, zip_filter, inventory)
+    resource_rows = analyze_resources(provider_filter, zip_filter, inventory) if args.resource else None
 
     if args.json:
         text = format_json_report(all_stats, resource_rows)
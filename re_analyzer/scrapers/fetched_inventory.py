@@ -0,0 +1,241 @@
+"""One-pass inventory of the Data/Fetched/{provider}/{zip} tree.
+
+data_quality, data_cleanup, normalize_data and the injection manifest all need
+the same facts about the scraped payloads: the latest and older
+canonical_listings_*.json / listings_*.json per provider/ZIP, their sizes and
+mtimes, and per-ZIP totals. scan_fetched_tree walks the tree once with
+os.scandir, stats every file once, and hands those results to each consumer
+instead of each of them globbing, sorting and stat-ing the tree again.
+
+The inventory is a snapshot: callers that delete files (prune, cleanup) should
+update it with ZipInventory.drop_older_files or scan again.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    from re_analyzer.utility.utility import DATA_PATH
+except ImportError:  # pragma: no cover - only used when the package is imported oddly.
+    DATA_PATH = str(Path(__file__).resolve().parents[1] / "Data")
+
+
+FETCHED_ROOT = Path(DATA_PATH) / "Fetched"
+KNOWN_PROVIDERS = ("zillow", "redfin", "realtor")
+CANONICAL_PREFIX = "canonical_listings_"
+RAW_PREFIX = "listings_"
+PAYLOAD_SUFFIX = ".json"
+# Mirrors injection_manifest.DESCRIPTOR_SUFFIX; kept here so this module has no scraper imports.
+DESCRIPTOR_SUFFIX = ".descriptor"
+METADATA_DIR_NAME = "Metadata"
+METADATA_SUFFIX = "_metadata.json"
+
+
+class PayloadFile(NamedTuple):
+    path: Path
+    stat: os.stat_result
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size
+
+    @property
+    def mtime(self) -> float:
+        return self.stat.st_mtime
+
+
+@dataclass
+class ZipInventory:
+    """Payload files of one Fetched/{provider}/{zip} directory, newest first."""
+
+    provider: str
+    zip_code: str
+    path: Path
+    canonical_files: List[PayloadFile] = field(default_factory=list)
+    raw_files: List[PayloadFile] = field(default_factory=list)
+    # Scrape-time descriptors, keyed by the name of the payload they describe.
+    descriptors: Dict[str, PayloadFile] = field(default_factory=dict)
+    # Every file under the directory, payloads or not (diagnostics, manifests, ...).
+    total_bytes: int = 0
+
+    @property
+    def latest_canonical(self) -> Optional[PayloadFile]:
+        return self.canonical_files[0] if self.canonical_files else None
+
+    @property
+    def latest_raw(self) -> Optional[PayloadFile]:
+        return self.raw_files[0] if self.raw_files else None
+
+    @property
+    def older_files(self) -> List[PayloadFile]:
+        """Every canonical and raw payload that a newer one of the same kind supersedes."""
+        return self.canonical_files[1:] + self.raw_files[1:]
+
+    @property
+    def canonical_bytes(self) -> int:
+        return sum(payload.size for payload in self.canonical_files)
+
+    @property
+    def raw_bytes(self) -> int:
+        return sum(payload.size for payload in self.raw_files)
+
+    @property
+    def newest_listing_mtime(self) -> Optional[float]:
+        mtimes = [payload.mtime for payload in self.canonical_files + self.raw_files]
+        return max(mtimes) if mtimes else None
+
+    def descriptor_for(self, payload: PayloadFile) -> Optional[PayloadFile]:
+        return self.descriptors.get(payload.path.name)
+
+    def drop_older_files(self) -> None:
+        """Forget superseded payloads and their descriptors, after they were deleted."""
+        for payload in self.older_files:
+            self.total_bytes -= payload.size
+            descriptor = self.descriptors.pop(payload.path.name, None)
+            if descriptor is not None:
+                self.total_bytes -= descriptor.size
+        del self.canonical_files[1:]
+        del self.raw_files[1:]
+
+
+class FetchedInventory:
+    """ZipInventory per provider/ZIP directory, plus the provider Metadata files."""
+
+    def __init__(
+        self,
+        root: Path,
+        providers: Tuple[str, ...],
+        zips: Dict[Tuple[str, str], ZipInventory],
+        metadata_files: Dict[Tuple[str, str], PayloadFile],
+    ):
+        self.root = root
+        self.providers = providers
+        self.zips = zips
+        self.metadata_files = metadata_files
+
+    def __len__(self) -> int:
+        return len(self.zips)
+
+    def zip_dirs(
+        self,
+        providers=None,
+        zip_codes=None,
+        *,
+        digits_only: bool = False,
+    ) -> Iterator[ZipInventory]:
+        """ZIP directories in the given provider order (default: scan order), each provider's ZIPs by name."""
+        zip_code_filter = {str(zip_code) for zip_code in zip_codes} if zip_codes else None
+        for provider in providers or self.providers:
+            for (zip_provider, zip_code), zip_inventory in self.zips.items():
+                if zip_provider != provider:
+                    continue
+                if digits_only and not zip_code.isdigit():
+                    continue
+                if zip_code_filter is not None and zip_code not in zip_code_filter:
+                    continue
+                yield zip_inventory
+
+    def get(self, provider: str, zip_code: str) -> Optional[ZipInventory]:
+        return self.zips.get((provider, str(zip_code)))
+
+    def metadata_file(self, provider: str, zip_code: str) -> Optional[PayloadFile]:
+        return self.metadata_files.get((provider, str(zip_code)))
+
+
+def _stat_entry(entry: os.DirEntry) -> Optional[os.stat_result]:
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        total += _tree_size(entry.path)
+                    elif entry.is_file():
+                        total += entry.stat().st_size
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return total
+
+
+def _scan_zip_dir(provider: str, zip_code: str, path: str) -> ZipInventory:
+    zip_inventory = ZipInventory(provider, zip_code, Path(path))
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        zip_inventory.total_bytes += _tree_size(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                stat = _stat_entry(entry)
+                if stat is None:
+                    continue
+                zip_inventory.total_bytes += stat.st_size
+                payload = PayloadFile(Path(entry.path), stat)
+                if name.endswith(PAYLOAD_SUFFIX):
+                    if name.startswith(CANONICAL_PREFIX):
+                        zip_inventory.canonical_files.append(payload)
+                    elif name.startswith(RAW_PREFIX):
+                        zip_inventory.raw_files.append(payload)
+                elif name.endswith(PAYLOAD_SUFFIX + DESCRIPTOR_SUFFIX):
+                    zip_inventory.descriptors[name[:-len(DESCRIPTOR_SUFFIX)]] = payload
+    except OSError:
+        pass
+    # Timestamped names sort chronologically.
+    zip_inventory.canonical_files.sort(key=lambda payload: payload.path.name, reverse=True)
+    zip_inventory.raw_files.sort(key=lambda payload: payload.path.name, reverse=True)
+    return zip_inventory
+
+
+def _scan_metadata_dir(provider: str, path: str, metadata_files: dict) -> None:
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.name.endswith(METADATA_SUFFIX) or not entry.is_file():
+                    continue
+                stat = _stat_entry(entry)
+                if stat is not None:
+                    metadata_files[(provider, entry.name[:-len(METADATA_SUFFIX)])] = PayloadFile(Path(entry.path), stat)
+    except OSError:
+        pass
+
+
+def scan_fetched_tree(fetched_root: Path = FETCHED_ROOT, providers=KNOWN_PROVIDERS) -> FetchedInventory:
+    """Walk fetched_root/{provider}/ once and stat every file once.
+
+    Every subdirectory of a provider directory except Metadata becomes a
+    ZipInventory (callers that only want ZIP codes pass digits_only to zip_dirs).
+    """
+    fetched_root = Path(fetched_root)
+    providers = tuple(providers)
+    zips: Dict[Tuple[str, str], ZipInventory] = {}
+    metadata_files: Dict[Tuple[str, str], PayloadFile] = {}
+    for provider in providers:
+        provider_dir = os.path.join(fetched_root, provider)
+        try:
+            with os.scandir(provider_dir) as entries:
+                subdirs = sorted((entry.name, entry.path) for entry in entries if entry.is_dir())
+        except OSError:
+            continue
+        for name, path in subdirs:
+            if name == METADATA_DIR_NAME:
+                _scan_metadata_dir(provider, path, metadata_files)
+            else:
+                zips[(provider, name)] = _scan_zip_dir(provider, name, path)
+    return FetchedInventory(fetched_root, providers, zips, metadata_files)
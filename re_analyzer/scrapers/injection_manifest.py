@@ -8,10 +8,17 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from re_analyzer.scrapers.fetched_inventory import FetchedInventory, scan_fetched_tree
+from re_analyzer.utility import json_codec
+
 try:
     from re_analyzer.utility.utility import DATA_PATH
 except ImportError:  # pragma: no cover - only used when the package is imported oddly.
@@ -22,6 +29,12 @@ FETCHED_ROOT = Path(DATA_PATH) / "Fetched"
 KNOWN_PROVIDERS = ("zillow", "redfin", "realtor")
 GLOBAL_MANIFEST_NAME = "injection_manifest.json"
 ZIP_MANIFEST_NAME = "injection_manifest_latest.json"
+# Sidecar cache of (path, size, mtime_ns) -> sha256/record_count, kept in the Fetched root.
+FILE_CACHE_NAME = "injection_manifest_cache.sqlite"
+HASH_CHUNK_BYTES = 1024 * 1024
+# Written next to each scraped payload (listings_*.json.descriptor); the name keeps it
+# out of the listings_*.json globs.
+DESCRIPTOR_SUFFIX = ".descriptor"
 SCHEMA_VERSION = 1
 
 ARTIFACT_POLICY = {
@@ -45,57 +58,279 @@ def _utc_now() -> str:
 
 
 def _relative_path(path: Path, root: Path) -> str:
+    # Paths found by walking the root are lexically under it; resolving costs syscalls.
+    path_str, root_prefix = str(path), str(root).rstrip(os.sep) + os.sep
+    if path_str.startswith(root_prefix) and ".." not in path_str.split(os.sep):
+        return path_str[len(root_prefix):].replace(os.sep, "/")
     try:
         return path.resolve().relative_to(root.resolve()).as_posix()
     except ValueError:
         return str(path)
 
 
-def _sha256(path: Path) -> str:
+def _mapped(fh):
+    """Read-only mmap of an open file, or None where mapping fails (e.g. empty files)."""
+    try:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def _sha256(path: Path, use_mmap: bool = False) -> str:
     digest = hashlib.sha256()
     with path.open("rb") as fh:
-        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+        mapped = _mapped(fh) if use_mmap else None
+        if mapped is not None:
+            # One update over the whole mapping; hashlib releases the GIL while hashing it.
+            with mapped:
+                digest.update(mapped)
+            return digest.hexdigest()
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_BYTES), b""):
             digest.update(chunk)
     return digest.hexdigest()
 
 
-def _json_list_count(path: Path) -> Optional[int]:
+def _list_count(data) -> Optional[int]:
     try:
-        with path.open(encoding="utf-8") as fh:
-            payload = json.load(fh)
+        payload = json_codec.loads(data)
     except Exception:
         return None
     return len(payload) if isinstance(payload, list) else None
 
 
-def _payload_file_info(path: Optional[Path], fetched_root: Path, *, include_record_count: bool = True) -> Optional[dict]:
+def _hash_and_count(path: Path, use_mmap: bool = False) -> tuple:
+    """(sha256, record count) from a single read (or mapping) of the file."""
+    with path.open("rb") as fh:
+        mapped = _mapped(fh) if use_mmap else None
+        if mapped is None:
+            data = fh.read()
+            return hashlib.sha256(data).hexdigest(), _list_count(data)
+        with mapped:
+            with memoryview(mapped) as view:
+                return hashlib.sha256(view).hexdigest(), _list_count(view)
+
+
+def descriptor_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + DESCRIPTOR_SUFFIX)
+
+
+def _is_populated(value) -> bool:
+    return value is not None and value != "" and value != 0 and value != {} and value != []
+
+
+def populated_field_counts(records: list) -> dict:
+    """{field: number of records with a non-empty value} over a list of listing dicts."""
+    counts: dict = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for field, value in record.items():
+            if _is_populated(value):
+                counts[field] = counts.get(field, 0) + 1
+    return counts
+
+
+def write_payload_file(records: list, path: Path, *, default=None, include_field_counts: bool = False) -> dict:
+    """Write a JSON list payload and its descriptor; return the descriptor.
+
+    The descriptor records what the writer already knows (record count, bytes,
+    sha256 of the bytes written, and with include_field_counts the populated-field
+    counts), so readers need not decode the payload. It is trusted only while the
+    payload's size and mtime still match.
+    """
+    path = Path(path)
+    payload = json_codec.dump_file(records, path, default=default)
+    descriptor = {
+        "schema_version": SCHEMA_VERSION,
+        "record_count": len(records),
+        "bytes": len(payload),
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "mtime_ns": path.stat().st_mtime_ns,
+    }
+    if include_field_counts:
+        descriptor["field_counts"] = populated_field_counts(records)
+    json_codec.dump_file(descriptor, descriptor_path(path))
+    return descriptor
+
+
+def load_payload_descriptor(path: Path, stat=None) -> Optional[dict]:
+    """The payload's descriptor, or None when missing, unreadable or stale."""
+    try:
+        stat = stat or Path(path).stat()
+        descriptor = json_codec.load_file(descriptor_path(path))
+    except Exception:
+        return None
+    if not isinstance(descriptor, dict) or descriptor.get("bytes") != stat.st_size or descriptor.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    return descriptor
+
+
+def _open_cache_database(database: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(database)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS payload_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            counted INTEGER NOT NULL,
+            record_count INTEGER
+        )
+    """)
+    return connection
+
+
+def open_file_cache(fetched_root: Path = FETCHED_ROOT) -> Optional[sqlite3.Connection]:
+    """Open the manifest's sidecar hash cache, or None when it cannot be created (e.g. read-only tree)."""
+    try:
+        Path(fetched_root).mkdir(parents=True, exist_ok=True)
+        return _open_cache_database(str(Path(fetched_root) / FILE_CACHE_NAME))
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _store_digest(file_cache, key: str, stat, sha256: str, counted: bool, record_count: Optional[int]) -> None:
+    if file_cache is None:
+        return
+    try:
+        file_cache.execute(
+            "INSERT OR REPLACE INTO payload_files VALUES (?, ?, ?, ?, ?, ?)",
+            (key, stat.st_size, stat.st_mtime_ns, sha256, int(counted), record_count),
+        )
+    except sqlite3.Error:
+        # The cache only saves work; a locked or broken cache never fails the manifest.
+        pass
+
+
+def _known_digest(path: Path, key: str, stat, include_record_count: bool, file_cache) -> Optional[tuple]:
+    """(sha256, record_count) from the cache or the payload's descriptor, or None when the file must be read."""
+    try:
+        cached = file_cache.execute(
+            "SELECT sha256, counted, record_count FROM payload_files WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (key, stat.st_size, stat.st_mtime_ns),
+        ).fetchone() if file_cache is not None else None
+    except sqlite3.Error:
+        cached = None
+    if cached is not None and (cached[1] or not include_record_count):
+        return cached[0], cached[2]
+    descriptor = load_payload_descriptor(path, stat)
+    if descriptor is None:
+        return None
+    _store_digest(file_cache, key, stat, descriptor["sha256"], True, descriptor.get("record_count"))
+    return descriptor["sha256"], descriptor.get("record_count")
+
+
+def _read_digest(path: Path, include_record_count: bool, use_mmap: bool = False) -> tuple:
+    if include_record_count:
+        return _hash_and_count(path, use_mmap)
+    return _sha256(path, use_mmap), None
+
+
+def _cached_digest(path: Path, key: str, stat, include_record_count: bool, file_cache) -> tuple:
+    """(sha256, record_count) for path from the cache or the payload's descriptor, reading the file only as a last resort."""
+    known = _known_digest(path, key, stat, include_record_count, file_cache)
+    if known is not None:
+        return known
+    sha256, record_count = _read_digest(path, include_record_count)
+    _store_digest(file_cache, key, stat, sha256, include_record_count, record_count)
+    return sha256, record_count
+
+
+def _stat_or_none(path: Path):
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def prefetch_digests(
+    entries: list,
+    fetched_root: Path,
+    file_cache: sqlite3.Connection,
+    *,
+    workers: int = 0,
+    use_mmap: bool = False,
+    stats: Optional[dict] = None,
+) -> dict:
+    """{path: (stat, sha256, record_count)} for (path, include_record_count) entries; missing files are left out.
+
+    The cache is read in one query, and only files it and the descriptors cannot
+    answer are read, in a thread pool; hashlib releases the GIL while hashing, so
+    threads overlap both the reads and the hashing. workers <= 0 uses one thread
+    per CPU; use_mmap hashes memory-mapped files instead of reading them in
+    HASH_CHUNK_BYTES chunks. New digests are stored in file_cache. Paths in
+    stats (e.g. from a fetched_inventory scan) are not stat'ed again.
+    """
+    if not workers or workers < 0:
+        workers = os.cpu_count() or 1
+    try:
+        cached = {row[0]: row[1:] for row in file_cache.execute("SELECT path, size, mtime_ns, sha256, counted, record_count FROM payload_files")}
+    except sqlite3.Error:
+        cached = {}
+    digests, misses = {}, []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stats = dict(stats or {})
+        unknown = [path for path, _ in entries if path not in stats]
+        stats.update(zip(unknown, pool.map(_stat_or_none, unknown)))
+        for path, include_record_count in entries:
+            stat = stats[path]
+            if stat is None:
+                continue
+            key = _relative_path(path, fetched_root)
+            size, mtime_ns, sha256, counted, record_count = cached.get(key) or (None,) * 5
+            if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns) and (counted or not include_record_count):
+                digests[path] = (stat, sha256, record_count)
+                continue
+            descriptor = load_payload_descriptor(path, stat)
+            if descriptor is not None:
+                digests[path] = (stat, descriptor["sha256"], descriptor.get("record_count"))
+                _store_digest(file_cache, key, stat, descriptor["sha256"], True, descriptor.get("record_count"))
+                continue
+            misses.append((path, key, stat, include_record_count))
+        read_digests = pool.map(lambda miss: _read_digest(miss[0], miss[3], use_mmap), misses)
+        # The cache connection stays on this thread; only reads and hashing run in the pool.
+        for (path, key, stat, include_record_count), (sha256, record_count) in zip(misses, read_digests):
+            digests[path] = (stat, sha256, record_count)
+            _store_digest(file_cache, key, stat, sha256, include_record_count, record_count)
+    return digests
+
+
+def _payload_file_info(
+    path: Optional[Path],
+    fetched_root: Path,
+    *,
+    include_record_count: bool = True,
+    file_cache: Optional[sqlite3.Connection] = None,
+    digests: Optional[dict] = None,
+) -> Optional[dict]:
     if not path:
         return None
 
     path = Path(path)
     info = {
         "path": _relative_path(path, fetched_root),
-        "exists": path.exists(),
+        "exists": False,
     }
-    if not path.exists():
-        return info
-
-    stat = path.stat()
+    if digests and path in digests:
+        stat, sha256, record_count = digests[path]
+    else:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return info
+        sha256, record_count = _cached_digest(path, info["path"], stat, include_record_count, file_cache)
     info.update({
+        "exists": True,
         "bytes": stat.st_size,
-        "sha256": _sha256(path),
+        "sha256": sha256,
         "modified_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat().replace("+00:00", "Z"),
     })
     if include_record_count:
-        info["record_count"] = _json_list_count(path)
+        info["record_count"] = record_count
     return info
 
 
-def _latest_file(zip_dir: Path, pattern: str) -> Optional[Path]:
-    files = sorted(zip_dir.glob(pattern), reverse=True)
-    return files[0] if files else None
-
-
 def _provider_metadata_path(fetched_root: Path, provider: str, zip_code: str) -> Path:
     return fetched_root / provider / "Metadata" / f"{zip_code}_metadata.json"
 
@@ -109,17 +344,26 @@ def build_zip_injection_record(
     metadata_path: Optional[Path] = None,
     fetched_root: Path = FETCHED_ROOT,
     generated_at: Optional[str] = None,
+    file_cache: Optional[sqlite3.Connection] = None,
+    digests: Optional[dict] = None,
 ) -> dict:
-    """Return the backend-ready handoff record for one provider/ZIP scrape."""
+    """Return the backend-ready handoff record for one provider/ZIP scrape.
+
+    With ``file_cache`` (see open_file_cache), files whose size and mtime are
+    unchanged reuse their cached sha256 and record count; ``digests`` from
+    prefetch_digests are used as they are.
+    """
     provider = str(provider).strip().lower()
     zip_code = str(zip_code).strip()
     fetched_root = Path(fetched_root)
-    canonical_info = _payload_file_info(Path(canonical_path), fetched_root)
-    raw_info = _payload_file_info(Path(raw_path), fetched_root) if raw_path else None
+    canonical_info = _payload_file_info(Path(canonical_path), fetched_root, file_cache=file_cache, digests=digests)
+    raw_info = _payload_file_info(Path(raw_path), fetched_root, file_cache=file_cache, digests=digests) if raw_path else None
     metadata_info = _payload_file_info(
         Path(metadata_path),
         fetched_root,
         include_record_count=False,
+        file_cache=file_cache,
+        digests=digests,
     ) if metadata_path else None
 
     ready = bool(canonical_info and canonical_info.get("exists") and canonical_info.get("record_count") is not None)
@@ -157,14 +401,20 @@ def write_zip_injection_manifest(
     if manifest_path is None:
         manifest_path = canonical_path.parent / ZIP_MANIFEST_NAME
 
-    record = build_zip_injection_record(
-        provider,
-        zip_code,
-        canonical_path,
-        raw_path=Path(raw_path) if raw_path else None,
-        metadata_path=Path(metadata_path) if metadata_path else None,
-        fetched_root=fetched_root,
-    )
+    # Warm the shared hash cache so the next global manifest skips these files.
+    file_cache = open_file_cache(fetched_root)
+    try:
+        record = build_zip_injection_record(
+            provider,
+            zip_code,
+            canonical_path,
+            raw_path=Path(raw_path) if raw_path else None,
+            metadata_path=Path(metadata_path) if metadata_path else None,
+            fetched_root=fetched_root,
+            file_cache=file_cache,
+        )
+    finally:
+        _close_file_cache(file_cache)
     manifest = {
         "schema_version": SCHEMA_VERSION,
         "generated_at": record["generated_at"],
@@ -192,32 +442,75 @@ def write_zip_injection_manifest(
     return manifest
 
 
-def build_injection_manifest(fetched_root: Path = FETCHED_ROOT, providers: tuple = KNOWN_PROVIDERS) -> dict:
+def _close_file_cache(file_cache: Optional[sqlite3.Connection], keep_paths: Optional[set] = None) -> None:
+    """Commit and close the hash cache; with keep_paths, first drop entries for every other file."""
+    if file_cache is None:
+        return
+    try:
+        if keep_paths is not None:
+            stale = [path for (path,) in file_cache.execute("SELECT path FROM payload_files") if path not in keep_paths]
+            file_cache.executemany("DELETE FROM payload_files WHERE path = ?", ((path,) for path in stale))
+        file_cache.commit()
+    except sqlite3.Error:
+        pass
+    finally:
+        file_cache.close()
+
+
+def build_injection_manifest(
+    fetched_root: Path = FETCHED_ROOT,
+    providers: tuple = KNOWN_PROVIDERS,
+    *,
+    use_file_cache: bool = True,
+    hash_workers: int = 0,
+    use_mmap: bool = False,
+    inventory: Optional[FetchedInventory] = None,
+) -> dict:
+    """Manifest of the latest scrape of every provider/ZIP under fetched_root.
+
+    Only files that changed since the last build are rehashed and recounted; the
+    rest come from the sidecar cache (FILE_CACHE_NAME), unless use_file_cache is False.
+    Files that do need reading are hashed by prefetch_digests with hash_workers
+    threads (0 = one per CPU). An inventory from scan_fetched_tree saves walking
+    and stat-ing the tree again.
+    """
     fetched_root = Path(fetched_root)
     generated_at = _utc_now()
-    records = []
-
-    for provider in providers:
-        provider_dir = fetched_root / provider
-        if not provider_dir.exists():
-            continue
-        for zip_dir in sorted(provider_dir.iterdir(), key=lambda item: item.name):
-            if not zip_dir.is_dir() or not zip_dir.name.isdigit():
-                continue
-            canonical_path = _latest_file(zip_dir, "canonical_listings_*.json")
-            if not canonical_path:
-                continue
-            raw_path = _latest_file(zip_dir, "listings_*.json")
-            metadata_path = _provider_metadata_path(fetched_root, provider, zip_dir.name)
-            records.append(build_zip_injection_record(
+    file_cache = open_file_cache(fetched_root) if use_file_cache else None
+    if file_cache is None:
+        # Still collect the pool's digests for this build, without persisting them.
+        file_cache = _open_cache_database(":memory:")
+    keep_paths = None
+    try:
+        zip_payloads, stats = _latest_zip_payloads(fetched_root, providers, inventory)
+        entries = [
+            (path, include_record_count)
+            for _, _, canonical_path, raw_path, metadata_path in zip_payloads
+            for path, include_record_count in ((canonical_path, True), (raw_path, True), (metadata_path, False))
+            if path
+        ]
+        digests = prefetch_digests(entries, fetched_root, file_cache, workers=hash_workers, use_mmap=use_mmap, stats=stats)
+        records = [
+            build_zip_injection_record(
                 provider,
-                zip_dir.name,
+                zip_code,
                 canonical_path,
                 raw_path=raw_path,
                 metadata_path=metadata_path,
                 fetched_root=fetched_root,
                 generated_at=generated_at,
-            ))
+                file_cache=file_cache,
+                digests=digests,
+            )
+            for provider, zip_code, canonical_path, raw_path, metadata_path in zip_payloads
+        ]
+        if set(providers) >= set(KNOWN_PROVIDERS):
+            # A full build saw every latest file; entries for anything else are stale.
+            keep_paths = {
+                info["path"] for record in records for info in (record["canonical"], record["raw"], record["metadata"]) if info
+            }
+    finally:
+        _close_file_cache(file_cache, keep_paths)
 
     ready_records = [record for record in records if record.get("status") == "ready"]
     return {
@@ -242,15 +535,39 @@ def build_injection_manifest(fetched_root: Path = FETCHED_ROOT, providers: tuple
     }
 
 
+def _latest_zip_payloads(fetched_root: Path, providers: tuple, inventory: Optional[FetchedInventory] = None) -> tuple:
+    """(provider, zip_code, canonical_path, raw_path, metadata_path) of the latest scrape per provider/ZIP, and {path: stat} of those that exist."""
+    if inventory is None:
+        inventory = scan_fetched_tree(fetched_root, providers)
+    zip_payloads, stats = [], {}
+    for zip_inventory in inventory.zip_dirs(providers, digits_only=True):
+        provider, zip_code = zip_inventory.provider, zip_inventory.zip_code
+        canonical, raw = zip_inventory.latest_canonical, zip_inventory.latest_raw
+        if not canonical:
+            continue
+        metadata = inventory.metadata_file(provider, zip_code)
+        for payload in (canonical, raw, metadata):
+            if payload:
+                stats[payload.path] = payload.stat
+        metadata_path = metadata.path if metadata else _provider_metadata_path(fetched_root, provider, zip_code)
+        zip_payloads.append((provider, zip_code, canonical.path, raw.path if raw else None, metadata_path))
+    return zip_payloads, stats
+
+
 def write_injection_manifest(
     fetched_root: Path = FETCHED_ROOT,
     *,
     output_path: Optional[Path] = None,
     providers: tuple = KNOWN_PROVIDERS,
     dry_run: bool = False,
+    hash_workers: int = 0,
+    use_mmap: bool = False,
+    inventory: Optional[FetchedInventory] = None,
 ) -> dict:
     fetched_root = Path(fetched_root)
-    manifest = build_injection_manifest(fetched_root=fetched_root, providers=providers)
+    manifest = build_injection_manifest(
+        fetched_root=fetched_root, providers=providers, hash_workers=hash_workers, use_mmap=use_mmap, inventory=inventory,
+    )
     if output_path is None:
         output_path = fetched_root / GLOBAL_MANIFEST_NAME
 
@@ -21,6 +21,7 @@ from re_analyzer.scrapers.scraping_utility import (
     _bundled_chromedriver_binary,
     _existing_env_path,
 )
+from re_analyzer.scrapers.zip_status_index import provider_zip_statuses
 from re_analyzer.utility.utility import DATA_PATH
 
 
@@ -32,6 +33,8 @@ LOG_LIMIT = int(os.environ.get("LOCAL_SCRAPER_LOG_LIMIT", "2000"))
 RE_ANALYZER_ROOT = Path(__file__).resolve().parents[1]
 DATA_ROOT = Path(DATA_PATH)
 FETCHED_ROOT = DATA_ROOT / "Fetched"
+# The server shares the machine with scraper sessions, so dashboard reconciliation runs stay small.
+RECONCILIATION_MAX_WORKERS = int(os.environ.get("LOCAL_SCRAPER_RECONCILIATION_MAX_WORKERS", "4"))
 
 
 def _detect_binary_version(path: str) -> str:
@@ -380,16 +383,21 @@ def active_total_count():
 
 
 def latest_reconciliation_report():
+    from re_analyzer.scrapers.source_reconciler import load_reconciliation_report
+
     report_dir = FETCHED_ROOT / "Reconciliation"
-    paths = sorted(report_dir.glob("source_reconciliation_*.json"), key=lambda item: item.stat().st_mtime)
+    # Streamed reports are renamed into place when complete; in-progress ones are dot-tmp files.
+    paths = sorted(
+        [*report_dir.glob("source_reconciliation_*.json"), *report_dir.glob("source_reconciliation_*.ndjson")],
+        key=lambda item: item.stat().st_mtime,
+    )
     if not paths:
         return None, {"error": "No source reconciliation reports found.", "report_dir": str(report_dir)}
 
     path = paths[-1]
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            report = json.load(file)
-    except (OSError, json.JSONDecodeError) as exc:
+        report = load_reconciliation_report(path)
+    except (OSError, ValueError) as exc:
         return None, {"error": f"Unable to read source reconciliation report: {exc}", "path": str(path)}
 
     return {
@@ -516,6 +524,18 @@ def bounded_int(value, default, minimum, maximum):
     return min(max(numeric, minimum), maximum)
 
 
+def reconciliation_workers(payload):
+    """Worker processes for a dashboard reconciliation run: 1 unless the payload asks for more, capped."""
+    value = payload.get("workers", 1)
+    if isinstance(value, bool):
+        raise ValueError("workers must be a whole number.")
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("workers must be a whole number.") from None
+    return min(max(workers, 1), RECONCILIATION_MAX_WORKERS)
+
+
 def provider_profile_dir(provider, suffix):
     safe_suffix = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(suffix or "session")).strip("_") or "session"
     return PROFILE_ROOT / f"{provider}_{safe_suffix}"
@@ -1281,70 +1301,48 @@ def zip_coverage():
     provider_summary: dict = {}
 
     for provider in providers_list:
-        meta_dir = FETCHED_ROOT / provider / "Metadata"
+        statuses = provider_zip_statuses(FETCHED_ROOT / provider / "Metadata", all_zips)
         fresh = stale = never = with_data = 0
         status_counts: dict = {}
 
         for zip_code in all_zips:
-            meta_path = meta_dir / f"{zip_code}_metadata.json"
-            if not meta_path.exists():
-                never += 1
-                zip_provider_freshness[zip_code][provider] = "never"
-                if include_detail:
-                    zip_detail_map[zip_code][provider] = {"freshness": "never"}
-                continue
-            try:
-                meta = json.loads(meta_path.read_text(encoding="utf-8"))
-            except Exception:
+            meta = statuses.get(zip_code)
+            if meta is None:
                 never += 1
                 zip_provider_freshness[zip_code][provider] = "never"
                 if include_detail:
                     zip_detail_map[zip_code][provider] = {"freshness": "never"}
                 continue
 
-            last_checked_str = meta.get("last_checked") or ""
-            last_status = meta.get("last_status", "unknown")
-            canonical_count = int(meta.get("canonical_count") or 0)
-            raw_count = int(meta.get("raw_count") or 0)
-            has_data = bool(meta.get("has_saved_payload"))
-            dominant_zip = meta.get("dominant_listing_zip_code") or ""
-            warning_count = int(meta.get("last_run", {}).get("warning_count") or len(meta.get("warnings") or []))
-            error_count = int(meta.get("last_run", {}).get("error_count") or len(meta.get("errors") or []))
+            last_status = meta["last_status"]
+            dominant_zip = meta["dominant_zip"]
 
             status_counts[last_status] = status_counts.get(last_status, 0) + 1
-            if has_data:
+            if meta["has_saved_payload"]:
                 with_data += 1
 
             age_hours = None
             is_fresh = False
-            if last_checked_str:
-                try:
-                    lc = datetime.fromisoformat(last_checked_str)
-                    if lc.tzinfo is None:
-                        lc = lc.replace(tzinfo=timezone.utc)
-                    age_hours = round((now - lc).total_seconds() / 3600, 2)
-                    is_fresh = age_hours <= cooldown_hours
-                except Exception:
-                    pass
+            if meta["last_checked_at"] is not None:
+                age_hours = round((now - meta["last_checked_at"]).total_seconds() / 3600, 2)
+                is_fresh = age_hours <= cooldown_hours
 
             freshness = "fresh" if is_fresh else "stale"
             zip_provider_freshness[zip_code][provider] = freshness
 
             if include_detail:
-                raw_errors = list(meta.get("errors") or [])
-                raw_warnings = list(meta.get("warnings") or [])
                 zip_detail_map[zip_code][provider] = {
                     "freshness": freshness,
                     "last_status": last_status,
-                    "canonical_count": canonical_count,
-                    "raw_count": raw_count,
-                    "has_saved_payload": has_data,
+                    "canonical_count": meta["canonical_count"],
+                    "raw_count": meta["raw_count"],
+                    "has_saved_payload": meta["has_saved_payload"],
                     "dominant_zip": dominant_zip if dominant_zip and dominant_zip != zip_code else None,
                     "age_hours": age_hours,
-                    "warning_count": warning_count,
-                    "error_count": error_count,
-                    "errors": [_strip_exc_stacktrace(str(e))[:300] for e in raw_errors[:5]],
-                    "warnings": [_strip_exc_stacktrace(str(w))[:300] for w in raw_warnings[:5]],
+                    "warning_count": meta["warning_count"],
+                    "error_count": meta["error_count"],
+                    "errors": [_strip_exc_stacktrace(str(e))[:300] for e in meta["errors"]],
+                    "warnings": [_strip_exc_stacktrace(str(w))[:300] for w in meta["warnings"]],
                 }
 
             if is_fresh:
@@ -1430,6 +1428,7 @@ _DATA_QUALITY_FIELDS = [
 def data_quality():
     """Return field-level completeness stats per provider from canonical listing files."""
     try:
+        from re_analyzer.scrapers.injection_manifest import load_payload_descriptor
         from re_analyzer.scrapers.source_reconciler import DEFAULT_PROVIDERS
         from re_analyzer.utility.utility import DATA_PATH
 
@@ -1448,6 +1447,13 @@ def data_quality():
                     if not files:
                         continue
                     zip_count += 1
+                    # Scrape-time descriptors carry the populated-field counts.
+                    descriptor = load_payload_descriptor(files[-1])
+                    if descriptor is not None and "field_counts" in descriptor:
+                        total += int(descriptor.get("record_count") or 0)
+                        for field in _DATA_QUALITY_FIELDS:
+                            field_counts[field] += int(descriptor["field_counts"].get(field) or 0)
+                        continue
                     try:
                         with open(files[-1], "r", encoding="utf-8") as fh:
                             listings = json.load(fh)
@@ -1485,15 +1491,20 @@ def source_reconciliation_latest():
 
 @app.route("/api/source-reconciliation/run", methods=["POST"])
 def source_reconciliation_run():
-    """Discover all scraped ZIPs, run reconciliation, save the report, and return it."""
+    """Discover all scraped ZIPs, run reconciliation, save the report, and return its summary."""
     try:
         from re_analyzer.scrapers.source_reconciler import (
             DEFAULT_PROVIDERS,
-            reconcile_sources,
-            save_reconciliation_report,
+            write_reconciliation_report,
         )
         from re_analyzer.utility.utility import DATA_PATH
 
+        payload = request.get_json(silent=True) or {}
+        try:
+            workers = reconciliation_workers(payload)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
         fetched_root = Path(DATA_PATH) / "Fetched"
         zip_set = set()
         for provider in DEFAULT_PROVIDERS:
@@ -1508,14 +1519,19 @@ def source_reconciliation_run():
             return jsonify({"error": "No scraped canonical listing data found. Run the scraper first."}), 404
 
         zip_codes = sorted(zip_set)
-        report = reconcile_sources(zip_codes)
-        saved = save_reconciliation_report(report)
+        # Per-ZIP reports are streamed to disk; the response carries the statewide summary
+        # and /api/source-reconciliation/latest serves the full saved report.
+        summary = write_reconciliation_report(
+            zip_codes,
+            workers=workers,
+            use_cache=bool(payload.get("use_cache", True)),
+        )
 
         return jsonify({
             "status": "ok",
             "zip_codes_processed": len(zip_codes),
-            "path": saved.get("json_path"),
-            "report": report,
+            "path": summary["saved_paths"].get("json_path"),
+            "report": summary,
         })
     except Exception as exc:
         return jsonify({"error": str(exc)}), 500
@@ -1798,33 +1814,18 @@ def stale_zip_count():
 
     result: dict = {}
     for provider in providers_to_check:
-        meta_dir = FETCHED_ROOT / provider / "Metadata"
+        statuses = provider_zip_statuses(FETCHED_ROOT / provider / "Metadata", all_zips)
         stale = fresh = never = 0
         for zip_code in all_zips:
-            meta_path = meta_dir / f"{zip_code}_metadata.json"
-            if not meta_path.exists():
-                never += 1
-                continue
-            try:
-                meta = json.loads(meta_path.read_text(encoding="utf-8"))
-            except Exception:
+            meta = statuses.get(zip_code)
+            if meta is None or meta["last_checked_at"] is None:
                 never += 1
                 continue
-            last_checked_str = meta.get("last_checked") or ""
-            if not last_checked_str:
-                never += 1
-                continue
-            try:
-                lc = datetime.fromisoformat(last_checked_str)
-                if lc.tzinfo is None:
-                    lc = lc.replace(tzinfo=timezone.utc)
-                age_hours = (now - lc).total_seconds() / 3600
-                if age_hours <= cooldown_hours:
-                    fresh += 1
-                else:
-                    stale += 1
-            except Exception:
-                never += 1
+            age_hours = (now - meta["last_checked_at"]).total_seconds() / 3600
+            if age_hours <= cooldown_hours:
+                fresh += 1
+            else:
+                stale += 1
         result[provider] = {"stale": stale, "fresh": fresh, "never": never, "total": len(all_zips)}
 
     if provider_filter != "all" and providers_to_check:
@@ -5,32 +5,62 @@ Four operations (all idempotent, safe to re-run):
 
   1. ARCHIVE  – moves legacy SearchResults/ and SearchResultsMetadata/ into Data/Archive/
   2. PRUNE    – keeps only the latest timestamped JSON per provider/ZIP; deletes older copies
-  3. BUILD    – reads all latest canonical_listings_*.json files and writes
-                Data/Canonical/canonical_listings.parquet
-  4. MANIFEST - writes Data/Fetched/injection_manifest.json for backend ingestion
+  3. BUILD    – reads the latest canonical_listings_*.json per provider/ZIP and replaces
+                that ZIP's partition of the Hive-partitioned dataset
+                Data/Canonical/canonical_listings/provider=<p>/zip_code=<zip>/,
+                then re-exports the flat Data/Canonical/canonical_listings.parquet
+                (and --output). A ledger in the dataset directory records path, size,
+                mtime, sha256 and row count per ingested file, so unchanged files are
+                skipped; a build without --zip-code drops the partitions of
+                provider/ZIPs that no longer have a canonical JSON.
+  4. MANIFEST - writes Data/Fetched/injection_manifest.json for backend ingestion; payload
+                hashes are cached by size/mtime and changed files are hashed in a thread pool
+
+Read the dataset with read_canonical_listings(zip_codes=..., providers=...), which
+pushes the ZIP/provider filters down to the partition directories.
 
 Run directly:
     ./venv/bin/python -m re_analyzer.scrapers.normalize_data [--dry-run] [--skip-archive]
                                                               [--skip-prune] [--skip-build]
                                                               [--skip-manifest] [--output PATH]
+                                                              [--zip-code ZIP ...] [--provider NAME ...]
+                                                              [--workers N] [--hash-workers N] [--hash-mmap]
 """
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import shutil
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
-from re_analyzer.scrapers.injection_manifest import write_injection_manifest
+import numpy as np
+
+from re_analyzer.scrapers.fetched_inventory import FetchedInventory, ZipInventory, scan_fetched_tree
+from re_analyzer.scrapers.injection_manifest import _sha256, descriptor_path, write_injection_manifest
+from re_analyzer.utility import json_codec
 from re_analyzer.utility.utility import DATA_PATH
 
 DATA_ROOT = Path(DATA_PATH)
 FETCHED_ROOT = DATA_ROOT / "Fetched"
 CANONICAL_DIR = DATA_ROOT / "Canonical"
+CANONICAL_DATASET_DIR = CANONICAL_DIR / "canonical_listings"
+# Flat export of the dataset, written next to it by every BUILD for consumers that have not
+# moved to read_canonical_listings. It keeps the pre-partitioning layout: CANONICAL_COLUMNS
+# only (no provider column) with zip_code holding each listing's own ZIP. A listing without
+# a ZIP gets the scraped ZIP there rather than 0.
+CANONICAL_PARQUET_FILE_NAME = "canonical_listings.parquet"
+CANONICAL_PARQUET_PATH = CANONICAL_DIR / CANONICAL_PARQUET_FILE_NAME
+PARTITION_FILE_NAME = "part-0.parquet"
+# Underscore-prefixed so Parquet dataset discovery ignores it.
+INGEST_LEDGER_FILE_NAME = "_ingest_ledger.sqlite"
 ARCHIVE_ROOT = DATA_ROOT / "Archive"
+# A listing's own ZIP; the zip_code partition column is the ZIP that was scraped.
+LISTING_ZIP_CODE_COLUMN = "listing_zip_code"
 
 KNOWN_PROVIDERS = ("zillow", "redfin", "realtor")
 
@@ -149,6 +179,206 @@ def listing_to_row(listing: dict, scraped_at: str) -> dict:
     }
 
 
+CANONICAL_COLUMNS = tuple(listing_to_row({}, "").keys())
+
+
+# ---------------------------------------------------------------------------
+# Helpers: batched (column-at-a-time) transform
+# ---------------------------------------------------------------------------
+#
+# listings_to_columns() produces exactly what listing_to_row() would for each
+# listing, one column at a time. Numeric inputs take a numpy fast path; anything
+# else falls back to the scalar helpers so odd values parse (or fail) the same
+# way. Rounding stays on Python's round() because np.round differs in the last
+# bit for some values.
+
+_NUMERIC_TYPES = frozenset((int, float, bool, type(None)))
+_INT_TYPES = frozenset((int, bool, type(None)))
+_HOA_KEYS = ("hoaFee", "monthly_hoa", "monthlyHoa", "hoa", "hoaMonthly")
+_INSURANCE_KEYS = ("annualHomeownersInsurance", "homeInsurance", "annualInsurance")
+_IMAGE_KEYS = ("imgSrc", "imgUrl", "image_url", "thumbnail", "photoLink", "photo_url")
+
+
+def _is_numeric(values: list) -> bool:
+    return set(map(type, values)) <= _NUMERIC_TYPES
+
+
+def _float_column(values: list) -> np.ndarray:
+    if not _is_numeric(values):
+        return np.array([_safe_float(val) for val in values], dtype=np.float64)
+    column = np.array(values, dtype=np.float64)
+    # None converts to NaN; only revisit those slots to tell it apart from a real NaN.
+    for index in np.flatnonzero(np.isnan(column)).tolist():
+        if values[index] is None:
+            column[index] = 0.0
+    return column
+
+
+def _int_column(values: list) -> np.ndarray:
+    types = set(map(type, values))
+    if types <= _INT_TYPES:
+        if type(None) in types:
+            values = [0 if val is None else val for val in values]
+        return np.array(values, dtype=np.int64)
+    return np.array([_safe_int(val) for val in values], dtype=np.int64)
+
+
+def _str_column(listings: list, key: str, default: str = "") -> np.ndarray:
+    values = [listing.get(key) for listing in listings]
+    if set(map(type, values)) <= {str, type(None)}:
+        return np.array([val or default for val in values], dtype=object)
+    return np.array([str(val or default) for val in values], dtype=object)
+
+
+def _rounded(values: np.ndarray, digits: int) -> np.ndarray:
+    """``round(value, digits)`` per element, bit-for-bit."""
+    scale = 10.0 ** digits
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = values * scale
+        rounded = np.rint(scaled) / scale
+        # Scaling can only pick the wrong integer within an ulp of a half-way point
+        # (or for non-finite values); hand just those to Python's exact round().
+        near_half = ~(np.abs(scaled - np.floor(scaled) - 0.5) > np.abs(scaled) * 1e-12 + 1e-9)
+    for index in np.flatnonzero(near_half).tolist():
+        rounded[index] = round(float(values[index]), digits)
+    return rounded
+
+
+def _first_raw_float(raws: list, keys: tuple) -> tuple:
+    """(values, found) for the first key per raw dict whose value parses as a float."""
+    found_indexes, found_values = [], []
+    key_set = frozenset(keys)
+    pending = [index for index, raw in enumerate(raws) if not key_set.isdisjoint(raw)]
+    for key in keys:
+        still_pending = []
+        for index in pending:
+            val = raws[index].get(key)
+            if val is not None:
+                try:
+                    found_values.append(float(val))
+                    found_indexes.append(index)
+                    continue
+                except (TypeError, ValueError):
+                    pass
+            still_pending.append(index)
+        pending = still_pending
+    values = np.zeros(len(raws), dtype=np.float64)
+    found = np.zeros(len(raws), dtype=bool)
+    values[found_indexes] = found_values
+    found[found_indexes] = True
+    return values, found
+
+
+def _image_url_column(raws: list) -> np.ndarray:
+    urls = np.full(len(raws), "", dtype=object)
+    key_set = frozenset(_IMAGE_KEYS + ("primary_photo",))
+    pending = [index for index, raw in enumerate(raws) if not key_set.isdisjoint(raw)]
+    for key in _IMAGE_KEYS:
+        still_pending = []
+        for index in pending:
+            val = raws[index].get(key)
+            if val:
+                urls[index] = str(val)
+            else:
+                still_pending.append(index)
+        pending = still_pending
+    for index in pending:
+        primary = raws[index].get("primary_photo") or {}
+        if isinstance(primary, dict) and primary.get("href"):
+            urls[index] = str(primary["href"])
+    return urls
+
+
+def _tax_rate_column(listings: list) -> np.ndarray:
+    indexes, paid_values, assessed_values = [], [], []
+    tax_histories = [listing.get("tax_history") for listing in listings]
+    for index in [index for index, tax_history in enumerate(tax_histories) if tax_history]:
+        tax_history = tax_histories[index]
+        if isinstance(tax_history, list) and isinstance(tax_history[0], dict):
+            paid = tax_history[0].get("taxPaid") or 0
+            value = tax_history[0].get("value") or 0
+            if paid and value:
+                assessed = float(value)
+                if assessed > 0:
+                    indexes.append(index)
+                    paid_values.append(float(paid))
+                    assessed_values.append(assessed)
+    rates = np.full(len(listings), 1.0)  # FL average fallback
+    if indexes:
+        rates[indexes] = _rounded(np.array(paid_values) / np.array(assessed_values) * 100, 4)
+    return rates
+
+
+def _insurance_column(prices: list, price: np.ndarray, raws: list) -> np.ndarray:
+    annual, found = _first_raw_float(raws, _INSURANCE_KEYS)
+    insurance = np.zeros(len(raws), dtype=np.float64)
+    if found.any():
+        insurance[found] = _rounded(annual[found] / 12, 2)
+    if _is_numeric(prices):
+        # For numbers, "price is truthy" is exactly "float(price) != 0".
+        fallback = ~found & (price != 0)
+        fallback_indexes, fallback_prices = fallback, price[fallback]
+    else:
+        fallback_indexes, fallback_prices = [], []
+        for index in np.flatnonzero(~found).tolist():
+            if prices[index]:
+                fallback_indexes.append(index)
+                fallback_prices.append(float(prices[index]))
+        fallback_prices = np.array(fallback_prices, dtype=np.float64)
+    if len(fallback_prices):
+        insurance[fallback_indexes] = _rounded(fallback_prices * _FL_INSURANCE_RATE / 12, 2)
+    return insurance
+
+
+def listings_to_columns(listings: list, scraped_at: str) -> dict:
+    """Column-oriented equivalent of ``[listing_to_row(l, scraped_at) for l in listings]``."""
+    count = len(listings)
+    raws = [listing.get("raw") for listing in listings]
+    raws = [raw if raw and isinstance(raw, dict) else {} for raw in raws]
+
+    prices = [listing.get("price") for listing in listings]
+    price = _float_column(prices)
+    rent = _float_column([listing.get("rent_estimate") for listing in listings])
+    grm = np.zeros(count, dtype=np.float64)
+    has_grm = (rent > 0) & (price > 0)
+    if has_grm.any():
+        grm[has_grm] = _rounded(price[has_grm] / (rent[has_grm] * 12), 4)
+    hoa, _ = _first_raw_float(raws, _HOA_KEYS)
+    canonical_property_id = _str_column(listings, "canonical_property_id")
+
+    return {
+        "property_id": canonical_property_id,
+        "canonical_property_id": canonical_property_id,
+        "source_name": _str_column(listings, "source_name"),
+        "source_property_id": _str_column(listings, "source_property_id"),
+        "street_address": _str_column(listings, "address"),
+        "city": _str_column(listings, "city"),
+        "state": _str_column(listings, "state", "FL"),
+        "zip_code": _int_column([listing.get("zip_code") for listing in listings]),
+        "purchase_price": price,
+        "monthly_restimate": rent,
+        "gross_rent_multiplier": grm,
+        "year_built": _int_column([listing.get("year_built") for listing in listings]),
+        "bedrooms": _int_column([listing.get("beds") for listing in listings]),
+        "bathrooms": _float_column([listing.get("baths") for listing in listings]),
+        "annual_property_tax_rate": _tax_rate_column(listings),
+        "living_area": _int_column([listing.get("living_area") for listing in listings]),
+        "lot_size": _int_column([listing.get("lot_size") for listing in listings]),
+        "home_type": _str_column(listings, "home_type", "SINGLE_FAMILY"),
+        "annual_mortgage_rate": np.full(count, _DEFAULT_MORTGAGE_RATE),
+        "monthly_homeowners_insurance": _insurance_column(prices, price, raws),
+        "monthly_hoa": hoa,
+        "latitude": _float_column([listing.get("latitude") for listing in listings]),
+        "longitude": _float_column([listing.get("longitude") for listing in listings]),
+        "property_url": _str_column(listings, "url"),
+        "image_url": _image_url_column(raws),
+        "home_features_score": np.zeros(count, dtype=np.float64),
+        "is_waterfront": np.full(count, "False", dtype=object),
+        "listing_status": _str_column(listings, "status", "Active"),
+        "scraped_at": np.full(count, scraped_at, dtype=object),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Step 1: Archive legacy directories
 # ---------------------------------------------------------------------------
@@ -180,35 +410,34 @@ def archive_legacy(data_root: Path = DATA_ROOT, dry_run: bool = False) -> dict:
 # Step 2: Prune old timestamped JSON files
 # ---------------------------------------------------------------------------
 
-def _prune_zip_dir(zip_dir: Path, dry_run: bool) -> int:
-    """Keep only the newest canonical and raw listing files; return count deleted."""
+def _prune_zip_dir(zip_inventory: ZipInventory, dry_run: bool) -> Tuple[int, int]:
+    """Keep only the newest canonical and raw listing files; return (files deleted, bytes freed)."""
     deleted = 0
-    for pattern in ("canonical_listings_*.json", "listings_*.json"):
-        files = sorted(zip_dir.glob(pattern), reverse=True)
-        for old in files[1:]:
-            if not dry_run:
-                old.unlink()
-            deleted += 1
-    return deleted
+    freed = 0
+    for old in zip_inventory.older_files:
+        if not dry_run:
+            old.path.unlink()
+            descriptor_path(old.path).unlink(missing_ok=True)
+        deleted += 1
+        freed += old.size
+    if not dry_run:
+        zip_inventory.drop_older_files()
+    return deleted, freed
 
 
-def prune_old_json(fetched_root: Path = FETCHED_ROOT, dry_run: bool = False) -> dict:
+def prune_old_json(
+    fetched_root: Path = FETCHED_ROOT,
+    dry_run: bool = False,
+    inventory: Optional[FetchedInventory] = None,
+) -> dict:
+    if inventory is None:
+        inventory = scan_fetched_tree(fetched_root, KNOWN_PROVIDERS)
     total_deleted = 0
     total_bytes = 0
-    for provider in KNOWN_PROVIDERS:
-        provider_dir = fetched_root / provider
-        if not provider_dir.exists():
-            continue
-        for zip_dir in provider_dir.iterdir():
-            if not zip_dir.is_dir() or not zip_dir.name.isdigit():
-                continue
-            for pattern in ("canonical_listings_*.json", "listings_*.json"):
-                files = sorted(zip_dir.glob(pattern), reverse=True)
-                for old in files[1:]:
-                    total_bytes += old.stat().st_size
-                    total_deleted += 1
-                    if not dry_run:
-                        old.unlink()
+    for zip_inventory in inventory.zip_dirs(KNOWN_PROVIDERS, digits_only=True):
+        deleted, freed = _prune_zip_dir(zip_inventory, dry_run)
+        total_deleted += deleted
+        total_bytes += freed
 
     print(
         f"  {'[dry-run] ' if dry_run else ''}pruned {total_deleted} old JSON files "
@@ -221,92 +450,409 @@ def prune_old_json(fetched_root: Path = FETCHED_ROOT, dry_run: bool = False) ->
 # Step 3: Build canonical Parquet
 # ---------------------------------------------------------------------------
 
-def _latest_canonical_files(fetched_root: Path = FETCHED_ROOT):
-    """Yield (provider, zip_code, path, scraped_at) for each latest canonical JSON."""
-    for provider in KNOWN_PROVIDERS:
-        provider_dir = fetched_root / provider
-        if not provider_dir.exists():
-            continue
-        for zip_dir in provider_dir.iterdir():
-            if not zip_dir.is_dir() or not zip_dir.name.isdigit():
-                continue
-            files = sorted(zip_dir.glob("canonical_listings_*.json"), reverse=True)
-            if files:
-                # Extract timestamp from filename: canonical_listings_YYYY-MM-DD_HH-MM.json
-                stem = files[0].stem  # e.g. canonical_listings_2026-05-28_19-35
-                ts_part = stem.replace("canonical_listings_", "")
-                try:
-                    scraped_at = datetime.strptime(ts_part, "%Y-%m-%d_%H-%M").isoformat()
-                except ValueError:
-                    scraped_at = datetime.now().isoformat()
-                yield provider, zip_dir.name, files[0], scraped_at
+def scraped_at_from_path(path: Path) -> str:
+    # Extract timestamp from filename: canonical_listings_YYYY-MM-DD_HH-MM.json
+    stem = Path(path).stem  # e.g. canonical_listings_2026-05-28_19-35
+    ts_part = stem.replace("canonical_listings_", "")
+    try:
+        return datetime.strptime(ts_part, "%Y-%m-%d_%H-%M").isoformat()
+    except ValueError:
+        return datetime.now().isoformat()
 
 
-def build_canonical_parquet(
+def _latest_canonical_files(
     fetched_root: Path = FETCHED_ROOT,
-    output_path: Optional[Path] = None,
-    dry_run: bool = False,
-    extra_output_paths: Optional[list] = None,
-) -> dict:
-    try:
-        import pandas as pd
-    except ImportError:
-        print("  pandas not available — skipping Parquet build")
-        return {"error": "pandas not available"}
+    zip_codes: Optional[list] = None,
+    providers: tuple = KNOWN_PROVIDERS,
+    inventory: Optional[FetchedInventory] = None,
+):
+    """Yield (provider, zip_code, PayloadFile, scraped_at) for each latest canonical JSON."""
+    if inventory is None:
+        inventory = scan_fetched_tree(fetched_root, providers)
+    for zip_inventory in inventory.zip_dirs(providers, zip_codes, digits_only=True):
+        latest = zip_inventory.latest_canonical
+        if latest:
+            yield zip_inventory.provider, zip_inventory.zip_code, latest, scraped_at_from_path(latest.path)
 
-    if output_path is None:
-        output_path = CANONICAL_DIR / "canonical_listings.parquet"
 
-    rows = []
-    file_count = 0
-    error_count = 0
+def _partition_schema():
+    import pyarrow as pa
+
+    return pa.schema([("provider", pa.string()), ("zip_code", pa.int64())])
 
-    for provider, zip_code, path, scraped_at in _latest_canonical_files(fetched_root):
-        try:
-            with open(path, encoding="utf-8") as fh:
-                listings = json.load(fh)
-            if not isinstance(listings, list):
-                continue
-            for listing in listings:
-                rows.append(listing_to_row(listing, scraped_at))
-            file_count += 1
-        except Exception as exc:
-            print(f"  warning: could not read {path}: {exc}")
-            error_count += 1
 
-    if not rows:
-        print("  no canonical listings found — Parquet not written")
-        return {"rows": 0, "files": file_count, "errors": error_count}
+def _partition_dir(dataset_dir: Path, provider: str, zip_code) -> Path:
+    return Path(dataset_dir) / f"provider={provider}" / f"zip_code={int(zip_code)}"
 
-    df = pd.DataFrame(rows)
 
+def _dedupe_canonical_rows(df):
     # Deduplicate: keep one row per canonical_property_id (latest scraped_at wins)
     if "canonical_property_id" in df.columns and df["canonical_property_id"].str.len().gt(0).any():
         df = df.sort_values("scraped_at", ascending=False).drop_duplicates(
             subset=["canonical_property_id"], keep="first"
         )
+    return df
+
 
+def _partition_columns(listings: list, zip_code, scraped_at: str) -> dict:
+    """Columns for one provider/ZIP partition.
+
+    zip_code comes from the partition path (the scraped ZIP). Nearby listings a
+    ZIP search returns stay in the scrape's partition; their own ZIP is kept in
+    listing_zip_code (the scraped ZIP when the listing has none).
+    """
+    columns = listings_to_columns([listing for listing in listings if isinstance(listing, dict)], scraped_at)
+    listing_zip_codes = columns.pop("zip_code")
+    columns[LISTING_ZIP_CODE_COLUMN] = np.where(listing_zip_codes == 0, int(zip_code), listing_zip_codes)
     # Remove rows with no price and no address (junk entries)
-    df = df[df["purchase_price"].gt(0) | df["street_address"].str.len().gt(0)]
+    keep = (columns["purchase_price"] > 0) | (columns["street_address"] != "")
+    return {name: values[keep] for name, values in columns.items()}
+
+
+def _write_partition_columns(provider: str, zip_code, columns: dict, dataset_dir: Path = CANONICAL_DATASET_DIR) -> dict:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    partition_dir = _partition_dir(dataset_dir, provider, zip_code)
+    row_count = len(columns["property_id"])
+    if not row_count:
+        if partition_dir.exists():
+            shutil.rmtree(partition_dir)
+        return {"rows": 0, "path": str(partition_dir)}
+
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    # Dot-prefixed files are ignored by dataset discovery, so readers never see a partial write.
+    tmp_path = partition_dir / f".{PARTITION_FILE_NAME}.tmp"
+    pq.write_table(pa.Table.from_pydict(columns), tmp_path, compression="snappy")
+    os.replace(tmp_path, partition_dir / PARTITION_FILE_NAME)
+    return {"rows": row_count, "path": str(partition_dir)}
+
+
+def write_canonical_partition(
+    provider: str,
+    zip_code,
+    listings: list,
+    scraped_at: str,
+    dataset_dir: Path = CANONICAL_DATASET_DIR,
+    dry_run: bool = False,
+) -> dict:
+    """Replace the provider/ZIP partition of the canonical dataset with ``listings``."""
+    columns = _partition_columns(listings, zip_code, scraped_at)
+    if dry_run:
+        return {"rows": len(columns["property_id"]), "path": str(_partition_dir(dataset_dir, provider, zip_code))}
+    return _write_partition_columns(provider, zip_code, columns, dataset_dir=dataset_dir)
+
+
+def read_canonical_listings(
+    dataset_dir: Path = CANONICAL_DATASET_DIR,
+    zip_codes: Optional[list] = None,
+    providers: Optional[list] = None,
+    columns: Optional[list] = None,
+    dedupe: bool = True,
+):
+    """Load canonical rows, reading only the partitions matching ``zip_codes``/``providers``."""
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        str(dataset_dir),
+        format="parquet",
+        partitioning=ds.partitioning(_partition_schema(), flavor="hive"),
+    )
+    expression = None
+    if zip_codes:
+        expression = ds.field("zip_code").isin([int(zip_code) for zip_code in zip_codes])
+    if providers:
+        provider_expression = ds.field("provider").isin([str(provider) for provider in providers])
+        expression = provider_expression if expression is None else expression & provider_expression
+    if columns is not None and dedupe:
+        columns = list(dict.fromkeys(list(columns) + ["canonical_property_id", "scraped_at"]))
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    if dedupe:
+        df = _dedupe_canonical_rows(df)
+    ordered = [column for column in CANONICAL_COLUMNS + ("provider",) if column in df.columns]
+    return df[ordered + [column for column in df.columns if column not in ordered]]
+
+
+def _open_ingest_ledger(dataset_dir: Path, dry_run: bool = False) -> sqlite3.Connection:
+    ledger_path = Path(dataset_dir) / INGEST_LEDGER_FILE_NAME
+    if dry_run and not ledger_path.exists():
+        conn = sqlite3.connect(":memory:")
+    else:
+        ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(ledger_path))
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            provider TEXT NOT NULL,
+            zip_code TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            ingested_at TEXT NOT NULL,
+            PRIMARY KEY (provider, zip_code)
+        )
+        """
+    )
+    return conn
 
-    print(f"  {'[dry-run] ' if dry_run else ''}building Parquet: {len(df):,} rows from {file_count} files")
 
+def _ledger_entry(conn: sqlite3.Connection, provider: str, zip_code: str) -> Optional[dict]:
+    row = conn.execute(
+        "SELECT path, size, mtime_ns, sha256, rows FROM ingested_files WHERE provider = ? AND zip_code = ?",
+        (provider, str(zip_code)),
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(("path", "size", "mtime_ns", "sha256", "rows"), row))
+
+
+def _record_ingested_file(conn: sqlite3.Connection, provider: str, zip_code: str, path: Path, stat, sha256: str, rows: int):
+    conn.execute(
+        "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (provider, str(zip_code), str(path), stat.st_size, stat.st_mtime_ns, sha256, rows, datetime.now(timezone.utc).isoformat()),
+    )
+    conn.commit()
+
+
+def _ledger_skip(conn: sqlite3.Connection, provider: str, zip_code, path: Path, stat, dataset_dir: Path, dry_run: bool) -> Optional[dict]:
+    """Result for an already-ingested file, or None when ``path`` has to be parsed."""
+    entry = _ledger_entry(conn, provider, zip_code)
+    partition_present = entry is not None and (
+        entry["rows"] == 0 or (_partition_dir(dataset_dir, provider, zip_code) / PARTITION_FILE_NAME).exists()
+    )
+    if not partition_present or entry["path"] != str(path):
+        return None
+    if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return {"rows": entry["rows"], "skipped": True}
+    # Touched but not rewritten: same bytes produce the same partition.
+    sha256 = _sha256(path)
+    if entry["sha256"] != sha256:
+        return None
     if not dry_run:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(output_path, index=False, compression="snappy")
-        print(f"  written → {output_path}")
+        _record_ingested_file(conn, provider, zip_code, path, stat, sha256, entry["rows"])
+    return {"rows": entry["rows"], "skipped": True}
+
+
+def _remove_stale_partitions(conn: sqlite3.Connection, dataset_dir: Path, sources: set, providers: tuple, dry_run: bool) -> int:
+    """Drop the partitions and ledger rows of ``providers``' ZIPs missing from ``sources``.
+
+    ``sources`` holds (provider, int ZIP) for every provider/ZIP with a canonical JSON.
+    Returns how many provider/ZIPs were (or, in a dry run, would be) removed.
+    """
+    stale = set()
+    for provider in providers:
+        provider_dir = Path(dataset_dir) / f"provider={provider}"
+        if provider_dir.is_dir():
+            for partition_dir in provider_dir.glob("zip_code=*"):
+                zip_code = partition_dir.name.split("=", 1)[1]
+                if zip_code.isdigit() and (provider, int(zip_code)) not in sources:
+                    stale.add((provider, zip_code))
+    ledger_rows = conn.execute(
+        f"SELECT provider, zip_code FROM ingested_files WHERE provider IN ({', '.join('?' * len(providers))})", tuple(providers),
+    ).fetchall()
+    stale_ledger_rows = [(provider, zip_code) for provider, zip_code in ledger_rows if (provider, int(zip_code)) not in sources]
+    stale.update((provider, str(int(zip_code))) for provider, zip_code in stale_ledger_rows)
+    if not dry_run:
+        for provider, zip_code in stale:
+            partition_dir = _partition_dir(dataset_dir, provider, zip_code)
+            if partition_dir.exists():
+                shutil.rmtree(partition_dir)
+        conn.executemany("DELETE FROM ingested_files WHERE provider = ? AND zip_code = ?", stale_ledger_rows)
+        conn.commit()
+    return len(stale)
+
+
+def _parse_canonical_file(provider: str, zip_code, path: Path) -> dict:
+    """Parse one canonical JSON into partition columns; runs in BUILD worker processes."""
+    path = Path(path)
+    listings = json_codec.load_file(path)
+    if not isinstance(listings, list):
+        return {"columns": None, "sha256": None}
+    return {
+        "columns": _partition_columns(listings, zip_code, scraped_at_from_path(path)),
+        "sha256": _sha256(path),
+    }
+
+
+def _store_parsed_file(
+    conn: sqlite3.Connection,
+    provider: str,
+    zip_code,
+    path: Path,
+    stat,
+    parsed: dict,
+    dataset_dir: Path,
+    dry_run: bool,
+) -> dict:
+    columns = parsed["columns"]
+    if columns is None:
+        return {"rows": 0, "skipped": False, "ignored": True}
+    if dry_run:
+        return {"rows": len(columns["property_id"]), "skipped": False}
+    result = _write_partition_columns(provider, zip_code, columns, dataset_dir=dataset_dir)
+    _record_ingested_file(conn, provider, zip_code, path, stat, parsed["sha256"], result["rows"])
+    return {"rows": result["rows"], "skipped": False}
+
+
+def ingest_canonical_file(
+    provider: str,
+    zip_code,
+    path: Path,
+    dataset_dir: Path = CANONICAL_DATASET_DIR,
+    dry_run: bool = False,
+    conn: Optional[sqlite3.Connection] = None,
+) -> dict:
+    """Refresh one partition from ``path`` unless the ledger shows it is already ingested."""
+    if conn is None:
+        conn = _open_ingest_ledger(dataset_dir, dry_run=dry_run)
+        try:
+            return ingest_canonical_file(provider, zip_code, path, dataset_dir=dataset_dir, dry_run=dry_run, conn=conn)
+        finally:
+            conn.close()
+
+    path = Path(path)
+    stat = path.stat()
+    skipped = _ledger_skip(conn, provider, zip_code, path, stat, dataset_dir, dry_run)
+    if skipped is not None:
+        return skipped
+    parsed = _parse_canonical_file(provider, zip_code, path)
+    return _store_parsed_file(conn, provider, zip_code, path, stat, parsed, dataset_dir, dry_run)
+
+
+def _iter_parsed_files(jobs, workers: int = 1):
+    """Yield (job, parsed, error) for (provider, zip_code, path, stat) jobs.
+
+    With workers > 1 the files are parsed in a process pool, keeping at most two
+    parsed files per worker in flight so memory stays bounded however many files
+    the BUILD covers; the caller stays the only writer.
+    """
+    if workers == 1:
+        for job in jobs:
+            try:
+                yield job, _parse_canonical_file(*job[:3]), None
+            except Exception as exc:
+                yield job, None, exc
+        return
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for job in jobs:
+            in_flight.append((job, executor.submit(_parse_canonical_file, *job[:3])))
+            if len(in_flight) >= max_in_flight:
+                done_job, future = in_flight.popleft()
+                yield (done_job, *_future_outcome(future))
+        while in_flight:
+            done_job, future = in_flight.popleft()
+            yield (done_job, *_future_outcome(future))
+
+
+def _future_outcome(future) -> tuple:
+    try:
+        return future.result(), None
+    except Exception as exc:
+        return None, exc
+
+
+def build_canonical_parquet(
+    fetched_root: Path = FETCHED_ROOT,
+    output_path: Optional[Path] = None,
+    dry_run: bool = False,
+    extra_output_paths: Optional[list] = None,
+    dataset_dir: Path = CANONICAL_DATASET_DIR,
+    zip_codes: Optional[list] = None,
+    providers: tuple = KNOWN_PROVIDERS,
+    workers: int = 1,
+    inventory: Optional[FetchedInventory] = None,
+) -> dict:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("  pyarrow not available — skipping Parquet build")
+        return {"error": "pyarrow not available"}
+
+    row_count = 0
+    partition_count = 0
+    file_count = 0
+    skipped_count = 0
+    error_count = 0
+    removed_count = 0
+
+    if not workers or workers < 0:
+        workers = os.cpu_count() or 1
+
+    def _tally(result: dict):
+        nonlocal row_count, partition_count, file_count, skipped_count
+        if result.get("ignored"):
+            return
+        row_count += result["rows"]
+        partition_count += 1 if result["rows"] else 0
+        if result["skipped"]:
+            skipped_count += 1
+        else:
+            file_count += 1
 
-        for extra in (extra_output_paths or []):
-            extra_path = Path(extra)
-            extra_path.parent.mkdir(parents=True, exist_ok=True)
-            df.to_parquet(extra_path, index=False, compression="snappy")
-            print(f"  written → {extra_path}")
+    conn = _open_ingest_ledger(dataset_dir, dry_run=dry_run)
+    try:
+        jobs = []
+        sources = set()
+        for provider, zip_code, (path, stat), _scraped_at in _latest_canonical_files(fetched_root, zip_codes=zip_codes, providers=providers, inventory=inventory):
+            sources.add((provider, int(zip_code)))
+            try:
+                skipped = _ledger_skip(conn, provider, zip_code, path, stat, dataset_dir, dry_run)
+            except Exception as exc:
+                print(f"  warning: could not read {path}: {exc}")
+                error_count += 1
+                continue
+            if skipped is not None:
+                _tally(skipped)
+            else:
+                jobs.append((provider, zip_code, path, stat))
+
+        for (provider, zip_code, path, stat), parsed, error in _iter_parsed_files(jobs, workers=workers):
+            if error is None:
+                try:
+                    _tally(_store_parsed_file(conn, provider, zip_code, path, stat, parsed, dataset_dir, dry_run))
+                    continue
+                except Exception as exc:
+                    error = exc
+            print(f"  warning: could not read {path}: {error}")
+            error_count += 1
+
+        if not zip_codes:
+            removed_count = _remove_stale_partitions(conn, dataset_dir, sources, tuple(providers), dry_run)
+    finally:
+        conn.close()
+
+    print(
+        f"  {'[dry-run] ' if dry_run else ''}building Parquet dataset: {row_count:,} rows "
+        f"in {partition_count} partitions; {file_count} files parsed, {skipped_count} unchanged files skipped, "
+        f"{removed_count} stale partitions removed"
+    )
+
+    if output_path is None:
+        output_path = Path(dataset_dir).parent / CANONICAL_PARQUET_FILE_NAME
+    export_paths = [Path(path) for path in [output_path, *(extra_output_paths or [])]]
+    if not dry_run and Path(dataset_dir).exists() and row_count:
+        # Flat export with the pre-partitioning layout (see CANONICAL_PARQUET_PATH).
+        df = read_canonical_listings(dataset_dir)
+        df["zip_code"] = df.pop(LISTING_ZIP_CODE_COLUMN)
+        df = df[list(CANONICAL_COLUMNS)]
+        for export_path in export_paths:
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(export_path, index=False, compression="snappy")
+            print(f"  written → {export_path}")
 
     return {
-        "rows": len(df),
+        "rows": row_count,
+        "partitions": partition_count,
         "files_read": file_count,
+        "files_skipped": skipped_count,
         "errors": error_count,
-        "output": str(output_path) if not dry_run else None,
+        "partitions_removed": removed_count,
+        "output": str(dataset_dir) if not dry_run else None,
     }
 
 
@@ -325,6 +871,11 @@ def normalize(
     skip_prune: bool = False,
     skip_build: bool = False,
     skip_manifest: bool = False,
+    zip_codes: Optional[list] = None,
+    providers: tuple = KNOWN_PROVIDERS,
+    workers: int = 1,
+    hash_workers: int = 0,
+    hash_mmap: bool = False,
 ) -> dict:
     results: dict = {}
 
@@ -332,17 +883,26 @@ def normalize(
         print("\n[1/4] Archiving legacy directories ...")
         results["archive"] = archive_legacy(data_root=data_root, dry_run=dry_run)
 
+    # Prune, build and manifest share one walk of the Fetched tree; prune drops what it deletes.
+    inventory = None
+    if not (skip_prune and skip_build and skip_manifest):
+        inventory = scan_fetched_tree(fetched_root, KNOWN_PROVIDERS)
+
     if not skip_prune:
         print("\n[2/4] Pruning old timestamped JSON files ...")
-        results["prune"] = prune_old_json(fetched_root=fetched_root, dry_run=dry_run)
+        results["prune"] = prune_old_json(fetched_root=fetched_root, dry_run=dry_run, inventory=inventory)
 
     if not skip_build:
-        print("\n[3/4] Building canonical Parquet ...")
+        print("\n[3/4] Building canonical Parquet dataset ...")
         results["build"] = build_canonical_parquet(
             fetched_root=fetched_root,
             output_path=output_path,
             dry_run=dry_run,
             extra_output_paths=extra_output_paths,
+            zip_codes=zip_codes,
+            providers=providers,
+            workers=workers,
+            inventory=inventory,
         )
 
     if not skip_manifest:
@@ -351,6 +911,9 @@ def normalize(
             fetched_root=fetched_root,
             output_path=manifest_output_path,
             dry_run=dry_run,
+            hash_workers=hash_workers,
+            use_mmap=hash_mmap,
+            inventory=inventory,
         )
 
     return results
@@ -363,7 +926,12 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--skip-prune", action="store_true", help="Skip pruning old JSON timestamps")
     parser.add_argument("--skip-build", action="store_true", help="Skip building the canonical Parquet")
     parser.add_argument("--skip-manifest", action="store_true", help="Skip writing the backend injection manifest")
-    parser.add_argument("--output", type=Path, default=None, help="Override canonical Parquet output path")
+    parser.add_argument("--output", type=Path, default=None, help="Write the flat Parquet export here instead of Data/Canonical/canonical_listings.parquet")
+    parser.add_argument("--zip-code", action="append", default=None, help="Only rebuild partitions for this ZIP (repeatable)")
+    parser.add_argument("--provider", action="append", choices=KNOWN_PROVIDERS, default=None, help="Only rebuild partitions for this provider (repeatable)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to parse canonical JSON during BUILD (0 = one per CPU)")
+    parser.add_argument("--hash-workers", type=int, default=0, help="Threads hashing changed payload files for the MANIFEST (0 = one per CPU)")
+    parser.add_argument("--hash-mmap", action="store_true", help="Hash memory-mapped payload files instead of reading them in chunks")
     parser.add_argument("--manifest-output", type=Path, default=None, help="Override injection manifest output path")
     return parser.parse_args()
 
@@ -379,5 +947,10 @@ if __name__ == "__main__":
         skip_manifest=args.skip_manifest,
         output_path=args.output,
         manifest_output_path=args.manifest_output,
+        zip_codes=args.zip_code,
+        providers=tuple(args.provider or KNOWN_PROVIDERS),
+        workers=args.workers,
+        hash_workers=args.hash_workers,
+        hash_mmap=args.hash_mmap,
     )
     print("\nDone:", results)
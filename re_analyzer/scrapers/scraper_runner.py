@@ -11,6 +11,7 @@ from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from re_analyzer.processors.zillow_search_processor import index_zip_folder, open_ranking_index
 from re_analyzer.scrapers import scraping_utility
 from re_analyzer.scrapers.page_diagnostics import detect_challenge, save_page_diagnostics, wait_for_manual_challenge
 from re_analyzer.scrapers.provider_adapters import (
@@ -20,8 +21,10 @@ from re_analyzer.scrapers.provider_adapters import (
     UnsupportedProviderRegionError,
     ZillowListingProvider,
 )
-from re_analyzer.scrapers.injection_manifest import write_zip_injection_manifest
+from re_analyzer.scrapers.injection_manifest import write_payload_file, write_zip_injection_manifest
+from re_analyzer.scrapers.normalize_data import ingest_canonical_file
 from re_analyzer.scrapers.zip_eligibility import filter_zip_codes_for_scrape
+from re_analyzer.scrapers.zip_status_index import record_zip_status
 from re_analyzer.utility.utility import (
     DATA_PATH,
     PROPERTY_DETAILS_PATH,
@@ -693,10 +696,17 @@ def _save_provider_results(provider, zip_code, raw_listings, canonical_listings)
 
     raw_path = os.path.join(zip_dir, f"listings_{timestamp}.json")
     canonical_path = os.path.join(zip_dir, f"canonical_listings_{timestamp}.json")
-    with open(raw_path, "w", encoding="utf-8") as file:
-        json.dump(raw_listings, file, indent=4, default=str)
-    with open(canonical_path, "w", encoding="utf-8") as file:
-        json.dump([asdict(listing) for listing in canonical_listings], file, indent=4, default=str)
+    # Machine-consumed payloads: compact, via the fast codec when available. Each gets a
+    # descriptor (count, bytes, sha256) so the manifest and reports need not re-parse it.
+    write_payload_file(raw_listings, raw_path, default=str)
+    write_payload_file([asdict(listing) for listing in canonical_listings], canonical_path, default=str, include_field_counts=True)
+
+    # Refresh only this provider/ZIP partition of the canonical Parquet dataset.
+    try:
+        canonical_partition = ingest_canonical_file(provider.source_name, str(zip_code), canonical_path)
+    except Exception as exc:
+        canonical_partition = {"error": f"{type(exc).__name__}: {exc}"}
+        print(f"{provider.source_name} ZIP {zip_code}: canonical partition not written: {canonical_partition['error']}")
 
     injection_manifest = write_zip_injection_manifest(
         provider.source_name,
@@ -710,13 +720,25 @@ def _save_provider_results(provider, zip_code, raw_listings, canonical_listings)
 
     if provider.source_name == "zillow":
         provider.zillow_search.maybe_save_current_search_results(str(zip_code), raw_listings)
+        # Keep the search-listings ranking current with the ZIP that just landed.
+        try:
+            ranking_index = open_ranking_index()
+            try:
+                ranking_reindexed = index_zip_folder(ranking_index, str(zip_code))
+            finally:
+                ranking_index.close()
+        except Exception as exc:
+            ranking_reindexed = {"error": f"{type(exc).__name__}: {exc}"}
+            print(f"{provider.source_name} ZIP {zip_code}: ranking index not updated: {ranking_reindexed['error']}")
         return {
             "saved_payload": True,
             "raw_path": raw_path,
             "canonical_path": canonical_path,
             "injection_manifest_path": injection_manifest_path,
             "injection_ready_count": injection_ready_count,
+            "canonical_partition": canonical_partition,
             "legacy_metadata_path": _legacy_zillow_metadata_path(zip_code),
+            "ranking_reindexed": ranking_reindexed,
         }
 
     metadata = {
@@ -739,6 +761,7 @@ def _save_provider_results(provider, zip_code, raw_listings, canonical_listings)
         "canonical_path": canonical_path,
         "injection_manifest_path": injection_manifest_path,
         "injection_ready_count": injection_ready_count,
+        "canonical_partition": canonical_partition,
     }
 
 
@@ -860,6 +883,7 @@ def _record_provider_zip_metadata(
     ] + existing_history)[:10]
     ensure_directory_exists(os.path.dirname(metadata_path))
     save_json(metadata, metadata_path)
+    record_zip_status(metadata_path, metadata)
     _record_zip_support_status(
         provider.source_name,
         zip_code,
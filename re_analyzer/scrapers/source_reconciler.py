@@ -1,16 +1,21 @@
 import argparse
 import csv
+import hashlib
+import importlib
 import json
 import math
 import os
 import re
 import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from difflib import SequenceMatcher
-from itertools import combinations
+from functools import lru_cache
+from itertools import combinations, repeat
 from pathlib import Path
+from typing import NamedTuple
 
 from re_analyzer.scrapers.scraper_runner import _load_provider, _load_provider_zip_metadata
 from re_analyzer.scrapers import scraping_utility
@@ -95,6 +100,11 @@ DIRECTION_TOKENS = {"n", "s", "e", "w", "ne", "nw", "se", "sw"}
 ORDINAL_RE = re.compile(r"\b(\d+)(?:st|nd|rd|th)\b")
 TRAILING_ZIP_RE = re.compile(r"(?:\s+|-)(\d{5})(?:\s+|$)")
 SPACE_RE = re.compile(r"\s+")
+RECONCILIATION_CACHE_DIR = Path(DATA_PATH) / "Fetched" / "Reconciliation" / "ZipCache"
+# Bump when reconcile_zip output changes so stale cached ZIP reports are recomputed.
+RECONCILIATION_CACHE_VERSION = 2
+# Address strings repeat across runs and providers, so derived street keys are memoized.
+STREET_KEY_CACHE_SIZE = 200_000
 
 
 @dataclass
@@ -244,12 +254,44 @@ def _unit_key(street_key):
     return match.group(1) if match else ""
 
 
+class StreetKeys(NamedTuple):
+    street_key: str
+    base_street_key: str
+    unit_key: str
+
+
+@lru_cache(maxsize=STREET_KEY_CACHE_SIZE)
+def _street_keys(address):
+    street_key = _street_key(address)
+    return StreetKeys(street_key, _base_street_key(street_key), _unit_key(street_key))
+
+
+@lru_cache(maxsize=STREET_KEY_CACHE_SIZE)
+def _url_street_keys(provider_name, url):
+    return _street_keys(_address_like_from_url(provider_name, url))
+
+
+def _street_key_cache_counts():
+    address_info = _street_keys.cache_info()
+    url_info = _url_street_keys.cache_info()
+    return Counter({
+        "hits": address_info.hits + url_info.hits,
+        "misses": address_info.misses + url_info.misses,
+    })
+
+
+def _street_key_cache_summary(counts):
+    lookups = counts.get("hits", 0) + counts.get("misses", 0)
+    return {
+        "hits": counts.get("hits", 0),
+        "misses": counts.get("misses", 0),
+        "hit_rate": round(counts.get("hits", 0) / lookups, 4) if lookups else 0,
+    }
+
+
 def _match_keys(provider_name, address, url, zip_code):
     keys = []
-    for candidate in [address, _address_like_from_url(provider_name, url)]:
-        street_key = _street_key(candidate)
-        base_key = _base_street_key(street_key)
-        unit_key = _unit_key(street_key)
+    for _, base_key, unit_key in (_street_keys(str(address or "")), _url_street_keys(provider_name, str(url or ""))):
         if base_key:
             keys.append(f"{zip_code}|{base_key}|{unit_key}")
             if not unit_key:
@@ -574,7 +616,7 @@ def _metadata_from_item(provider_name, item):
 
 
 def _record_from_dict(provider_name, item):
-    street_key = _street_key(item.get("address") or "")
+    street_keys = _street_keys(str(item.get("address") or ""))
     url = str(item.get("url") or "")
     zip_code = str(item.get("zip_code") or "")
     metadata = _metadata_from_item(provider_name, item)
@@ -583,9 +625,9 @@ def _record_from_dict(provider_name, item):
         provider=provider_name,
         source_property_id=str(item.get("source_property_id") or ""),
         address=str(item.get("address") or ""),
-        street_key=street_key,
-        base_street_key=_base_street_key(street_key),
-        unit_key=_unit_key(street_key),
+        street_key=street_keys.street_key,
+        base_street_key=street_keys.base_street_key,
+        unit_key=street_keys.unit_key,
         match_keys=_match_keys(provider_name, item.get("address") or "", url, zip_code),
         city=str(item.get("city") or ""),
         state=str(item.get("state") or ""),
@@ -824,18 +866,29 @@ def _cluster_summary(cluster, fallback_rent_ratio=None):
         "direct_rent_estimates": _direct_rent_estimates(cluster),
         "derived_rent_estimates": _derived_rent_estimates(cluster, fallback_rent_ratio=fallback_rent_ratio),
         "tags": tags,
-        "records": [asdict(record) for record in cluster],
+        "records": list(cluster),
     }
 
 
+def _materialized(value):
+    # Cluster summaries hold ReconciledRecord references; only sampled output is expanded to dicts.
+    if isinstance(value, ReconciledRecord):
+        return asdict(value)
+    if isinstance(value, dict):
+        return {key: _materialized(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_materialized(item) for item in value]
+    return value
+
+
 def _price_delta(left, right):
     left_prices = [
-        record.get("price") for record in left.get("records", [])
-        if isinstance(record.get("price"), (int, float)) and record.get("price")
+        record.price for record in left.get("records", [])
+        if isinstance(record.price, (int, float)) and record.price
     ]
     right_prices = [
-        record.get("price") for record in right.get("records", [])
-        if isinstance(record.get("price"), (int, float)) and record.get("price")
+        record.price for record in right.get("records", [])
+        if isinstance(record.price, (int, float)) and record.price
     ]
     if not left_prices or not right_prices:
         return None
@@ -850,7 +903,7 @@ def _cluster_coordinates(summary):
         (best_metadata.get("latitude"), best_metadata.get("longitude")),
     ]
     for record in summary.get("records", []):
-        candidates.append((record.get("latitude"), record.get("longitude")))
+        candidates.append((record.latitude, record.longitude))
     for latitude, longitude in candidates:
         if isinstance(latitude, (int, float)) and isinstance(longitude, (int, float)):
             return float(latitude), float(longitude)
@@ -938,6 +991,52 @@ def _auto_alignment_reason(left, right, score):
     return ""
 
 
+def _similarity_block_key(summary):
+    base = summary.get("base_street_key") or summary.get("street_key") or ""
+    if not base:
+        return None
+    return (summary["zip_code"], _street_number(base), summary.get("unit_key"))
+
+
+def _similarity_blocks(summaries):
+    # _cluster_similarity is zero unless ZIP, street number and unit all agree, so only
+    # summaries sharing a block key can ever score against each other.
+    block_keys = [_similarity_block_key(summary) for summary in summaries]
+    blocks = defaultdict(list)
+    for index, block_key in enumerate(block_keys):
+        if block_key is not None:
+            blocks[block_key].append(index)
+    return block_keys, blocks
+
+
+def _similarity_profile(summary):
+    base = summary.get("base_street_key") or summary.get("street_key") or ""
+    return len(base), Counter(base)
+
+
+def _similarity_upper_bound(left_profile, right_profile):
+    # Shared characters bound SequenceMatcher's matching blocks, so this is never below ratio().
+    left_length, left_counts = left_profile
+    right_length, right_counts = right_profile
+    if not left_length + right_length:
+        return 0.0
+    return 2.0 * sum((left_counts & right_counts).values()) / (left_length + right_length)
+
+
+def _candidate_pairs(summaries):
+    block_keys, blocks = _similarity_blocks(summaries)
+    block_positions = {}
+    for block in blocks.values():
+        for position, index in enumerate(block):
+            block_positions[index] = position
+    for left_index, block_key in enumerate(block_keys):
+        if block_key is None:
+            continue
+        block = blocks[block_key]
+        for right_index in block[block_positions[left_index] + 1:]:
+            yield left_index, right_index
+
+
 def _merge_clusters_with_evidence(initial_summaries, fallback_rent_ratio=None):
     parent = list(range(len(initial_summaries)))
     evidence = []
@@ -954,59 +1053,66 @@ def _merge_clusters_with_evidence(initial_summaries, fallback_rent_ratio=None):
         if left_root != right_root:
             parent[right_root] = left_root
 
-    for left_index, left in enumerate(initial_summaries):
-        for right_index in range(left_index + 1, len(initial_summaries)):
-            right = initial_summaries[right_index]
-            score = _cluster_similarity(left, right)
-            if not score:
-                continue
-            reason = _auto_alignment_reason(left, right, score)
-            if not reason:
-                continue
-            union(left_index, right_index)
-            source = left if len(left["providers"]) == 1 else right
-            candidate = right if source is left else left
-            evidence.append({
-                "score": score,
-                "reason": reason,
-                "source": {
-                    "providers": source["providers"],
-                    "address": source["address"],
-                    "street_key": source["street_key"],
-                    "price_min": source["price_min"],
-                    "price_max": source["price_max"],
-                    "records": source["records"][:3],
-                },
-                "candidate": {
-                    "providers": candidate["providers"],
-                    "address": candidate["address"],
-                    "street_key": candidate["street_key"],
-                    "price_min": candidate["price_min"],
-                    "price_max": candidate["price_max"],
-                    "records": candidate["records"][:3],
-                },
-            })
+    for left_index, right_index in _candidate_pairs(initial_summaries):
+        left = initial_summaries[left_index]
+        right = initial_summaries[right_index]
+        score = _cluster_similarity(left, right)
+        if not score:
+            continue
+        reason = _auto_alignment_reason(left, right, score)
+        if not reason:
+            continue
+        union(left_index, right_index)
+        source = left if len(left["providers"]) == 1 else right
+        candidate = right if source is left else left
+        evidence.append({
+            "score": score,
+            "reason": reason,
+            "source": {
+                "providers": source["providers"],
+                "address": source["address"],
+                "street_key": source["street_key"],
+                "price_min": source["price_min"],
+                "price_max": source["price_max"],
+                "records": source["records"][:3],
+            },
+            "candidate": {
+                "providers": candidate["providers"],
+                "address": candidate["address"],
+                "street_key": candidate["street_key"],
+                "price_min": candidate["price_min"],
+                "price_max": candidate["price_max"],
+                "records": candidate["records"][:3],
+            },
+        })
 
     grouped = defaultdict(list)
     for index, summary in enumerate(initial_summaries):
         grouped[find(index)].extend(summary["records"])
-    merged_clusters = [
-        [ReconciledRecord(**record) for record in records]
-        for records in grouped.values()
-    ]
-    return [_cluster_summary(cluster, fallback_rent_ratio=fallback_rent_ratio) for cluster in merged_clusters], evidence
+    return [_cluster_summary(cluster, fallback_rent_ratio=fallback_rent_ratio) for cluster in grouped.values()], evidence
 
 
 def _provider_only_near_misses(cluster_summaries, providers, threshold=0.82):
     counts = {provider: 0 for provider in providers}
     samples = {provider: [] for provider in providers}
-    for summary in cluster_summaries:
-        if len(summary["providers"]) != 1:
+    block_keys, blocks = _similarity_blocks(cluster_summaries)
+    profiles = {}
+    # A close price adds at most 0.05 to the address ratio, and scores are rounded to 4 places.
+    min_ratio = threshold - 0.05 - 0.0001
+    for index, summary in enumerate(cluster_summaries):
+        if len(summary["providers"]) != 1 or block_keys[index] is None:
             continue
         provider = summary["providers"][0]
+        if index not in profiles:
+            profiles[index] = _similarity_profile(summary)
         candidates = []
-        for candidate in cluster_summaries:
-            if candidate is summary or provider in candidate["providers"]:
+        for candidate_index in blocks[block_keys[index]]:
+            candidate = cluster_summaries[candidate_index]
+            if candidate_index == index or provider in candidate["providers"]:
+                continue
+            if candidate_index not in profiles:
+                profiles[candidate_index] = _similarity_profile(candidate)
+            if _similarity_upper_bound(profiles[index], profiles[candidate_index]) < min_ratio:
                 continue
             score = _cluster_similarity(summary, candidate)
             if score >= threshold:
@@ -1398,6 +1504,7 @@ def _finalize_estimate_audit_totals(total_counter, path_counter, providers):
 
 
 def reconcile_zip(zip_code, providers=DEFAULT_PROVIDERS, include_nearby=False):
+    street_key_cache_start = _street_key_cache_counts()
     records = []
     provider_record_counts = {}
     provider_match_counts = {}
@@ -1450,7 +1557,7 @@ def reconcile_zip(zip_code, providers=DEFAULT_PROVIDERS, include_nearby=False):
         "all_provider_overlap": all_provider_overlap,
         "pair_overlap": pair_overlap,
         "provider_only": provider_only,
-        "provider_only_classifications": provider_only_classifications,
+        "provider_only_classifications": _materialized(provider_only_classifications),
         "auto_aligned_counts": auto_alignment_counts,
         "direct_rent_estimate_count": direct_rent_estimate_count,
         "derived_rent_estimate_count": derived_rent_estimate_count,
@@ -1458,148 +1565,404 @@ def reconcile_zip(zip_code, providers=DEFAULT_PROVIDERS, include_nearby=False):
         "metadata_completeness": _metadata_completeness(records, providers),
         "estimate_field_audit": _estimate_field_audit(records, providers),
         "zip_median_monthly_rent_to_value_ratio": fallback_rent_ratio,
+        "street_key_cache": _street_key_cache_summary(_street_key_cache_counts() - street_key_cache_start),
         "presence_counts": {"|".join(key): value for key, value in by_presence.items()},
-        "sample_all_provider": [
+        "sample_all_provider": _materialized([
             summary for summary in cluster_summaries
             if set(summary["providers"]) == all_provider_set
-        ][:10],
-        "sample_provider_only": {
+        ][:10]),
+        "sample_provider_only": _materialized({
             provider: [
                 summary for summary in cluster_summaries
                 if summary["providers"] == [provider]
             ][:10]
             for provider in providers
-        },
-        "sample_auto_aligned": auto_alignment_samples[:30],
-        "sample_possible_misalignments": near_misses["samples"],
+        }),
+        "sample_auto_aligned": _materialized(auto_alignment_samples[:30]),
+        "sample_possible_misalignments": _materialized(near_misses["samples"]),
+    }
+
+
+def _file_fingerprint(path):
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _zip_input_fingerprint(zip_code, providers=DEFAULT_PROVIDERS, include_nearby=False):
+    inputs = {}
+    for provider in providers:
+        path = _canonical_path(provider, zip_code)
+        if not path and provider == "zillow":
+            path = _zillow_raw_path(zip_code)
+        inputs[provider] = _file_fingerprint(path)
+    return {
+        "version": RECONCILIATION_CACHE_VERSION,
+        "providers": list(providers),
+        "include_nearby": bool(include_nearby),
+        "inputs": inputs,
     }
 
 
-def reconcile_sources(zip_codes, providers=DEFAULT_PROVIDERS, include_nearby=False):
-    zip_reports = [reconcile_zip(zip_code, providers=providers, include_nearby=include_nearby) for zip_code in zip_codes]
-    totals = {
-        "provider_record_counts": Counter(),
-        "provider_requested_zip_counts": Counter(),
-        "provider_only": Counter(),
-        "auto_aligned_counts": Counter(),
-        "possible_misalignment_counts": Counter(),
-        "pair_overlap": Counter(),
-        "initial_cluster_count": 0,
-        "cluster_count": 0,
-        "all_provider_overlap": 0,
-        "derived_rent_estimate_count": 0,
-        "direct_rent_estimate_count": 0,
+def _zip_cache_path(zip_code, fingerprint):
+    digest = hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return RECONCILIATION_CACHE_DIR / f"{zip_code}_{digest}.json"
+
+
+def _load_cached_zip_report(path):
+    try:
+        cached = load_json(str(path))
+    except (OSError, ValueError):
+        return None
+    return cached.get("report") if isinstance(cached, dict) else None
+
+
+def _save_cached_zip_report(zip_code, path, fingerprint, report):
+    ensure_directory_exists(str(RECONCILIATION_CACHE_DIR))
+    for stale_path in RECONCILIATION_CACHE_DIR.glob(f"{zip_code}_*.json"):
+        if stale_path != path:
+            stale_path.unlink(missing_ok=True)
+    save_json({"fingerprint": fingerprint, "report": report}, str(path))
+
+
+# Data roots reconcile_zip reads from module globals, as (module, attribute); None is this
+# module. Pool workers are handed the parent's values, so they read the same tree under any
+# start method: spawn and forkserver workers re-import the modules with their defaults.
+_RECONCILE_DATA_ROOTS = (
+    (None, "DATA_PATH"),
+    (None, "SEARCH_LISTINGS_DATA_PATH"),
+    ("re_analyzer.scrapers.scraper_runner", "DATA_PATH"),
+    ("re_analyzer.scrapers.scraper_runner", "PROPERTY_DETAILS_PATH"),
+    ("re_analyzer.scrapers.scraper_runner", "SEARCH_LISTINGS_METADATA_PATH"),
+    ("re_analyzer.scrapers.provider_adapters", "PROPERTY_DETAILS_PATH"),
+)
+# multiprocessing context of the ZIP worker pool; None uses the platform's default start method.
+RECONCILE_POOL_CONTEXT = None
+
+
+def _module_globals(module_name):
+    return vars(importlib.import_module(module_name)) if module_name else globals()
+
+
+def _reconcile_data_roots():
+    return [(module_name, name, _module_globals(module_name)[name]) for module_name, name in _RECONCILE_DATA_ROOTS]
+
+
+def _init_reconcile_worker(data_roots):
+    for module_name, name, value in data_roots:
+        _module_globals(module_name)[name] = value
+
+
+def _iter_reconciled_zip_reports(zip_codes, providers=DEFAULT_PROVIDERS, include_nearby=False, workers=1):
+    if not workers or workers < 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(zip_codes))
+    if workers <= 1:
+        for zip_code in zip_codes:
+            yield reconcile_zip(zip_code, providers=providers, include_nearby=include_nearby)
+        return
+    # executor.map yields in submission order, so totals fold exactly like the serial path.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=RECONCILE_POOL_CONTEXT,
+        initializer=_init_reconcile_worker,
+        initargs=(_reconcile_data_roots(),),
+    ) as executor:
+        yield from executor.map(reconcile_zip, zip_codes, repeat(providers), repeat(include_nearby))
+
+
+def _iter_zip_reports(zip_codes, providers=DEFAULT_PROVIDERS, include_nearby=False, workers=1, use_cache=False, cache_stats=None):
+    if not use_cache:
+        yield from _iter_reconciled_zip_reports(zip_codes, providers=providers, include_nearby=include_nearby, workers=workers)
+        return
+    cache_stats = Counter() if cache_stats is None else cache_stats
+    fingerprints = {
+        zip_code: _zip_input_fingerprint(zip_code, providers=providers, include_nearby=include_nearby)
+        for zip_code in zip_codes
     }
-    metadata_totals = defaultdict(lambda: {"present": 0, "total": 0})
-    estimate_audit_totals = Counter()
-    estimate_audit_path_totals = defaultdict(Counter)
-    classification_totals = {provider: Counter() for provider in providers}
-    rent_ratios = []
-    for report in zip_reports:
-        totals["provider_record_counts"].update(report["provider_record_counts"])
-        totals["provider_requested_zip_counts"].update(report["provider_requested_zip_counts"])
-        totals["provider_only"].update(report["provider_only"])
-        totals["auto_aligned_counts"].update(report["auto_aligned_counts"])
-        totals["possible_misalignment_counts"].update(report["possible_misalignment_counts"])
-        totals["pair_overlap"].update(report["pair_overlap"])
-        totals["initial_cluster_count"] += report["initial_cluster_count"]
-        totals["cluster_count"] += report["cluster_count"]
-        totals["all_provider_overlap"] += report["all_provider_overlap"]
-        totals["direct_rent_estimate_count"] += report.get("direct_rent_estimate_count", 0)
-        totals["derived_rent_estimate_count"] += report.get("derived_rent_estimate_count", 0)
-        _add_metadata_totals(metadata_totals, report)
-        _add_estimate_audit_totals(estimate_audit_totals, estimate_audit_path_totals, report)
-        if report.get("zip_median_monthly_rent_to_value_ratio"):
-            rent_ratios.append(report["zip_median_monthly_rent_to_value_ratio"])
-        for provider, class_counts in (report.get("provider_only_classifications", {}).get("counts") or {}).items():
-            if provider in classification_totals:
-                classification_totals[provider].update(class_counts)
+    cache_paths = {zip_code: _zip_cache_path(zip_code, fingerprints[zip_code]) for zip_code in zip_codes}
+    stale_zip_codes = [zip_code for zip_code in zip_codes if not cache_paths[zip_code].exists()]
+    stale_zip_code_set = set(stale_zip_codes)
+    fresh_reports = _iter_reconciled_zip_reports(stale_zip_codes, providers=providers, include_nearby=include_nearby, workers=workers)
+    for zip_code in zip_codes:
+        if zip_code in stale_zip_code_set:
+            report = next(fresh_reports)
+        else:
+            report = _load_cached_zip_report(cache_paths[zip_code])
+            if report is not None:
+                cache_stats["hits"] += 1
+                # The counters describe the lookups of the run that built the report, not this one.
+                report.pop("street_key_cache", None)
+                yield report
+                continue
+            report = reconcile_zip(zip_code, providers=providers, include_nearby=include_nearby)
+        cache_stats["misses"] += 1
+        _save_cached_zip_report(zip_code, cache_paths[zip_code], fingerprints[zip_code], report)
+        yield report
 
+
+def _new_reconciliation_totals(providers):
+    return {
+        "totals": {
+            "provider_record_counts": Counter(),
+            "provider_requested_zip_counts": Counter(),
+            "provider_only": Counter(),
+            "auto_aligned_counts": Counter(),
+            "possible_misalignment_counts": Counter(),
+            "pair_overlap": Counter(),
+            "initial_cluster_count": 0,
+            "cluster_count": 0,
+            "all_provider_overlap": 0,
+            "derived_rent_estimate_count": 0,
+            "direct_rent_estimate_count": 0,
+        },
+        "metadata": defaultdict(lambda: {"present": 0, "total": 0}),
+        "estimate_audit": Counter(),
+        "estimate_audit_paths": defaultdict(Counter),
+        "classifications": {provider: Counter() for provider in providers},
+        "street_key_cache": Counter(),
+        "rent_ratios": [],
+    }
+
+
+def _add_zip_report_totals(accumulators, report):
+    totals = accumulators["totals"]
+    totals["provider_record_counts"].update(report["provider_record_counts"])
+    totals["provider_requested_zip_counts"].update(report["provider_requested_zip_counts"])
+    totals["provider_only"].update(report["provider_only"])
+    totals["auto_aligned_counts"].update(report["auto_aligned_counts"])
+    totals["possible_misalignment_counts"].update(report["possible_misalignment_counts"])
+    totals["pair_overlap"].update(report["pair_overlap"])
+    totals["initial_cluster_count"] += report["initial_cluster_count"]
+    totals["cluster_count"] += report["cluster_count"]
+    totals["all_provider_overlap"] += report["all_provider_overlap"]
+    totals["direct_rent_estimate_count"] += report.get("direct_rent_estimate_count", 0)
+    totals["derived_rent_estimate_count"] += report.get("derived_rent_estimate_count", 0)
+    _add_metadata_totals(accumulators["metadata"], report)
+    _add_estimate_audit_totals(accumulators["estimate_audit"], accumulators["estimate_audit_paths"], report)
+    street_key_cache = report.get("street_key_cache") or {}
+    accumulators["street_key_cache"].update({
+        "hits": street_key_cache.get("hits", 0),
+        "misses": street_key_cache.get("misses", 0),
+    })
+    if report.get("zip_median_monthly_rent_to_value_ratio"):
+        accumulators["rent_ratios"].append(report["zip_median_monthly_rent_to_value_ratio"])
+    for provider, class_counts in (report.get("provider_only_classifications", {}).get("counts") or {}).items():
+        if provider in accumulators["classifications"]:
+            accumulators["classifications"][provider].update(class_counts)
+
+
+def _reconciliation_summary(accumulators, zip_codes, providers, include_nearby, cache_stats=None):
     return {
         "generated_at": datetime.now().isoformat(),
-        "zip_codes": [str(zip_code) for zip_code in zip_codes],
+        "zip_codes": zip_codes,
         "providers": list(providers),
         "include_nearby": include_nearby,
+        "zip_cache": {
+            "hits": cache_stats.get("hits", 0),
+            "misses": cache_stats.get("misses", 0),
+        } if cache_stats is not None else None,
         "totals": {
             key: dict(value) if isinstance(value, Counter) else value
-            for key, value in totals.items()
+            for key, value in accumulators["totals"].items()
         },
         "provider_only_classification_counts": {
-            provider: dict(classification_totals.get(provider, {}))
+            provider: dict(accumulators["classifications"].get(provider, {}))
             for provider in providers
         },
-        "metadata_completeness": _finalize_metadata_totals(metadata_totals, providers),
+        "metadata_completeness": _finalize_metadata_totals(accumulators["metadata"], providers),
         "estimate_field_audit": _finalize_estimate_audit_totals(
-            estimate_audit_totals,
-            estimate_audit_path_totals,
+            accumulators["estimate_audit"],
+            accumulators["estimate_audit_paths"],
             providers,
         ),
-        "monthly_rent_to_value_ratio": _median(rent_ratios),
+        "monthly_rent_to_value_ratio": _median(accumulators["rent_ratios"]),
+        "street_key_cache": _street_key_cache_summary(accumulators["street_key_cache"]),
+    }
+
+
+def reconcile_sources(zip_codes, providers=DEFAULT_PROVIDERS, include_nearby=False, workers=1, use_cache=False):
+    zip_codes = [str(zip_code) for zip_code in zip_codes]
+    cache_stats = Counter() if use_cache else None
+    accumulators = _new_reconciliation_totals(providers)
+    zip_reports = []
+    for report in _iter_zip_reports(
+        zip_codes,
+        providers=providers,
+        include_nearby=include_nearby,
+        workers=workers,
+        use_cache=use_cache,
+        cache_stats=cache_stats,
+    ):
+        _add_zip_report_totals(accumulators, report)
+        zip_reports.append(report)
+    return {
+        **_reconciliation_summary(accumulators, zip_codes, providers, include_nearby, cache_stats=cache_stats),
         "zips": zip_reports,
     }
 
 
-def save_reconciliation_report(report):
+RECONCILIATION_CSV_FIELDS = [
+    "zip_code",
+    "initial_cluster_count",
+    "cluster_count",
+    "all_provider_overlap",
+    "zillow_count",
+    "redfin_count",
+    "realtor_count",
+    "zillow_auto_aligned",
+    "redfin_auto_aligned",
+    "realtor_auto_aligned",
+    "zillow_only",
+    "redfin_only",
+    "realtor_only",
+    "zillow_possible_misaligned",
+    "redfin_possible_misaligned",
+    "realtor_possible_misaligned",
+    "zillow_redfin",
+    "zillow_realtor",
+    "redfin_realtor",
+]
+
+
+def _reconciliation_csv_row(item):
+    return {
+        "zip_code": item["zip_code"],
+        "initial_cluster_count": item.get("initial_cluster_count", item["cluster_count"]),
+        "cluster_count": item["cluster_count"],
+        "all_provider_overlap": item["all_provider_overlap"],
+        "zillow_count": item["provider_record_counts"].get("zillow", 0),
+        "redfin_count": item["provider_record_counts"].get("redfin", 0),
+        "realtor_count": item["provider_record_counts"].get("realtor", 0),
+        "zillow_auto_aligned": item.get("auto_aligned_counts", {}).get("zillow", 0),
+        "redfin_auto_aligned": item.get("auto_aligned_counts", {}).get("redfin", 0),
+        "realtor_auto_aligned": item.get("auto_aligned_counts", {}).get("realtor", 0),
+        "zillow_only": item["provider_only"].get("zillow", 0),
+        "redfin_only": item["provider_only"].get("redfin", 0),
+        "realtor_only": item["provider_only"].get("realtor", 0),
+        "zillow_possible_misaligned": item["possible_misalignment_counts"].get("zillow", 0),
+        "redfin_possible_misaligned": item["possible_misalignment_counts"].get("redfin", 0),
+        "realtor_possible_misaligned": item["possible_misalignment_counts"].get("realtor", 0),
+        "zillow_redfin": item["pair_overlap"].get("zillow_redfin", 0),
+        "zillow_realtor": item["pair_overlap"].get("zillow_realtor", 0),
+        "redfin_realtor": item["pair_overlap"].get("redfin_realtor", 0),
+    }
+
+
+def _reconciliation_report_paths(report_format="json"):
     output_dir = Path(DATA_PATH) / "Fetched" / "Reconciliation"
     ensure_directory_exists(str(output_dir))
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    json_path = output_dir / f"source_reconciliation_{timestamp}.json"
-    csv_path = output_dir / f"source_reconciliation_{timestamp}.csv"
-    save_json(report, str(json_path))
+    extension = "ndjson" if report_format == "ndjson" else "json"
+    return (
+        output_dir / f"source_reconciliation_{timestamp}.{extension}",
+        output_dir / f"source_reconciliation_{timestamp}.csv",
+    )
+
+
+def save_reconciliation_report(report):
+    json_path, csv_path = _reconciliation_report_paths()
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump(report, file)
     with open(csv_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=[
-            "zip_code",
-            "initial_cluster_count",
-            "cluster_count",
-            "all_provider_overlap",
-            "zillow_count",
-            "redfin_count",
-            "realtor_count",
-            "zillow_auto_aligned",
-            "redfin_auto_aligned",
-            "realtor_auto_aligned",
-            "zillow_only",
-            "redfin_only",
-            "realtor_only",
-            "zillow_possible_misaligned",
-            "redfin_possible_misaligned",
-            "realtor_possible_misaligned",
-            "zillow_redfin",
-            "zillow_realtor",
-            "redfin_realtor",
-        ])
+        writer = csv.DictWriter(file, fieldnames=RECONCILIATION_CSV_FIELDS)
         writer.writeheader()
         for item in report["zips"]:
-            writer.writerow({
-                "zip_code": item["zip_code"],
-                "initial_cluster_count": item.get("initial_cluster_count", item["cluster_count"]),
-                "cluster_count": item["cluster_count"],
-                "all_provider_overlap": item["all_provider_overlap"],
-                "zillow_count": item["provider_record_counts"].get("zillow", 0),
-                "redfin_count": item["provider_record_counts"].get("redfin", 0),
-                "realtor_count": item["provider_record_counts"].get("realtor", 0),
-                "zillow_auto_aligned": item.get("auto_aligned_counts", {}).get("zillow", 0),
-                "redfin_auto_aligned": item.get("auto_aligned_counts", {}).get("redfin", 0),
-                "realtor_auto_aligned": item.get("auto_aligned_counts", {}).get("realtor", 0),
-                "zillow_only": item["provider_only"].get("zillow", 0),
-                "redfin_only": item["provider_only"].get("redfin", 0),
-                "realtor_only": item["provider_only"].get("realtor", 0),
-                "zillow_possible_misaligned": item["possible_misalignment_counts"].get("zillow", 0),
-                "redfin_possible_misaligned": item["possible_misalignment_counts"].get("redfin", 0),
-                "realtor_possible_misaligned": item["possible_misalignment_counts"].get("realtor", 0),
-                "zillow_redfin": item["pair_overlap"].get("zillow_redfin", 0),
-                "zillow_realtor": item["pair_overlap"].get("zillow_realtor", 0),
-                "redfin_realtor": item["pair_overlap"].get("redfin_realtor", 0),
-            })
+            writer.writerow(_reconciliation_csv_row(item))
     return {"json_path": str(json_path), "csv_path": str(csv_path)}
 
 
+def write_reconciliation_report(
+    zip_codes,
+    providers=DEFAULT_PROVIDERS,
+    include_nearby=False,
+    workers=1,
+    use_cache=False,
+    report_format="json",
+):
+    """Reconcile ZIPs and stream each ZIP report to disk as soon as it is built.
+
+    Only one ZIP report is held in memory at a time. ``report_format="json"`` writes the
+    same document as ``save_reconciliation_report`` (with "zips" first); ``"ndjson"``
+    writes one ZIP report per line followed by a final ``{"summary": ...}`` line.
+    Both files are written under dot-tmp names and renamed into place once complete,
+    so readers never see a partial report. Returns the report summary without the
+    per-ZIP reports.
+    """
+    zip_codes = [str(zip_code) for zip_code in zip_codes]
+    cache_stats = Counter() if use_cache else None
+    accumulators = _new_reconciliation_totals(providers)
+    json_path, csv_path = _reconciliation_report_paths(report_format)
+    json_tmp_path = json_path.with_name(f".{json_path.name}.tmp")
+    csv_tmp_path = csv_path.with_name(f".{csv_path.name}.tmp")
+    try:
+        with open(json_tmp_path, "w", encoding="utf-8") as json_file, open(csv_tmp_path, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=RECONCILIATION_CSV_FIELDS)
+            writer.writeheader()
+            if report_format != "ndjson":
+                json_file.write('{"zips": [')
+            for index, report in enumerate(_iter_zip_reports(
+                zip_codes,
+                providers=providers,
+                include_nearby=include_nearby,
+                workers=workers,
+                use_cache=use_cache,
+                cache_stats=cache_stats,
+            )):
+                _add_zip_report_totals(accumulators, report)
+                writer.writerow(_reconciliation_csv_row(report))
+                if report_format == "ndjson":
+                    json_file.write(json.dumps(report) + "\n")
+                else:
+                    json_file.write(("," if index else "") + json.dumps(report))
+            summary = _reconciliation_summary(accumulators, zip_codes, providers, include_nearby, cache_stats=cache_stats)
+            summary["saved_paths"] = {"json_path": str(json_path), "csv_path": str(csv_path)}
+            if report_format == "ndjson":
+                json_file.write(json.dumps({"summary": summary}) + "\n")
+            else:
+                json_file.write("], " + json.dumps(summary)[1:])
+        os.replace(csv_tmp_path, csv_path)
+        os.replace(json_tmp_path, json_path)
+    finally:
+        json_tmp_path.unlink(missing_ok=True)
+        csv_tmp_path.unlink(missing_ok=True)
+    return summary
+
+
+def load_reconciliation_report(path):
+    """Read a report written by save_reconciliation_report or write_reconciliation_report (json or ndjson)."""
+    path = Path(path)
+    if path.suffix != ".ndjson":
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    zip_reports, summary = [], None
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if set(item) == {"summary"}:
+                summary = item["summary"]
+            else:
+                zip_reports.append(item)
+    if summary is None:
+        raise ValueError(f"{path} has no summary line")
+    return {"zips": zip_reports, **summary}
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Reconcile saved canonical listings across providers.")
     parser.add_argument("--zip-code", action="append", required=True, help="ZIP code to reconcile. Repeat for multiple ZIPs.")
     parser.add_argument("--providers", nargs="+", choices=DEFAULT_PROVIDERS, default=list(DEFAULT_PROVIDERS))
     parser.add_argument("--include-nearby", action="store_true", help="Include records whose parsed ZIP differs from the requested ZIP.")
+    parser.add_argument("--workers", type=int, default=1, help="Reconcile ZIPs in this many processes. 0 uses every CPU core.")
+    parser.add_argument("--use-cache", action=argparse.BooleanOptionalAction, default=False, help="Reuse cached ZIP reports whose canonical inputs are unchanged.")
     parser.add_argument("--save", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--report-format", choices=("json", "ndjson"), default="json", help="Format for the streamed report file.")
     parser.add_argument("--debug-screenshots", action=argparse.BooleanOptionalAction, default=False)
     parser.add_argument("--debug-screenshot-limit", type=int, default=12)
     parser.add_argument("--debug-screenshot-warmup-seconds", type=float, default=2.0)
@@ -1610,7 +1973,26 @@ def parse_args():
 
 def main():
     args = parse_args()
-    report = reconcile_sources(args.zip_code, providers=tuple(args.providers), include_nearby=args.include_nearby)
+    if args.save and not args.debug_screenshots:
+        summary = write_reconciliation_report(
+            args.zip_code,
+            providers=tuple(args.providers),
+            include_nearby=args.include_nearby,
+            workers=args.workers,
+            use_cache=args.use_cache,
+            report_format=args.report_format,
+        )
+        print("SOURCE_RECONCILIATION_SUMMARY")
+        print(json.dumps(summary, indent=2, sort_keys=True))
+        return
+
+    report = reconcile_sources(
+        args.zip_code,
+        providers=tuple(args.providers),
+        include_nearby=args.include_nearby,
+        workers=args.workers,
+        use_cache=args.use_cache,
+    )
     if args.debug_screenshots:
         capture_reconciliation_debug_screenshots(
             report,
@@ -0,0 +1,124 @@
+"""In-process index of per-provider ZIP scrape status.
+
+The control server's coverage endpoints need last_checked, last_status, counts
+and warnings for every Florida ZIP x provider on each dashboard poll. Those
+live in Fetched/{provider}/Metadata/{zip}_metadata.json, and reading ~4,000
+of them per request dominated the endpoints. The index keeps a compact status
+summary per metadata file, keyed by path and validated by the file's size and
+mtime. A poll then lists each Metadata directory once and re-reads only the
+files that changed since the last poll.
+
+Scraper runs usually happen in a subprocess, so their writes reach the server
+through the mtime check. record_zip_status lets a writer in the same process
+put the summary straight into the index.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from re_analyzer.utility import json_codec
+
+METADATA_SUFFIX = "_metadata.json"
+# Errors and warnings kept per ZIP for the dashboard's detail view.
+DETAIL_MESSAGE_LIMIT = 5
+
+_INDEX: Dict[str, Tuple[int, int, Optional[dict]]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _parse_checked_at(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        checked_at = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return checked_at if checked_at.tzinfo is not None else checked_at.replace(tzinfo=timezone.utc)
+
+
+def summarize_zip_metadata(metadata: dict) -> Optional[dict]:
+    """The status fields the control server reports for one provider/ZIP metadata dict."""
+    if not isinstance(metadata, dict):
+        return None
+    last_run = metadata.get("last_run") or {}
+    errors = list(metadata.get("errors") or [])
+    warnings = list(metadata.get("warnings") or [])
+    try:
+        return {
+            "last_checked": metadata.get("last_checked") or "",
+            "last_checked_at": _parse_checked_at(metadata.get("last_checked") or ""),
+            "last_status": metadata.get("last_status", "unknown"),
+            "canonical_count": int(metadata.get("canonical_count") or 0),
+            "raw_count": int(metadata.get("raw_count") or 0),
+            "has_saved_payload": bool(metadata.get("has_saved_payload")),
+            "dominant_zip": metadata.get("dominant_listing_zip_code") or "",
+            "warning_count": int(last_run.get("warning_count") or len(warnings)),
+            "error_count": int(last_run.get("error_count") or len(errors)),
+            "errors": errors[:DETAIL_MESSAGE_LIMIT],
+            "warnings": warnings[:DETAIL_MESSAGE_LIMIT],
+        }
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _status_for(path: str, stat: os.stat_result) -> Optional[dict]:
+    with _INDEX_LOCK:
+        indexed = _INDEX.get(path)
+    if indexed is not None and indexed[:2] == (stat.st_mtime_ns, stat.st_size):
+        return indexed[2]
+    try:
+        status = summarize_zip_metadata(json_codec.load_file(path))
+    except Exception:
+        # Unreadable (or half-written) files count as never checked until they change.
+        status = None
+    with _INDEX_LOCK:
+        _INDEX[path] = (stat.st_mtime_ns, stat.st_size, status)
+    return status
+
+
+def record_zip_status(metadata_path, metadata: dict) -> None:
+    """Index metadata just written to metadata_path, so the next poll need not read it back."""
+    path = os.path.abspath(metadata_path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    status = summarize_zip_metadata(metadata)
+    with _INDEX_LOCK:
+        _INDEX[path] = (stat.st_mtime_ns, stat.st_size, status)
+
+
+def provider_zip_statuses(metadata_dir: Path, zip_codes=None) -> Dict[str, Optional[dict]]:
+    """{zip_code: status summary} for the metadata files in one provider's Metadata directory.
+
+    ZIPs without a metadata file are left out; unreadable files map to None.
+    With zip_codes, only those ZIPs are stat'ed and looked up.
+    """
+    wanted = {str(zip_code) for zip_code in zip_codes} if zip_codes is not None else None
+    statuses: Dict[str, Optional[dict]] = {}
+    try:
+        # Absolute paths, so keys match record_zip_status however DATA_PATH was spelled.
+        with os.scandir(os.path.abspath(metadata_dir)) as entries:
+            for entry in entries:
+                if not entry.name.endswith(METADATA_SUFFIX):
+                    continue
+                zip_code = entry.name[:-len(METADATA_SUFFIX)]
+                if wanted is not None and zip_code not in wanted:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                statuses[zip_code] = _status_for(entry.path, stat)
+    except OSError:
+        pass
+    return statuses
+
+
+def clear_zip_status_index() -> None:
+    with _INDEX_LOCK:
+        _INDEX.clear()
@@ -0,0 +1,109 @@
+"""JSON codec for bulk data files.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Either backend writes the same bytes as the stdlib and reads back
+the same values, so files do not depend on which one wrote or read them.
+
+- ``loads``/``load_file`` retry with the stdlib when orjson rejects input it does
+  not support (NaN/Infinity literals), so anything json.load accepted still loads.
+  Input holding a run of 19+ digits, which may be an integer outside orjson's
+  64-bit range (orjson decodes those as floats), is parsed by the stdlib.
+- ``dumps``/``dump_file`` write compact output by default, for machine-consumed
+  files. ``indent`` keeps the stdlib's pretty-printed format byte-for-byte. The
+  compact output matches the stdlib's too: datetimes and float subclasses
+  (numpy.float64) go through ``default`` and ``float`` as json.dumps would send
+  them. orjson's output is rewritten by the stdlib when it may differ: values
+  orjson cannot encode (e.g. ints beyond 64 bits), NaN/Infinity (orjson writes
+  null), and floats the stdlib writes with an exponent (orjson writes 1e16 and
+  0.00001 for 1e+16 and 1e-05).
+"""
+import json
+import math
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Digit runs that may be an integer orjson would decode as a float.
+_WIDE_DIGITS_RE = re.compile(rb'\d{19}')
+_WIDE_DIGITS_STR_RE = re.compile(r'\d{19}')
+# orjson output that may hold a float the stdlib writes differently: any exponent,
+# or a magnitude below 1e-4 that orjson writes without one.
+_FLOAT_FORMAT_RE = re.compile(rb'\d[eE]|0\.0000')
+
+
+def loads(data):
+    wide_digits_re = _WIDE_DIGITS_STR_RE if isinstance(data, str) else _WIDE_DIGITS_RE
+    if orjson is not None and not wide_digits_re.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def load_file(path):
+    with open(path, 'rb') as file:
+        return loads(file.read())
+
+
+def _has_non_finite_float(data):
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _orjson_default(default):
+    def encode(value):
+        if isinstance(value, float):
+            return float(value)
+        if default is None:
+            raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+        return default(value)
+    return encode
+
+
+def _dumps_bytes(data, indent=None, default=None):
+    if indent is None and orjson is not None:
+        try:
+            payload = orjson.dumps(
+                data,
+                default=_orjson_default(default),
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            pass
+        else:
+            # orjson writes NaN/Infinity as null; only a payload with nulls can hold one.
+            if not _FLOAT_FORMAT_RE.search(payload) and (b'null' not in payload or not _has_non_finite_float(data)):
+                return payload
+    if indent is None:
+        return json.dumps(data, default=default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, default=default, indent=indent).encode('utf-8')
+
+
+def dumps(data, indent=None, default=None):
+    return _dumps_bytes(data, indent=indent, default=default).decode('utf-8')
+
+
+def dump_file(data, path, indent=None, default=None):
+    """Write data to path and return the bytes written."""
+    payload = _dumps_bytes(data, indent=indent, default=default)
+    with open(path, 'wb') as file:
+        file.write(payload)
+    return payload
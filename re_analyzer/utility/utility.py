@@ -1,6 +1,5 @@
 import os
 import time
-import json
 import configparser
 import random as rd
 import pandas as pd
@@ -10,6 +9,8 @@ from dateutil.parser import parse
 from enum import Enum, auto
 from datetime import datetime
 
+from re_analyzer.utility import json_codec
+
 
 # Get the directory of the current script
 SCRIPT_PATH = Path(__file__).resolve()
@@ -25,14 +26,13 @@ CONFIG_PATH = get_abs_path(os.path.join('utility', 'project_config.cfg'))
 ## DIRECTORY UTILITY METHODS ##
 ###############################
 
-def save_json(data, path):
-    with open(path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, indent=4)
+def save_json(data, path, compact=False):
+    # Compact output is for machine-consumed files; the default stays human-readable.
+    json_codec.dump_file(data, path, indent=None if compact else 4)
 def load_json(path):
     if not os.path.exists(path):
         return {}
-    with open(path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+    return json_codec.load_file(path)
 
 def ensure_directory_exists(path):
     if not os.path.exists(path):
@@ -213,7 +213,9 @@ SEARCH_LISTINGS_METADATA_PATH = os.path.join(DATA_PATH, 'SearchResultsMetadata')
 PROPERTY_DATA_PATH = os.path.join(DATA_PATH, 'PropertyData')
 PROPERTY_DETAILS_PATH = os.path.join(DATA_PATH, 'PropertyDetails')
 SEARCH_RESULTS_PROCESSED_PATH = os.path.join(DATA_PATH, 'search_listings.csv')
+SEARCH_RANKING_INDEX_PATH = os.path.join(DATA_PATH, 'search_listings_ranking.sqlite')
 
 ALPHA_BETA_DATA_PATH = os.path.join(PROPERTY_DATA_PATH, 'alpha_beta_data.csv')
 REAL_ESTATE_METRICS_DATA_PATH = os.path.join(PROPERTY_DATA_PATH, 'real_estate_metrics_data.csv')
 HOME_FEATURES_DATAFRAME_PATH = os.path.join(PROPERTY_DATA_PATH, 'property_features_df.parquet')
+HOME_FEATURES_MODEL_PATH = os.path.join(PROPERTY_DATA_PATH, 'home_features_model.json')
@@ -0,0 +1,86 @@
+import json
+import os
+
+from re_analyzer.scrapers import data_cleanup, data_quality, fetched_inventory, injection_manifest, normalize_data
+
+
+def _write_payloads(zip_dir, timestamp, listings, mtime):
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    canonical_path = zip_dir / f"canonical_listings_{timestamp}.json"
+    injection_manifest.write_payload_file(listings, canonical_path)
+    (zip_dir / f"listings_{timestamp}.json").write_text(json.dumps(listings + listings), encoding="utf-8")
+    for path in (canonical_path, zip_dir / f"listings_{timestamp}.json"):
+        os.utime(path, (mtime, mtime))
+
+
+def _fetched_tree(tmp_path):
+    fetched_root = tmp_path / "Fetched"
+    _write_payloads(fetched_root / "zillow" / "33131", "2024-01-01_00-00", [{"id": 1}], 1_700_000_000)
+    _write_payloads(fetched_root / "zillow" / "33131", "2024-02-01_00-00", [{"id": 1}, {"id": 2}], 1_700_100_000)
+    (fetched_root / "zillow" / "33131" / "diagnostics").mkdir()
+    (fetched_root / "zillow" / "33131" / "diagnostics" / "page.html").write_text("<html></html>", encoding="utf-8")
+    _write_payloads(fetched_root / "redfin" / "33139", "2024-01-01_00-00", [{"id": 3}], 1_700_000_000)
+    (fetched_root / "redfin" / "Metadata").mkdir()
+    (fetched_root / "redfin" / "Metadata" / "33139_metadata.json").write_text("{}", encoding="utf-8")
+    (fetched_root / "ignored" / "33140").mkdir(parents=True)
+    return fetched_root
+
+
+def test_scan_reports_latest_and_older_payloads_per_zip(tmp_path):
+    fetched_root = _fetched_tree(tmp_path)
+
+    inventory = fetched_inventory.scan_fetched_tree(fetched_root)
+    zillow = inventory.get("zillow", "33131")
+
+    assert len(inventory) == 2
+    assert [zip_inventory.provider for zip_inventory in inventory.zip_dirs(["redfin", "zillow"])] == ["redfin", "zillow"]
+    assert zillow.latest_canonical.path.name == "canonical_listings_2024-02-01_00-00.json"
+    assert [payload.path.name for payload in zillow.older_files] == ["canonical_listings_2024-01-01_00-00.json", "listings_2024-01-01_00-00.json"]
+    assert zillow.descriptor_for(zillow.older_files[0]).path == injection_manifest.descriptor_path(zillow.older_files[0].path)
+    assert zillow.newest_listing_mtime == 1_700_100_000
+    assert zillow.total_bytes == sum(path.stat().st_size for path in zillow.path.rglob("*") if path.is_file())
+    assert inventory.metadata_file("redfin", "33139").path == fetched_root / "redfin" / "Metadata" / "33139_metadata.json"
+    assert inventory.metadata_file("zillow", "33131") is None
+
+
+def test_quality_cleanup_and_normalize_share_one_scan(monkeypatch, tmp_path):
+    fetched_root = _fetched_tree(tmp_path)
+    monkeypatch.setattr(data_quality, "FETCHED_ROOT", fetched_root)
+    monkeypatch.setattr(data_cleanup, "FETCHED_ROOT", fetched_root)
+    monkeypatch.setattr(data_cleanup, "ARCHIVE_ROOT", tmp_path / "archive")
+
+    walks = []
+    scan_fetched_tree = fetched_inventory.scan_fetched_tree
+    for module in (data_quality, data_cleanup, normalize_data, injection_manifest):
+        monkeypatch.setattr(module, "scan_fetched_tree", lambda *args: walks.append(args) or scan_fetched_tree(*args))
+    inventory = fetched_inventory.scan_fetched_tree(fetched_root)
+
+    rows = data_quality.analyze_resources(inventory=inventory)
+    assert [(row.provider, row.zip_code, row.listing_count) for row in rows] == [("redfin", "33139", 1), ("zillow", "33131", 2)]
+    assert data_quality.analyze(inventory=inventory)["zillow"].total == 2
+
+    targets = data_cleanup.scan(["old_listings", "fetched_data"], older_than_days=1, inventory=inventory)
+    old_listings = targets["old_listings"]
+    assert old_listings.item_count == 2
+    assert old_listings.size_bytes == sum(path.stat().st_size for path in old_listings.paths)
+    assert sorted(path.name for path in old_listings.paths) == [
+        "canonical_listings_2024-01-01_00-00.json",
+        "canonical_listings_2024-01-01_00-00.json.descriptor",
+        "listings_2024-01-01_00-00.json",
+    ]
+    assert targets["fetched_data"].size_bytes == sum(path.stat().st_size for path in fetched_root.rglob("*") if path.is_file() and "Metadata" not in path.parts)
+
+    assert normalize_data.prune_old_json(fetched_root, inventory=inventory)["deleted"] == 2
+    assert not (fetched_root / "zillow" / "33131" / "listings_2024-01-01_00-00.json").exists()
+    assert data_cleanup.scan(["old_listings"], inventory=inventory)["old_listings"].item_count == 0
+
+    manifest = injection_manifest.build_injection_manifest(fetched_root, use_file_cache=False, inventory=inventory)
+    assert [(record["zip_code"], record["canonical"]["record_count"], record["metadata"]["exists"]) for record in manifest["records"]] == [
+        ("33131", 2, False),
+        ("33139", 1, True),
+    ]
+    assert walks == []
+
+    # Without an inventory each entry point walks the tree itself, once.
+    data_cleanup.scan(["old_listings", "fetched_data"])
+    assert len(walks) == 1
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+
+from re_analyzer.scrapers import injection_manifest
+
+
+def _write_scrape(fetched_root, provider, zip_code, listings, timestamp="2024-01-01_00-00"):
+    zip_dir = fetched_root / provider / zip_code
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    (zip_dir / f"canonical_listings_{timestamp}.json").write_text(json.dumps(listings), encoding="utf-8")
+    (zip_dir / f"listings_{timestamp}.json").write_text(json.dumps(listings + listings), encoding="utf-8")
+    metadata_dir = fetched_root / provider / "Metadata"
+    metadata_dir.mkdir(parents=True, exist_ok=True)
+    (metadata_dir / f"{zip_code}_metadata.json").write_text(json.dumps({"raw_count": len(listings)}), encoding="utf-8")
+    return zip_dir
+
+
+def test_build_injection_manifest_rehashes_only_changed_files(monkeypatch, tmp_path):
+    fetched_root = tmp_path / "Fetched"
+    _write_scrape(fetched_root, "zillow", "33131", [{"id": 1}, {"id": 2}])
+    zip_dir = _write_scrape(fetched_root, "redfin", "33139", [{"id": 3}])
+    uncached = injection_manifest.build_injection_manifest(fetched_root, use_file_cache=False)
+
+    reads = []
+    hash_and_count = injection_manifest._hash_and_count
+    monkeypatch.setattr(injection_manifest, "_hash_and_count", lambda path, *args: reads.append(path.name) or hash_and_count(path, *args))
+    cold = injection_manifest.build_injection_manifest(fetched_root)
+    warm = injection_manifest.build_injection_manifest(fetched_root)
+
+    assert len(reads) == 4
+    assert [record["canonical"] for record in cold["records"]] == [record["canonical"] for record in uncached["records"]]
+    assert [record["raw"] for record in warm["records"]] == [record["raw"] for record in uncached["records"]]
+    assert warm["summary"]["canonical_listing_count"] == 3
+
+    canonical_path = zip_dir / "canonical_listings_2024-01-01_00-00.json"
+    canonical_path.write_text(json.dumps([{"id": 3}, {"id": 4}, {"id": 5}]), encoding="utf-8")
+    os.utime(canonical_path, ns=(1, 1))
+    changed = injection_manifest.build_injection_manifest(fetched_root)
+
+    assert reads[4:] == ["canonical_listings_2024-01-01_00-00.json"]
+    changed_record = changed["records"][1]
+    assert changed_record["canonical"]["record_count"] == 3
+    assert changed_record["canonical"]["sha256"] == hashlib.sha256(canonical_path.read_bytes()).hexdigest()
+    assert changed["summary"]["canonical_listing_count"] == 5
+
+
+def test_zip_manifest_warms_the_cache_and_full_builds_prune_it(tmp_path):
+    fetched_root = tmp_path / "Fetched"
+    zip_dir = _write_scrape(fetched_root, "zillow", "33131", [{"id": 1}])
+    injection_manifest.write_zip_injection_manifest(
+        "zillow", "33131", zip_dir / "canonical_listings_2024-01-01_00-00.json", fetched_root=fetched_root,
+    )
+    _write_scrape(fetched_root, "zillow", "33131", [{"id": 1}, {"id": 2}], "2024-02-01_00-00")
+
+    injection_manifest.build_injection_manifest(fetched_root)
+
+    connection = injection_manifest.open_file_cache(fetched_root)
+    try:
+        cached_paths = sorted(path for (path,) in connection.execute("SELECT path FROM payload_files"))
+    finally:
+        connection.close()
+    assert cached_paths == [
+        "zillow/33131/canonical_listings_2024-02-01_00-00.json",
+        "zillow/33131/listings_2024-02-01_00-00.json",
+        "zillow/Metadata/33131_metadata.json",
+    ]
+
+
+def test_scrape_time_descriptors_replace_decoding(monkeypatch, tmp_path):
+    from re_analyzer.scrapers import data_quality
+
+    fetched_root = tmp_path / "Fetched"
+    zip_dir = fetched_root / "zillow" / "33131"
+    zip_dir.mkdir(parents=True)
+    canonical_path = zip_dir / "canonical_listings_2024-01-01_00-00.json"
+    listings = [{"price_estimate": 300000, "beds": 0, "status": ""}, {"price_estimate": 250000, "beds": 3}]
+    descriptor = injection_manifest.write_payload_file(listings, canonical_path, include_field_counts=True)
+    injection_manifest.write_payload_file([{"zpid": 1}], zip_dir / "listings_2024-01-01_00-00.json")
+
+    assert descriptor["record_count"] == 2
+    assert descriptor["bytes"] == canonical_path.stat().st_size
+    assert descriptor["sha256"] == hashlib.sha256(canonical_path.read_bytes()).hexdigest()
+    assert descriptor["field_counts"] == {"price_estimate": 2, "beds": 1}
+    assert sorted(path.name for path in zip_dir.glob("*listings_*.json")) == ["canonical_listings_2024-01-01_00-00.json", "listings_2024-01-01_00-00.json"]
+
+    def fail(path, *args):
+        raise AssertionError(f"decoded {path}")
+
+    monkeypatch.setattr(injection_manifest, "_hash_and_count", fail)
+    monkeypatch.setattr(data_quality, "_load_listings", fail)
+    monkeypatch.setattr(data_quality, "FETCHED_ROOT", fetched_root)
+    record = injection_manifest.build_injection_manifest(fetched_root, use_file_cache=False)["records"][0]
+    assert (record["canonical"]["record_count"], record["raw"]["record_count"]) == (2, 1)
+    assert record["canonical"]["sha256"] == descriptor["sha256"]
+    assert [row.listing_count for row in data_quality.analyze_resources()] == [2]
+
+    # A payload rewritten without its descriptor is decoded again.
+    canonical_path.write_text(json.dumps(listings[:1]), encoding="utf-8")
+    assert injection_manifest.load_payload_descriptor(canonical_path) is None
+
+
+def test_threaded_and_mmap_hashing_match_sequential_reads(tmp_path):
+    fetched_root = tmp_path / "Fetched"
+    for zip_code in ("33131", "33139", "33140"):
+        _write_scrape(fetched_root, "realtor", zip_code, [{"id": index, "zip": zip_code} for index in range(50)])
+    (fetched_root / "realtor" / "33140" / "canonical_listings_2024-01-01_00-00.json").write_bytes(b"")
+    expected = injection_manifest.build_injection_manifest(fetched_root, use_file_cache=False, hash_workers=1)
+
+    for use_mmap in (False, True):
+        manifest = injection_manifest.build_injection_manifest(fetched_root, use_file_cache=False, hash_workers=4, use_mmap=use_mmap)
+        assert manifest["records"] == [{**record, "generated_at": manifest["generated_at"]} for record in expected["records"]]
+    assert [record["status"] for record in expected["records"]] == ["ready", "ready", "invalid"]
+    assert not (fetched_root / injection_manifest.FILE_CACHE_NAME).exists()
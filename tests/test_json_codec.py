@@ -0,0 +1,67 @@
+import json
+import math
+from datetime import date, datetime
+
+import pytest
+
+from re_analyzer.utility import json_codec
+
+
+PAYLOAD = {"zpid": 123, "price": 450000.5, "address": "100 Brickell Bay Dr, Miami", "tags": ["condo", "waterfront"], "hoa": None}
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+
+def test_round_trip_and_formats_match_stdlib(codec, tmp_path):
+    path = tmp_path / "payload.json"
+
+    codec.dump_file(PAYLOAD, path)
+    assert json.loads(path.read_text(encoding="utf-8")) == PAYLOAD
+    assert "\n" not in path.read_text(encoding="utf-8")
+    assert codec.load_file(path) == PAYLOAD
+
+    codec.dump_file(PAYLOAD, path, indent=4)
+    assert path.read_text(encoding="utf-8") == json.dumps(PAYLOAD, indent=4)
+
+
+def test_accepts_everything_the_stdlib_accepts(codec):
+    assert codec.loads('{"value": NaN, "other": 1}')["other"] == 1
+    assert codec.loads(codec.dumps({1: 2**70}, default=str)) == {"1": 2**70}
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads("{")
+
+
+def test_datetimes_and_nan_are_written_like_the_stdlib(codec, tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "payload.json"
+    payload = {
+        "checked_at": datetime(2024, 1, 2, 3, 4, 5),
+        "day": date(2024, 1, 2),
+        "rent": float("nan"),
+        "history": [{"value": np.float64(1.5)}, {"value": np.float64("nan")}, {"value": float("inf")}, None],
+    }
+    expected = json.dumps(payload, default=str, separators=(",", ":"), ensure_ascii=False)
+
+    assert codec.dumps(payload, default=str) == expected
+    assert codec.dump_file(payload, path, default=str).decode("utf-8") == expected
+    loaded = codec.load_file(path)
+    assert loaded["checked_at"] == "2024-01-02 03:04:05"
+    assert math.isnan(loaded["rent"]) and math.isnan(loaded["history"][1]["value"])
+    assert codec.dumps({"hoa": None, "price": 1.5}) == '{"hoa":null,"price":1.5}'
+    with pytest.raises(TypeError):
+        codec.dumps({"checked_at": datetime(2024, 1, 2)})
+
+
+def test_exponent_floats_and_wide_integers_match_the_stdlib(codec):
+    payload = {"floats": [1e16, 1e-7, 1e-5, 0.0001, 1.5e300, -2.5e-10, 123456789012345.6], "ints": [2**64, -(2**63) - 1, 10**30, 2**63 - 1]}
+    expected = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+    assert codec.dumps(payload) == expected
+    assert codec.loads(expected) == payload
+    assert all(type(value) is int for value in codec.loads(expected)["ints"])
+    assert codec.loads(memoryview(expected.encode("utf-8"))) == payload
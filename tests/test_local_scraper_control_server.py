@@ -1,3 +1,5 @@
+import pytest
+
 from re_analyzer.scrapers import local_scraper_control_server as server
 
 
@@ -14,6 +16,16 @@ def test_network_bind_requires_token():
     assert not server.network_bind_requires_token("localhost")
 
 
+def test_reconciliation_workers_default_to_one_and_are_capped():
+    assert server.reconciliation_workers({}) == 1
+    assert server.reconciliation_workers({"workers": "2"}) == 2
+    assert server.reconciliation_workers({"workers": 0}) == 1
+    assert server.reconciliation_workers({"workers": 512}) == server.RECONCILIATION_MAX_WORKERS
+    for value in ("many", None, [2], True):
+        with pytest.raises(ValueError):
+            server.reconciliation_workers({"workers": value})
+
+
 def test_control_token_protects_routes():
     original_token = server.CONTROL_TOKEN
     server.CONTROL_TOKEN = "local-test-token"
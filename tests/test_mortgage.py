@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from re_analyzer.analyzers import manual_analysis_intake, mortgage, underwriting
+from re_analyzer.analyzers.manual_analysis_intake import manual_analysis_to_ranking_row
+
+
+def test_monthly_payment_and_balances_match_the_closed_form():
+    loan, rate, term = 200000, 6.0, 30
+    monthly_rate, payments = rate / 1200, term * 12
+    months = np.array([0, 1, 60, 120, 359, 360, 400])
+
+    balance = mortgage.remaining_balance(loan, rate, term, months)
+    growth = (1 + monthly_rate) ** np.minimum(months, payments)
+    expected = loan * ((1 + monthly_rate) ** payments - growth) / ((1 + monthly_rate) ** payments - 1)
+
+    assert float(mortgage.monthly_payment(loan, rate, term)) == pytest.approx(1199.10, abs=0.01)
+    np.testing.assert_allclose(balance, expected, rtol=1e-5, atol=0.05)
+    assert float(mortgage.monthly_payment(36000, 0.0, 30)) == pytest.approx(100.0)
+    assert float(mortgage.remaining_balance(36000, 0.0, 30, 120)) == pytest.approx(24000.0)
+
+
+def test_payment_splits_add_up_to_the_payment_and_the_interest_paid():
+    loans = np.array([150000.0, 420000.0, 90000.0])
+    rates = np.array([5.5, 7.25, 5.5])
+    terms = np.array([30, 15, 30])
+    payment = mortgage.monthly_payment(loans, rates, terms)
+
+    interest_portions = []
+    for month in range(1, 61):
+        principal, interest = mortgage.payment_split(loans, rates, terms, month)
+        np.testing.assert_allclose(principal + interest, payment, rtol=1e-5)
+        interest_portions.append(interest)
+
+    np.testing.assert_allclose(mortgage.interest_paid(loans, rates, terms, 60), np.sum(interest_portions, axis=0), rtol=1e-4)
+    assert mortgage.payment_split(loans, rates, terms, 400)[0].tolist() == [0, 0, 0]
+
+
+def test_annuity_factors_are_computed_once_per_rate_and_term():
+    mortgage.annuity_factor.cache_clear()
+    rates = np.tile([6.125, 6.5, 7.0], 1000)
+
+    mortgage.monthly_payment(np.full(rates.shape, 250000.0), rates, 30)
+    mortgage.monthly_payment(np.full(rates.shape, 125000.0), rates, 30)
+
+    info = mortgage.annuity_factor.cache_info()
+    assert (info.misses, info.hits) == (3, 3)
+    assert np.isnan(mortgage.monthly_payment(100000, np.nan, 30))
+
+
+def test_equity_after_years_uses_the_catalog_terms():
+    catalog_df = pd.DataFrame({"purchase_price": [250000.0, 400000.0], "annual_mortgage_rate": [6.0, 7.0]}, index=[5, 9])
+
+    equity_df = underwriting.equity_after_years(catalog_df, 5, down_payment_pct=0.2)
+    loans = np.array([200000.0, 320000.0])
+
+    np.testing.assert_allclose(equity_df["remaining_balance"], mortgage.remaining_balance(loans, [6.0, 7.0], 30, 60))
+    np.testing.assert_allclose(equity_df["equity"], catalog_df["purchase_price"] - equity_df["remaining_balance"])
+    np.testing.assert_allclose(
+        equity_df["principal_paid"] + equity_df["interest_paid"],
+        underwriting.monthly_principal_and_interest(loans, [6.0, 7.0]) * 60,
+        rtol=1e-4,
+    )
+
+
+def test_manual_analysis_rows_fall_back_to_the_mortgage_kernel():
+    report = {"input_assumptions": {"price": 250000, "down_payment_pct": 0.2, "annual_mortgage_rate": 6.0}}
+    recorded = {"input_assumptions": {**report["input_assumptions"], "principal_and_interest_monthly": 1250.0}}
+
+    assert manual_analysis_to_ranking_row(report)["principal_and_interest"] == pytest.approx(1199.10)
+    assert manual_analysis_to_ranking_row(recorded)["principal_and_interest"] == 1250.0
+    assert manual_analysis_to_ranking_row({})["principal_and_interest"] is None
+
+
+def test_saved_manual_analysis_reports_record_their_loan_terms(monkeypatch, tmp_path):
+    monkeypatch.setattr(manual_analysis_intake, "DATA_PATH", str(tmp_path))
+    report = {"address": "1 Main St", "input_assumptions": {"price": 250000, "down_payment_pct": 0.2, "annual_mortgage_rate": 6.0}}
+
+    manual_analysis_intake.save_manual_analysis_report(report)
+    saved, = manual_analysis_intake.load_manual_analysis_reports()
+
+    assert saved["input_assumptions"]["loan_amount"] == pytest.approx(200000)
+    assert saved["input_assumptions"]["loan_term_years"] == 30
+    assert saved["input_assumptions"]["principal_and_interest_monthly"] == pytest.approx(1199.10)
+    assert manual_analysis_to_ranking_row(saved)["principal_and_interest"] == pytest.approx(1199.10)
+    assert report["input_assumptions"].keys() == {"price", "down_payment_pct", "annual_mortgage_rate"}
@@ -0,0 +1,180 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from re_analyzer.scrapers import normalize_data
+
+
+def _listing(property_id, zip_code, price=400000, address="100 Main St"):
+    return {
+        "canonical_property_id": property_id,
+        "source_name": "zillow",
+        "source_property_id": property_id,
+        "address": address,
+        "zip_code": zip_code,
+        "price": price,
+    }
+
+
+def _write_canonical(fetched_root, provider, zip_code, timestamp, listings):
+    zip_dir = fetched_root / provider / zip_code
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    (zip_dir / f"canonical_listings_{timestamp}.json").write_text(json.dumps(listings), encoding="utf-8")
+
+
+def test_partition_columns_keep_nearby_listings_with_their_own_zip():
+    columns = normalize_data._partition_columns([
+        _listing("a", "33131"),
+        _listing("b", "33139"),
+        _listing("c", None),
+        _listing("d", "33131", price=0, address=""),
+        "not a listing",
+    ], "33131", "2026-05-28T19:35:00")
+
+    assert list(columns["canonical_property_id"]) == ["a", "b", "c"]
+    assert list(columns[normalize_data.LISTING_ZIP_CODE_COLUMN]) == [33131, 33139, 33131]
+    assert "zip_code" not in columns
+
+
+def test_listings_to_columns_matches_listing_to_row():
+    listings = [
+        _listing("a", "33131"),
+        {"price": "450000", "rent_estimate": 3100, "beds": "3", "baths": "2.5", "zip_code": 33131.0,
+         "raw": {"hoaFee": "n/a", "monthlyHoa": "125", "imgUrl": "", "primary_photo": {"href": "https://img/1"}},
+         "tax_history": [{"taxPaid": 5123.45, "value": 398000}]},
+        {"price": 612345, "rent_estimate": 4321, "latitude": None, "year_built": True,
+         "raw": {"annualHomeownersInsurance": 2417, "thumbnail": "https://img/2"},
+         "tax_history": [{"taxPaid": 0, "value": 398000}], "status": "Pending"},
+        {"price": None, "raw": "not a dict", "tax_history": [], "state": "", "home_type": None},
+        {"price": "bad", "rent_estimate": "1e3", "living_area": "12.5", "lot_size": 4356.7,
+         "raw": {"homeInsurance": None, "annualInsurance": "1800.5"}},
+    ]
+    scraped_at = "2026-05-28T19:35:00"
+
+    columns = normalize_data.listings_to_columns(listings, scraped_at)
+    rows = [normalize_data.listing_to_row(listing, scraped_at) for listing in listings]
+
+    assert list(columns) == list(normalize_data.CANONICAL_COLUMNS)
+    for name, values in columns.items():
+        assert values.tolist() == [row[name] for row in rows], name
+
+
+def test_build_replaces_only_the_refreshed_partition(tmp_path):
+    pytest.importorskip("pyarrow")
+    fetched_root = tmp_path / "Fetched"
+    dataset_dir = tmp_path / "Canonical" / "canonical_listings"
+    _write_canonical(fetched_root, "zillow", "33131", "2026-05-28_19-35", [_listing("a", "33131"), _listing("b", "33131")])
+    _write_canonical(fetched_root, "zillow", "33139", "2026-05-28_19-35", [_listing("c", "33139")])
+    normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+    untouched = dataset_dir / "provider=zillow" / "zip_code=33139" / normalize_data.PARTITION_FILE_NAME
+    untouched_mtime = untouched.stat().st_mtime_ns
+
+    _write_canonical(fetched_root, "zillow", "33131", "2026-05-29_08-00", [_listing("a", "33131", price=390000)])
+    result = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir, zip_codes=["33131"])
+    df = normalize_data.read_canonical_listings(dataset_dir)
+
+    assert result["files_read"] == 1
+    assert untouched.stat().st_mtime_ns == untouched_mtime
+    assert sorted(df["canonical_property_id"]) == ["a", "c"]
+    assert df.loc[df["canonical_property_id"] == "a", "purchase_price"].item() == 390000
+    assert list(normalize_data.read_canonical_listings(dataset_dir, zip_codes=["33139"])["canonical_property_id"]) == ["c"]
+    assert list(df.columns[:len(normalize_data.CANONICAL_COLUMNS)]) == list(normalize_data.CANONICAL_COLUMNS)
+
+
+def test_build_keeps_nearby_zip_listings(tmp_path):
+    pytest.importorskip("pyarrow")
+    fetched_root = tmp_path / "Fetched"
+    dataset_dir = tmp_path / "Canonical" / "canonical_listings"
+    _write_canonical(fetched_root, "redfin", "33131", "2026-05-28_19-35", [_listing("a", "33131"), _listing("nearby", "33139")])
+
+    normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir, output_path=tmp_path / "flat.parquet")
+    df = normalize_data.read_canonical_listings(dataset_dir, zip_codes=["33131"])
+
+    assert sorted(df["canonical_property_id"]) == ["a", "nearby"]
+    nearby = df.loc[df["canonical_property_id"] == "nearby"]
+    assert (nearby["zip_code"].item(), nearby[normalize_data.LISTING_ZIP_CODE_COLUMN].item()) == (33131, 33139)
+    flat_df = pd.read_parquet(tmp_path / "flat.parquet").set_index("canonical_property_id")
+    assert flat_df["zip_code"].to_dict() == {"a": 33131, "nearby": 33139}
+
+
+def test_full_build_drops_partitions_of_removed_zips(tmp_path):
+    pytest.importorskip("pyarrow")
+    import shutil
+
+    fetched_root = tmp_path / "Fetched"
+    dataset_dir = tmp_path / "Canonical" / "canonical_listings"
+    _write_canonical(fetched_root, "zillow", "33131", "2026-05-28_19-35", [_listing("a", "33131")])
+    _write_canonical(fetched_root, "zillow", "33139", "2026-05-28_19-35", [_listing("c", "33139")])
+    _write_canonical(fetched_root, "redfin", "33139", "2026-05-28_19-35", [_listing("r", "33139")])
+    normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+    shutil.rmtree(fetched_root / "zillow" / "33139")
+
+    # Filtered builds only touch the ZIPs they name; the full build sees 33139 is gone for zillow.
+    assert normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir, zip_codes=["33131"])["partitions_removed"] == 0
+    assert normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir, dry_run=True)["partitions_removed"] == 1
+    assert sorted(normalize_data.read_canonical_listings(dataset_dir)["canonical_property_id"]) == ["a", "c", "r"]
+    result = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+
+    assert (result["partitions_removed"], result["files_read"], result["files_skipped"]) == (1, 0, 2)
+    assert not (dataset_dir / "provider=zillow" / "zip_code=33139").exists()
+    assert sorted(normalize_data.read_canonical_listings(dataset_dir)["canonical_property_id"]) == ["a", "r"]
+    _write_canonical(fetched_root, "zillow", "33139", "2026-05-30_08-00", [_listing("c", "33139")])
+    assert normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)["files_read"] == 1
+
+
+def test_build_writes_the_flat_export_with_the_baseline_layout(tmp_path):
+    pytest.importorskip("pyarrow")
+    fetched_root = tmp_path / "Fetched"
+    dataset_dir = tmp_path / "Canonical" / "canonical_listings"
+    _write_canonical(fetched_root, "zillow", "33131", "2026-05-28_19-35", [_listing("a", "33131"), _listing("nearby", "33139")])
+
+    normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+    flat_df = pd.read_parquet(tmp_path / "Canonical" / normalize_data.CANONICAL_PARQUET_FILE_NAME)
+
+    assert list(flat_df.columns) == list(normalize_data.CANONICAL_COLUMNS)
+    assert flat_df.set_index("canonical_property_id")["zip_code"].to_dict() == {"a": 33131, "nearby": 33139}
+    assert normalize_data.CANONICAL_PARQUET_PATH == normalize_data.CANONICAL_DATASET_DIR.parent / normalize_data.CANONICAL_PARQUET_FILE_NAME
+
+
+def test_build_skips_files_recorded_in_the_ingest_ledger(tmp_path):
+    pytest.importorskip("pyarrow")
+    fetched_root = tmp_path / "Fetched"
+    dataset_dir = tmp_path / "Canonical" / "canonical_listings"
+    _write_canonical(fetched_root, "zillow", "33131", "2026-05-28_19-35", [_listing("a", "33131")])
+    _write_canonical(fetched_root, "redfin", "33139", "2026-05-28_19-35", [_listing("c", "33139")])
+
+    first = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+    touched = fetched_root / "redfin" / "33139" / "canonical_listings_2026-05-28_19-35.json"
+    os.utime(touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 10_000_000_000))
+    second = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+    _write_canonical(fetched_root, "zillow", "33131", "2026-05-29_08-00", [_listing("a", "33131"), _listing("b", "33131")])
+    dry_run = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir, dry_run=True)
+    third = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=dataset_dir)
+
+    assert (first["files_read"], first["files_skipped"]) == (2, 0)
+    assert (second["files_read"], second["files_skipped"], second["rows"]) == (0, 2, 2)
+    assert (dry_run["files_read"], dry_run["files_skipped"], dry_run["rows"]) == (1, 1, 3)
+    assert (third["files_read"], third["files_skipped"], third["rows"]) == (1, 1, 3)
+    assert sorted(normalize_data.read_canonical_listings(dataset_dir)["canonical_property_id"]) == ["a", "b", "c"]
+
+
+def test_parallel_build_matches_serial_build_and_counts_bad_files(tmp_path):
+    pytest.importorskip("pyarrow")
+    fetched_root = tmp_path / "Fetched"
+    for index, zip_code in enumerate(("33131", "33139", "33140", "33141")):
+        _write_canonical(fetched_root, "zillow", zip_code, "2026-05-28_19-35", [_listing(f"p{index}", zip_code)])
+    broken = fetched_root / "redfin" / "33131"
+    broken.mkdir(parents=True)
+    (broken / "canonical_listings_2026-05-28_19-35.json").write_text("[{", encoding="utf-8")
+
+    serial = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=tmp_path / "serial")
+    parallel = normalize_data.build_canonical_parquet(fetched_root, dataset_dir=tmp_path / "parallel", workers=2)
+
+    assert serial == {**parallel, "output": serial["output"]}
+    assert (parallel["files_read"], parallel["errors"], parallel["rows"]) == (4, 1, 4)
+    assert (
+        normalize_data.read_canonical_listings(tmp_path / "serial").sort_values("canonical_property_id").reset_index(drop=True)
+        .equals(normalize_data.read_canonical_listings(tmp_path / "parallel").sort_values("canonical_property_id").reset_index(drop=True))
+    )
@@ -0,0 +1,176 @@
+import json
+from functools import partial
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("xgboost")
+pytest.importorskip("shap")
+
+from re_analyzer.analyzers import iterator
+from re_analyzer.processors import processing_pipeline, re_metrics_processor, zestimate_history_processor
+
+
+def _write_details(root, zpid, price):
+    zip_dir = root / "33131"
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    property_info = {"zpid": zpid, "zipcode": "33131", "price": price, "livingArea": 1000 + zpid, "streetAddress": f"{zpid} Main St"}
+    details = {
+        "props": {"pageProps": {"componentProps": {"gdpClientCache": {"key": {"property": property_info}}}}},
+        "zestimateHistory": [{"Date": "2024-01-01", "Price": price}, {"Date": "2024-02-01", "Price": price + zpid}],
+    }
+    path = zip_dir / f"{zpid}_property_details.json"
+    path.write_text(json.dumps(details), encoding="utf-8")
+    return path
+
+
+def _features_df(property_infos):
+    return pd.DataFrame({
+        "home_features_score": [info["price"] / 1e6 for info in property_infos],
+        "purchase_price": [info["price"] for info in property_infos],
+        "waterView_None": [1.0 for _ in property_infos],
+    }, index=[info["zpid"] for info in property_infos])
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    details_root = tmp_path / "PropertyDetails"
+    cache_path = str(tmp_path / "property_details_cache.sqlite")
+    features_path = str(tmp_path / "property_features_df.parquet")
+    model_path = tmp_path / "home_features_model.json"
+    calls = []
+
+    def _full_home_features():
+        calls.append("retrain")
+        property_infos = [info for info, _ in iterator.cached_property_details_iterator(cache_path)]
+        model_path.write_text("{}")
+        features_df = _features_df(property_infos)
+        features_df.to_parquet(features_path)
+        return features_df
+
+    def _update_home_features(property_infos, removed_zpids=()):
+        calls.append(("update", sorted(info["zpid"] for info in property_infos), sorted(removed_zpids)))
+        features_df = pd.read_parquet(features_path)
+        features_df = features_df[~features_df.index.isin([info["zpid"] for info in property_infos] + list(removed_zpids))]
+        features_df = pd.concat([features_df, _features_df(property_infos)])
+        features_df.to_parquet(features_path)
+        return features_df
+
+    monkeypatch.setattr(iterator, "PROPERTY_DETAILS_PATH", str(details_root))
+    monkeypatch.setattr(processing_pipeline, "refresh_property_details_cache", partial(iterator.refresh_property_details_cache, cache_path, force=True))
+    monkeypatch.setattr(processing_pipeline, "cached_property_details_records", partial(iterator.cached_property_details_records, cache_path))
+    for module in (re_metrics_processor, zestimate_history_processor):
+        monkeypatch.setattr(module, "cached_property_details_iterator", partial(iterator.cached_property_details_iterator, cache_path))
+    monkeypatch.setattr(processing_pipeline, "home_features_processing_pipeline", _full_home_features)
+    monkeypatch.setattr(processing_pipeline, "update_home_features", _update_home_features)
+    monkeypatch.setattr(processing_pipeline, "PROPERTY_STATIC_DF_PATH", str(tmp_path / "property_static_df.parquet"))
+    monkeypatch.setattr(processing_pipeline, "PROCESSING_STATE_PATH", str(tmp_path / "processing_state.sqlite"))
+    monkeypatch.setattr(processing_pipeline, "HOME_FEATURES_DATAFRAME_PATH", features_path)
+    monkeypatch.setattr(processing_pipeline, "HOME_FEATURES_MODEL_PATH", str(model_path))
+    monkeypatch.setattr(zestimate_history_processor, "ZESTIMATE_HISTORY_PARQUET_PATH", str(tmp_path / "zestimate_history_df.parquet"))
+    return details_root, calls
+
+
+def _outputs():
+    static_df = pd.read_parquet(processing_pipeline.PROPERTY_STATIC_DF_PATH).sort_index()
+    history_df = pd.read_parquet(zestimate_history_processor.ZESTIMATE_HISTORY_PARQUET_PATH).reset_index()
+    return static_df, history_df.sort_values(["zpid", "Date"]).reset_index(drop=True)
+
+
+def test_incremental_run_upserts_changed_zpids_and_matches_a_full_run(pipeline):
+    details_root, calls = pipeline
+    for zpid in range(1, 11):
+        _write_details(details_root, zpid, 100000 * zpid)
+
+    first = processing_pipeline.run_processing_pipeline(workers=1)
+    _write_details(details_root, 3, 333333)
+    _write_details(details_root, 11, 1100000)
+    (details_root / "33131" / "7_property_details.json").unlink()
+    second = processing_pipeline.run_processing_pipeline(retrain_change_fraction=0.5, workers=1)
+    incremental_static_df, incremental_history_df = _outputs()
+    unchanged = processing_pipeline.run_processing_pipeline(workers=1)
+    full = processing_pipeline.run_processing_pipeline(full=True, workers=1)
+    full_static_df, full_history_df = _outputs()
+
+    assert (first["mode"], second["mode"], unchanged["mode"], full["mode"]) == ("full", "incremental", "unchanged", "full")
+    assert (second["changed"], second["removed"], second["retrained"]) == (2, 1, False)
+    assert calls == ["retrain", ("update", [3, 11], [7]), "retrain"]
+    assert sorted(incremental_static_df.index) == [1, 2, 3, 4, 5, 6, 8, 9, 10, 11]
+    assert incremental_static_df.loc[3, "purchase_price"] == 333333
+    pd.testing.assert_frame_equal(incremental_static_df, full_static_df, check_like=True)
+    pd.testing.assert_frame_equal(incremental_history_df, full_history_df, check_like=True)
+
+
+def test_home_features_are_retrained_when_the_change_fraction_crosses_the_threshold(pipeline):
+    details_root, calls = pipeline
+    for zpid in range(1, 11):
+        _write_details(details_root, zpid, 100000 * zpid)
+    processing_pipeline.run_processing_pipeline(workers=1)
+
+    _write_details(details_root, 1, 123456)
+    below = processing_pipeline.run_processing_pipeline(retrain_change_fraction=0.1, workers=1)
+    _write_details(details_root, 2, 234567)
+    _write_details(details_root, 4, 456789)
+    above = processing_pipeline.run_processing_pipeline(retrain_change_fraction=0.1, workers=1)
+
+    assert (below["change_fraction"], below["retrained"]) == (0.1, False)
+    assert (above["change_fraction"], above["retrained"]) == (0.2, True)
+    assert calls == ["retrain", ("update", [1], []), "retrain"]
+    assert _outputs()[0].loc[4, "home_features_score"] == pytest.approx(0.456789)
+
+
+def test_update_home_features_scores_changed_rows_with_the_saved_model(monkeypatch, tmp_path):
+    import shap
+    import xgboost as xgb
+
+    from re_analyzer.processors import home_features_processor
+
+    property_infos = [
+        {"zpid": zpid, "price": 100000 * zpid, "resoFacts": {
+            "hasPrivatePool": zpid % 2 == 0,
+            "waterView": "Ocean" if zpid % 3 == 0 else "None",
+            "flooring": ["Tile"] if zpid % 2 else ["Wood"],
+        }}
+        for zpid in range(1, 13)
+    ]
+    features_df = home_features_processor.features_df_from_property_infos(property_infos).astype(float)
+    X = features_df.drop(columns=["purchase_price"])
+    model = xgb.XGBRegressor(n_estimators=5, max_depth=2).fit(X, features_df["purchase_price"])
+    model_path, features_path = tmp_path / "home_features_model.json", tmp_path / "property_features_df.parquet"
+    model.save_model(model_path)
+    pd.DataFrame(
+        {"home_features_score": [0.5, 0.5], "purchase_price": [100000.0, 1.0], "waterView_None": [1.0, 1.0]}, index=[1, 99],
+    ).to_parquet(features_path)
+    monkeypatch.setattr(home_features_processor, "HOME_FEATURES_MODEL_PATH", str(model_path))
+    monkeypatch.setattr(home_features_processor, "HOME_FEATURES_DATAFRAME_PATH", str(features_path))
+
+    updated = home_features_processor.update_home_features([property_infos[2], property_infos[3]], removed_zpids=[99]).sort_index()
+
+    expected_scores = home_features_processor.normalized_cumulative_shap_scores(shap.Explainer(model)(X.loc[[3, 4]]))
+    assert list(updated.index) == [1, 3, 4]
+    assert updated.loc[[3, 4], "home_features_score"].tolist() == pytest.approx(list(expected_scores))
+    assert updated["waterView_None"].tolist() == [1.0, 0.0, 1.0]
+    assert pd.read_parquet(features_path).sort_index().equals(updated)
+
+    # Changed properties without any waterView data are not waterfront, alone or batched with a waterView "None".
+    no_water_view = {"zpid": 5, "price": 500000, "resoFacts": {"hasPrivatePool": True}}
+    assert home_features_processor.update_home_features([no_water_view]).loc[5, "waterView_None"] == 1
+    updated = home_features_processor.update_home_features([no_water_view, property_infos[0], property_infos[5]])
+    assert updated.loc[[5, 1, 6], "waterView_None"].tolist() == [1.0, 1.0, 0.0]
+
+
+def test_water_view_none_depends_only_on_each_property():
+    from re_analyzer.processors import home_features_processor
+
+    property_infos = [
+        {"zpid": 1, "price": 1, "resoFacts": {"waterView": "None"}},
+        {"zpid": 2, "price": 1, "resoFacts": {"waterView": "Ocean"}},
+        {"zpid": 3, "price": 1, "resoFacts": {"hasPrivatePool": True}},
+        {"zpid": 4, "price": 1, "resoFacts": {"waterView": "Bay/Ocean"}},
+    ]
+    mixed = home_features_processor.water_view_none(home_features_processor.features_df_from_property_infos(property_infos))
+    assert mixed.tolist() == [1.0, 0.0, 1.0, 0.0]
+    for property_info, expected in zip(property_infos, mixed):
+        alone = home_features_processor.water_view_none(home_features_processor.features_df_from_property_infos([property_info]))
+        assert alone.tolist() == [expected]
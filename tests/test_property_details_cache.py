@@ -0,0 +1,113 @@
+import json
+import sqlite3
+
+from re_analyzer.analyzers import iterator
+
+
+def _write_details(root, zip_code, zpid, price, zestimate_history=None):
+    zip_dir = root / zip_code
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    property_info = {"zpid": zpid, "price": price, "originalPhotos": [{"id": 1}, {"id": 2}], "unused": "x" * 100}
+    details = {"props": {"pageProps": {"componentProps": {"gdpClientCache": {"key": {"property": property_info}}}}}}
+    if zestimate_history is not None:
+        details["zestimateHistory"] = zestimate_history
+    path = zip_dir / f"{zpid}_property_details.json"
+    path.write_text(json.dumps(details), encoding="utf-8")
+    return path
+
+
+def test_cached_iterator_decodes_each_file_once(monkeypatch, tmp_path):
+    details_root = tmp_path / "PropertyDetails"
+    cache_path = str(tmp_path / "property_details_cache.sqlite")
+    _write_details(details_root, "33131", 1, 500000, [{"Date": "2024-01-01", "Price": 1}])
+    changed = _write_details(details_root, "33139", 2, 750000)
+    (details_root / "33139" / "3_property_details.json").write_text(json.dumps({"captcha": True}), encoding="utf-8")
+    monkeypatch.setattr(iterator, "PROPERTY_DETAILS_PATH", str(details_root))
+    loads = []
+    real_load = iterator.load_slim_property_details
+    monkeypatch.setattr(iterator, "load_slim_property_details", lambda path: loads.append(path) or real_load(path))
+
+    first = list(iterator.cached_property_details_iterator(cache_path))
+    second = list(iterator.cached_property_details_iterator(cache_path))
+    assert first == second
+    assert len(loads) == 3
+    assert sorted(info["zpid"] for info, _ in first) == [1, 2]
+    assert all("unused" not in info and len(info["originalPhotos"]) == 1 for info, _ in first)
+    assert [history for info, history in first if info["zpid"] == 1] == [[{"Date": "2024-01-01", "Price": 1}]]
+
+    _write_details(details_root, "33139", 2, 1740000)
+    stats = iterator.refresh_property_details_cache(cache_path, force=True)
+    assert (stats["parsed"], stats["reused"]) == (1, 2)
+    assert loads[-1] == str(changed)
+    assert 1740000 in [info["price"] for info, _ in iterator.cached_property_details_iterator(cache_path)]
+
+
+def test_cache_is_rebuilt_when_the_slim_fields_change(monkeypatch, tmp_path):
+    details_root = tmp_path / "PropertyDetails"
+    cache_path = str(tmp_path / "property_details_cache.sqlite")
+    _write_details(details_root, "33131", 1, 500000)
+    _write_details(details_root, "33139", 2, 750000)
+    monkeypatch.setattr(iterator, "PROPERTY_DETAILS_PATH", str(details_root))
+    assert all("unused" not in info for info, _ in iterator.cached_property_details_iterator(cache_path))
+
+    # Same process, so the refresh memo alone would have served the rows slimmed to the old fields.
+    monkeypatch.setattr(iterator, "PROPERTY_INFO_FIELDS", iterator.PROPERTY_INFO_FIELDS + ("unused",))
+    assert [info["unused"] for info, _ in iterator.cached_property_details_iterator(cache_path)] == ["x" * 100] * 2
+    assert iterator.refresh_property_details_cache(cache_path, force=True)["reused"] == 2
+
+    # A cache written before versioning (user_version 0) is rebuilt too.
+    with sqlite3.connect(cache_path) as connection:
+        connection.execute("UPDATE property_details SET property_info = '{}'")
+        connection.execute("PRAGMA user_version = 0")
+    connection.close()
+    assert iterator.refresh_property_details_cache(cache_path)["parsed"] == 2
+
+
+def test_parallel_iterator_returns_slim_property_details(monkeypatch, tmp_path):
+    details_root = tmp_path / "PropertyDetails"
+    for zpid in range(1, 6):
+        _write_details(details_root, "33131", zpid, 100000 * zpid, [{"Date": "2024-01-01", "Price": zpid}])
+    (details_root / "33131" / "9_property_details.json").write_text(json.dumps({"captcha": True}), encoding="utf-8")
+    monkeypatch.setattr(iterator, "PROPERTY_DETAILS_PATH", str(details_root))
+
+    serial = list(iterator.property_details_iterator())
+    parallel = list(iterator.property_details_iterator(workers=2, ordered=False))
+
+    def _by_zpid(records):
+        return sorted(records, key=lambda record: record[0]["zpid"])
+
+    expected = _by_zpid(
+        (iterator.slim_property_info(iterator.get_property_info_from_property_details(details)), details["zestimateHistory"])
+        for details in serial
+    )
+    assert len(parallel) == 5
+    assert _by_zpid(
+        (iterator.get_property_info_from_property_details(details), details["zestimateHistory"]) for details in parallel
+    ) == expected
+
+
+def _page(component_props, **top_level):
+    return {"props": {"pageProps": {"componentProps": component_props, "seo": {"property": {"zpid": -1}}}}, **top_level}
+
+
+def test_lazy_extractor_matches_slim_property_details(tmp_path):
+    property_info = {"zpid": 7, "price": 410000, "originalPhotos": [{"id": 1}, {"id": 2}], "resoFacts": {"property": 1}}
+    pages = [
+        _page({"gdp": {"first": {"property": property_info}, "second": {"property": {"zpid": 8}}}}),
+        _page({"gdpClientCache": {"first": {"property": property_info}}}, zestimateHistory=[{"Price": 1}]),
+        _page({"gdpClientCache": {"first": {"other": 1}, "second": {"property": property_info}}}),
+        _page({"other": {"gdp": {"first": {"property": {"zpid": 9}}}}, "gdpClientCache": {"first": {"property": property_info}}}),
+        _page({"gdp": {"first": {"property": dict(property_info, zestimateHistory=[{"Price": 2}])}}}),
+        {"zestimateHistory": [], "props": {"pageProps": {"componentProps": {"gdp": {"first": {"property": property_info}}}}}},
+        _page({"gdp": {"first": {"property": property_info}}}, big=["x" * 50] * 100),
+        # A gdp key after componentProps, at the same depth, is not componentProps' own.
+        {"props": {"pageProps": {"componentProps": {"gdpClientCache": {"first": {"property": property_info}}}, "seo": {"gdp": {"x": {"property": {"zpid": 2}}}}}}},
+        {"props": {"pageProps": {"seo": {"componentProps": {"gdp": {"x": {"property": {"zpid": 2}}}}}, "componentProps": {"gdp": {"first": {"property": property_info}}}}}},
+        {"props": {"pageProps": {"componentProps": {"gdpClientCache": {"first": {"property": property_info}, "gdp": {"x": {"property": {"zpid": 2}}}}, "gdp": {"first": {"property": {"zpid": 3}}}}}}},
+        {"captcha": True},
+    ]
+    for index, page in enumerate(pages):
+        path = tmp_path / f"{index}_property_details.json"
+        path.write_text(json.dumps(page, indent=index % 2 or None), encoding="utf-8")
+        expected = iterator.slim_property_details(page) if "props" in page else {}
+        assert iterator.load_slim_property_details(path) == expected, index
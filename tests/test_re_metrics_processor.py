@@ -0,0 +1,43 @@
+import pytest
+
+from re_analyzer.processors import re_metrics_processor
+
+
+def test_property_metrics_df_applies_defaults_and_typed_columns():
+    photos = [{"mixedSources": {"jpeg": [{"url": "small"}, {"url": "large"}]}}]
+    metrics_df = re_metrics_processor.property_metrics_df([
+        {"zpid": 11, "zipcode": "33131", "price": 360000.9, "rentZestimate": 3000, "yearBuilt": 1999, "bedrooms": 3,
+         "bathrooms": 2.5, "propertyTaxRate": 1.02, "livingArea": 1200.7, "lotSize": 5000, "homeType": "CONDO",
+         "mortgageRates": {"thirtyYearFixedRate": 6.5}, "annualHomeownersInsurance": 2400, "monthlyHoaFee": 150,
+         "city": "Miami", "hdpUrl": "/homedetails/11", "streetAddress": "1 Main St", "originalPhotos": photos},
+        {"zpid": 12, "price": None, "rentZestimate": 0, "livingArea": None, "homeType": "", "mortgageRates": None,
+         "originalPhotos": [{"mixedSources": {"jpeg": []}}]},
+        {"zpid": "13", "zipcode": "33139", "price": "410000", "livingArea": 800, "mortgageRates": {}, "city": "Miami Beach"},
+        None,
+        {},
+        {"zpid": None},
+    ])
+
+    assert len(metrics_df) == 4
+    assert set(re_metrics_processor.METRICS_DTYPES) < set(metrics_df.columns)
+    assert {column: str(metrics_df[column].dtype) for column in re_metrics_processor.METRICS_DTYPES} == re_metrics_processor.METRICS_DTYPES
+    first, second, third, empty = metrics_df.to_dict("records")
+    assert (first["purchase_price"], first["living_area"], first["bathrooms"], first["lot_size"]) == (360000, 1200, 2, 5000)
+    assert first["gross_rent_multiplier"] == pytest.approx(10.0)
+    assert first["price_per_sqft"] == pytest.approx(300.0)
+    assert first["monthly_homeowners_insurance"] == pytest.approx(200.0)
+    assert first["annual_mortgage_rate"] == pytest.approx(6.5)
+    assert (first["image_url"], first["property_url"]) == ("large", "https://zillow.com/homedetails/11")
+    assert (second["purchase_price"], second["gross_rent_multiplier"], second["price_per_sqft"]) == (1, -1, 1)
+    assert (second["year_built"], second["home_type"], second["annual_mortgage_rate"], second["image_url"]) == (1960, "SINGLE_FAMILY", 6, "")
+    assert second["street_address"] == "No Property Address Located"
+    assert (third["zpid"], third["zip_code"], third["lot_size"], third["annual_mortgage_rate"]) == (13, 33139, 800, 6)
+    assert third["price_per_sqft"] == pytest.approx(512.5)
+    assert (empty["zpid"], empty["purchase_price"], empty["property_url"]) == (0, 1, "https://zillow.com")
+
+
+def test_property_metrics_df_without_properties_is_empty_but_typed():
+    metrics_df = re_metrics_processor.property_metrics_df([None])
+
+    assert metrics_df.empty
+    assert {column: str(metrics_df[column].dtype) for column in re_metrics_processor.METRICS_DTYPES} == re_metrics_processor.METRICS_DTYPES
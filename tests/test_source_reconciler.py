@@ -0,0 +1,184 @@
+from collections import Counter
+from itertools import combinations
+
+from re_analyzer.scrapers import source_reconciler as reconciler
+
+
+def _record(provider, property_id, address, price, zip_code="33131"):
+    return reconciler._record_from_dict(provider, {
+        "source_property_id": property_id,
+        "address": address,
+        "city": "Miami",
+        "state": "FL",
+        "zip_code": zip_code,
+        "price": price,
+        "home_type": "CONDO",
+        "raw": {},
+    })
+
+
+def _initial_summaries():
+    records = [
+        _record("zillow", "z1", "100 Brickell Bay Dr APT 1204, Miami, FL 33131", 500000),
+        _record("redfin", "r1", "100 Brickel Bay Drive #1204, Miami, FL 33131", 500000),
+        _record("realtor", "m1", "100 Brickell Bay Dr Unit 1205, Miami, FL 33131", 510000),
+        _record("redfin", "r2", "100 SW 8th St Unit 3, Miami, FL 33131", 300000),
+        _record("realtor", "m2", "100 8th St Unit 3, Miami, FL 33131", 300000),
+        _record("zillow", "z3", "250 Ocean Dr, Miami Beach, FL 33139", 900000, zip_code="33139"),
+    ]
+    return [reconciler._cluster_summary(cluster) for cluster in reconciler._cluster_records(records)]
+
+
+def test_candidate_pairs_stay_inside_similarity_blocks():
+    summaries = _initial_summaries()
+    pairs = list(reconciler._candidate_pairs(summaries))
+
+    assert pairs == sorted(pairs)
+    for left_index, right_index in combinations(range(len(summaries)), 2):
+        if (left_index, right_index) not in pairs:
+            assert reconciler._cluster_similarity(summaries[left_index], summaries[right_index]) == 0.0
+
+
+def _single_block(summaries):
+    return [0] * len(summaries), {0: list(range(len(summaries)))}
+
+
+def test_blocked_merge_matches_all_pairs_merge(monkeypatch):
+    summaries = _initial_summaries()
+    blocked = reconciler._merge_clusters_with_evidence(summaries)
+
+    monkeypatch.setattr(reconciler, "_similarity_blocks", _single_block)
+    all_pairs = reconciler._merge_clusters_with_evidence(summaries)
+
+    assert blocked == all_pairs
+    assert len(blocked[1]) >= 1
+
+
+def test_blocked_near_misses_match_all_pairs_scan(monkeypatch):
+    summaries = _initial_summaries()
+    blocked = reconciler._provider_only_near_misses(summaries, reconciler.DEFAULT_PROVIDERS, threshold=0.6)
+
+    monkeypatch.setattr(reconciler, "_similarity_blocks", _single_block)
+    monkeypatch.setattr(reconciler, "_similarity_upper_bound", lambda left, right: 1.0)
+    all_pairs = reconciler._provider_only_near_misses(summaries, reconciler.DEFAULT_PROVIDERS, threshold=0.6)
+
+    assert blocked == all_pairs
+    assert sum(blocked["counts"].values()) >= 1
+
+
+def test_cached_reconciliation_only_recomputes_changed_zips(monkeypatch, tmp_path):
+    fingerprints = {"33131": {"inputs": {"zillow": 1}}, "33139": {"inputs": {"zillow": 1}}}
+    reconciled = []
+
+    def fake_reconcile_zip(zip_code, providers=reconciler.DEFAULT_PROVIDERS, include_nearby=False):
+        reconciled.append(zip_code)
+        return {"zip_code": zip_code}
+
+    monkeypatch.setattr(reconciler, "RECONCILIATION_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(reconciler, "reconcile_zip", fake_reconcile_zip)
+    monkeypatch.setattr(reconciler, "_zip_input_fingerprint", lambda zip_code, **kwargs: fingerprints[zip_code])
+
+    first_stats = Counter()
+    first = list(reconciler._iter_zip_reports(["33131", "33139"], use_cache=True, cache_stats=first_stats))
+    fingerprints["33139"] = {"inputs": {"zillow": 2}}
+    second_stats = Counter()
+    second = list(reconciler._iter_zip_reports(["33131", "33139"], use_cache=True, cache_stats=second_stats))
+
+    assert first == second == [{"zip_code": "33131"}, {"zip_code": "33139"}]
+    assert first_stats == {"misses": 2}
+    assert second_stats == {"hits": 1, "misses": 1}
+    assert reconciled == ["33131", "33139", "33139"]
+    assert len(list(tmp_path.glob("33139_*.json"))) == 1
+
+
+def test_street_keys_match_uncached_normalization():
+    address = "100 Brickell Bay Drive Apt 1204, Miami, FL 33131"
+    street_key = reconciler._street_key(address)
+    before = reconciler._street_key_cache_counts()
+
+    keys = reconciler._street_keys(address)
+    again = reconciler._street_keys(address)
+
+    assert keys is again
+    assert keys == (street_key, reconciler._base_street_key(street_key), reconciler._unit_key(street_key))
+    assert (reconciler._street_key_cache_counts() - before)["hits"] >= 1
+
+
+def _write_fetched_listings(monkeypatch, tmp_path):
+    import json
+
+    listings = {
+        ("zillow", "33131"): [{"source_property_id": "z1", "address": "100 Brickell Bay Dr APT 1204, Miami, FL 33131", "price": 500000}],
+        ("redfin", "33131"): [{"source_property_id": "r1", "address": "100 Brickel Bay Drive #1204, Miami, FL 33131", "price": 500000}],
+        ("realtor", "33131"): [{"source_property_id": "m2", "address": "100 8th St Unit 3, Miami, FL 33131", "price": 300000}],
+        ("zillow", "33140"): [{"source_property_id": "z4", "address": "4000 Collins Ave, Miami Beach, FL 33140", "price": 750000}],
+    }
+    for (provider, zip_code), records in listings.items():
+        zip_dir = tmp_path / "Fetched" / provider / zip_code
+        zip_dir.mkdir(parents=True)
+        records = [{**record, "city": "Miami", "state": "FL", "zip_code": zip_code, "home_type": "CONDO", "raw": {}} for record in records]
+        (zip_dir / "canonical_listings_2024-01-01_00-00.json").write_text(json.dumps(records), encoding="utf-8")
+    from re_analyzer.scrapers import provider_adapters, scraper_runner
+
+    # Every data root reconcile_zip reads, so nothing comes from the real Data tree.
+    monkeypatch.setattr(reconciler, "DATA_PATH", str(tmp_path))
+    monkeypatch.setattr(reconciler, "SEARCH_LISTINGS_DATA_PATH", str(tmp_path / "SearchResults"))
+    monkeypatch.setattr(scraper_runner, "DATA_PATH", str(tmp_path))
+    monkeypatch.setattr(scraper_runner, "PROPERTY_DETAILS_PATH", str(tmp_path / "PropertyDetails"))
+    monkeypatch.setattr(scraper_runner, "SEARCH_LISTINGS_METADATA_PATH", str(tmp_path / "SearchResultsMetadata"))
+    monkeypatch.setattr(provider_adapters, "PROPERTY_DETAILS_PATH", str(tmp_path / "PropertyDetails"))
+
+
+def test_streamed_reports_parse_and_match_reconcile_sources(monkeypatch, tmp_path):
+    import json
+
+    _write_fetched_listings(monkeypatch, tmp_path)
+
+    def _comparable(report):
+        return {key: value for key, value in json.loads(json.dumps(report)).items() if key not in ("generated_at", "saved_paths")}
+
+    expected = reconciler.reconcile_sources(["33131", "33139"])
+    for report_format in ("json", "ndjson"):
+        summary = reconciler.write_reconciliation_report(["33131", "33139"], report_format=report_format)
+        report = reconciler.load_reconciliation_report(summary["saved_paths"]["json_path"])
+        assert _comparable(report) == _comparable(expected), report_format
+        assert summary["saved_paths"]["json_path"].endswith(f".{report_format}")
+    assert not list((tmp_path / "Fetched" / "Reconciliation").glob(".*.tmp"))
+    assert [item["cluster_count"] for item in expected["zips"]] == [2, 0]
+
+
+def test_worker_pool_matches_the_serial_reports(monkeypatch, tmp_path):
+    import multiprocessing
+
+    _write_fetched_listings(monkeypatch, tmp_path)
+    # spawn workers inherit nothing from the parent, so they read only the data roots they are handed.
+    monkeypatch.setattr(reconciler, "RECONCILE_POOL_CONTEXT", multiprocessing.get_context("spawn"))
+    zip_codes = ["33140", "33131", "33139"]
+
+    def _results(report):
+        # street_key_cache counts each process's own cache hits and misses.
+        return {key: value for key, value in report.items() if key not in ("generated_at", "street_key_cache")}
+
+    serial = reconciler.reconcile_sources(zip_codes, workers=1)
+    pooled = reconciler.reconcile_sources(zip_codes, workers=2)
+
+    assert [item["zip_code"] for item in pooled["zips"]] == zip_codes
+    assert [_results(item) for item in pooled["zips"]] == [_results(item) for item in serial["zips"]]
+    assert {**_results(pooled), "zips": None} == {**_results(serial), "zips": None}
+
+
+def test_cached_reports_do_not_count_old_street_key_lookups(monkeypatch, tmp_path):
+    _write_fetched_listings(monkeypatch, tmp_path)
+    monkeypatch.setattr(reconciler, "RECONCILIATION_CACHE_DIR", tmp_path / "cache")
+    zip_codes = ["33131", "33140"]
+
+    first = reconciler.reconcile_sources(zip_codes, use_cache=True)
+    fresh_lookups = sum(item["street_key_cache"]["hits"] + item["street_key_cache"]["misses"] for item in first["zips"])
+    second = reconciler.reconcile_sources(zip_codes, use_cache=True)
+
+    assert fresh_lookups > 0
+    assert first["street_key_cache"]["hits"] + first["street_key_cache"]["misses"] == fresh_lookups
+    assert second["zip_cache"] == {"hits": 2, "misses": 0}
+    assert second["street_key_cache"] == {"hits": 0, "misses": 0, "hit_rate": 0}
+    assert all("street_key_cache" not in item for item in second["zips"])
+    assert second["totals"] == first["totals"]
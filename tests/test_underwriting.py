@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from re_analyzer.analyzers import underwriting
+
+
+def test_monthly_principal_and_interest_matches_the_annuity_formula():
+    payments = underwriting.monthly_principal_and_interest([200000, 200000, 120000], [6.0, 0.0, 7.25], 30)
+
+    assert payments[0] == pytest.approx(1199.10, abs=0.01)
+    assert payments[1] == pytest.approx(200000 / 360)
+    assert payments[2] == pytest.approx(818.61, abs=0.01)
+
+
+def test_underwrite_df_matches_a_hand_worked_deal():
+    catalog_df = pd.DataFrame({
+        "purchase_price": [250000, 0],
+        "monthly_restimate": [2500.0, 1800.0],
+        "annual_property_tax_rate": [1.2, 1.0],
+        "annual_mortgage_rate": [6.0, 6.0],
+        "monthly_homeowners_insurance": [150.0, None],
+        "monthly_hoa": [50.0, 0.0],
+        "living_area": [1250, 0],
+        "tax_current_annual": [2000.0, None],
+    }, index=[11, 12])
+
+    result = underwriting.underwrite_df(catalog_df, vacancy_pct=0.05, management_pct=0.1, repairs_pct=0.05, capex_pct=0.05)
+    deal = result.loc[11]
+    principal_and_interest = 1199.10
+    effective_rent = 2500 * 0.75
+    noi_current = (effective_rent - 200) * 12 - 2000
+    noi_reassessed = (effective_rent - 200) * 12 - 5000
+
+    assert list(result.columns) == list(underwriting.UNDERWRITING_COLUMNS)
+    assert deal["cash_in"] == pytest.approx(250000 * 0.23)
+    assert deal["principal_and_interest"] == pytest.approx(principal_and_interest, abs=0.01)
+    assert (deal["tax_current_annual"], deal["tax_reassessed_annual"]) == pytest.approx((2000, 5000))
+    assert (deal["noi_current_tax"], deal["noi_reassessed_tax"]) == pytest.approx((noi_current, noi_reassessed))
+    assert deal["cash_flow_current_tax"] == pytest.approx(noi_current - principal_and_interest * 12, abs=0.2)
+    assert deal["cash_on_cash_reassessed_tax"] == pytest.approx((noi_reassessed - principal_and_interest * 12) / 57500, abs=1e-5)
+    assert deal["cap_rate_current_tax"] == pytest.approx(noi_current / 250000)
+    assert deal["dscr_reassessed_tax"] == pytest.approx(noi_reassessed / (principal_and_interest * 12), abs=1e-5)
+    assert deal["break_even_rent_current_tax"] == pytest.approx((200 + principal_and_interest + 2000 / 12) / 0.75, abs=0.02)
+    assert deal["rent_per_sqft"] == pytest.approx(2.0)
+    assert np.isnan(result.loc[12, ["cash_on_cash_current_tax", "cap_rate_current_tax", "dscr_current_tax", "rent_per_sqft"]]).all()
+
+
+def test_rank_by_underwriting_selects_the_top_rows_and_puts_nan_last():
+    rng = np.random.default_rng(3)
+    catalog_df = pd.DataFrame({
+        "purchase_price": rng.integers(100_000, 900_000, 200).astype(float),
+        "monthly_restimate": rng.integers(900, 6000, 200).astype(float),
+        "annual_property_tax_rate": 1.5,
+        "annual_mortgage_rate": 6.5,
+    })
+    catalog_df.loc[[3, 7], "purchase_price"] = 0
+
+    full = underwriting.rank_by_underwriting(catalog_df)
+    top = underwriting.rank_by_underwriting(catalog_df, metric="cap_rate_current_tax", limit=10, down_payment_pct=0.25)
+    expected = underwriting.underwrite_df(catalog_df, down_payment_pct=0.25)["cap_rate_current_tax"].nlargest(10)
+
+    assert len(full) == 200 and list(full.index[-2:]) == [3, 7]
+    assert full["cash_on_cash_reassessed_tax"].iloc[:-2].is_monotonic_decreasing
+    assert list(top.index) == list(expected.index)
+
+
+def test_rank_by_underwriting_matches_rows_by_position():
+    catalog_df = pd.DataFrame({
+        "purchase_price": [300000.0, 200000.0, 250000.0],
+        "monthly_restimate": [2000.0, 2500.0, 1500.0],
+        "annual_property_tax_rate": 1.5,
+        "annual_mortgage_rate": 6.5,
+        "tax_current_annual": [3000.0, np.nan, 0.0],
+    }, index=pd.Index([7, 7, 9], name="zpid"))
+
+    ranked = underwriting.rank_by_underwriting(catalog_df)
+    expected = underwriting.underwrite_df(catalog_df.reset_index(drop=True))
+
+    assert len(ranked) == 3 and list(ranked.index) == [7, 7, 9]
+    assert list(ranked["purchase_price"]) == [200000.0, 300000.0, 250000.0]
+    assert list(ranked.columns).count("tax_current_annual") == 1
+    assert list(ranked["tax_current_annual"]) == [3000.0, 3000.0, 3750.0]
+    np.testing.assert_allclose(ranked["cash_on_cash_reassessed_tax"], expected["cash_on_cash_reassessed_tax"].iloc[[1, 0, 2]])
+    assert list(underwriting.rank_by_underwriting(catalog_df, limit=1)["purchase_price"]) == [200000.0]
+
+
+def test_underwrite_rejects_unknown_assumptions():
+    with pytest.raises(ValueError):
+        underwriting.underwrite(300000, 2000, 1.0, 6.0, vacancy=0.1)
+
+
+def test_sweep_scenarios_matches_ranking_each_scenario_separately():
+    rng = np.random.default_rng(5)
+    catalog_df = pd.DataFrame({
+        "purchase_price": rng.integers(100_000, 900_000, 300).astype(float),
+        "monthly_restimate": rng.integers(900, 6000, 300).astype(float),
+        "annual_property_tax_rate": rng.uniform(0.8, 2.0, 300),
+        "annual_mortgage_rate": 6.5,
+        "monthly_hoa": rng.integers(0, 400, 300).astype(float),
+    }, index=rng.permutation(np.arange(1000, 1300)))
+    catalog_df.loc[catalog_df.index[:5], "purchase_price"] = 0
+    scenarios = underwriting.scenario_grid(annual_mortgage_rate=[5.5, 7.5], down_payment_pct=[0.05, 1.0], vacancy_pct=[0.0, 0.1])
+
+    sweep_df = underwriting.sweep_scenarios(catalog_df, scenarios, top_k=7, chunk_cells=250, repairs_pct=0.1)
+
+    assert len(sweep_df) == 8 * 7
+    assert list(sweep_df.columns) == ["scenario", "annual_mortgage_rate", "down_payment_pct", "vacancy_pct", "rank", "listing", "cash_on_cash_reassessed_tax"]
+    for scenario, scenario_df in sweep_df.groupby("scenario"):
+        rate, down_payment, vacancy = scenarios.loc[scenario]
+        expected = underwriting.rank_by_underwriting(
+            catalog_df.assign(annual_mortgage_rate=rate), limit=7,
+            down_payment_pct=down_payment, vacancy_pct=vacancy, repairs_pct=0.1,
+        )
+        assert list(scenario_df["rank"]) == list(range(1, 8))
+        assert list(scenario_df["listing"]) == list(expected.index)
+        np.testing.assert_allclose(scenario_df["cash_on_cash_reassessed_tax"], expected["cash_on_cash_reassessed_tax"])
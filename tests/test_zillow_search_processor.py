@@ -0,0 +1,115 @@
+import csv
+import json
+import os
+
+import pytest
+
+from re_analyzer.processors import zillow_search_processor
+
+
+def _listing(zpid, zip_code, price, rent, home_type="SINGLE_FAMILY"):
+    return {
+        "zpid": zpid,
+        "unformattedPrice": price,
+        "area": 1000,
+        "address": f"{zpid} Main St",
+        "detailUrl": f"/homedetails/{zpid}",
+        "hdpData": {"homeInfo": {"zestimate": price, "rentZestimate": rent, "zipcode": zip_code, "homeType": home_type}},
+    }
+
+
+def _write_zip(data_path, metadata_path, zip_code, listings, timestamp="2024-01-01_00-00"):
+    zip_dir = data_path / zip_code
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    (zip_dir / f"listings_{timestamp}.json").write_text(json.dumps(listings), encoding="utf-8")
+    metadata_path.mkdir(exist_ok=True)
+    (metadata_path / f"{zip_code}_metadata.json").write_text(json.dumps({"active_zpids": [listing["zpid"] for listing in listings]}), encoding="utf-8")
+
+
+@pytest.fixture
+def search_tree(monkeypatch, tmp_path):
+    data_path, metadata_path = tmp_path / "SearchResults", tmp_path / "SearchResultsMetadata"
+    monkeypatch.setattr(zillow_search_processor, "SEARCH_LISTINGS_DATA_PATH", str(data_path))
+    monkeypatch.setattr(zillow_search_processor, "SEARCH_LISTINGS_METADATA_PATH", str(metadata_path))
+    monkeypatch.setattr(zillow_search_processor, "SEARCH_RANKING_INDEX_PATH", str(tmp_path / "ranking.sqlite"))
+    monkeypatch.setattr(zillow_search_processor, "SEARCH_RESULTS_PROCESSED_PATH", str(tmp_path / "search_listings.csv"))
+    _write_zip(data_path, metadata_path, "33131", [
+        _listing(1, "33131", 300000, 3000),
+        _listing(2, "33131", 500000, 2500, "CONDO"),
+        _listing(3, "33131", 200000, 0),
+    ])
+    _write_zip(data_path, metadata_path, "33139", [
+        _listing(4, "33139", 250000, 2600, "CONDO"),
+        _listing(5, "33139", 900000, 4000),
+    ])
+    return tmp_path
+
+
+def test_process_all_zip_codes_writes_the_ranking_in_metric_order(search_tree):
+    zillow_search_processor.process_all_zip_codes()
+
+    with open(search_tree / "search_listings.csv", newline="", encoding="utf-8") as csvfile:
+        rows = list(csv.DictReader(csvfile))
+    assert [row["zpid"] for row in rows] == ["4", "1", "2", "5"]
+    assert list(rows[0]) == zillow_search_processor.RANKING_FIELDS
+    assert rows[0]["is_active"] == "True"
+
+
+def test_ranking_index_answers_filtered_top_n_and_tracks_changed_zips(search_tree):
+    connection = zillow_search_processor.open_ranking_index()
+    try:
+        assert zillow_search_processor.sync_ranking_index(connection) == {"zip_folders": 2, "reindexed": 2, "removed": 0}
+        assert zillow_search_processor.sync_ranking_index(connection)["reindexed"] == 0
+
+        top = zillow_search_processor.top_listings(connection, limit=2, home_types=["SINGLE_FAMILY"])
+        assert [row["zpid"] for row in top] == ["1", "5"]
+        assert [row["zpid"] for row in zillow_search_processor.top_listings(connection, zip_codes=["33131"], max_price=400000)] == ["1"]
+        assert [row["zpid"] for row in zillow_search_processor.top_listings(connection, "rentZestimate_to_Zestimate_ratio", limit=1, ascending=True)] == ["5"]
+
+        # A new scrape of 33139 re-indexes that ZIP (every listings file, as the full ranking reads them);
+        # a vanished ZIP folder leaves the ranking.
+        _write_zip(search_tree / "SearchResults", search_tree / "SearchResultsMetadata", "33139", [_listing(4, "33139", 100000, 2600, "CONDO")], "2024-02-01_00-00")
+        for filename in os.listdir(search_tree / "SearchResults" / "33131"):
+            os.remove(search_tree / "SearchResults" / "33131" / filename)
+        os.rmdir(search_tree / "SearchResults" / "33131")
+        assert zillow_search_processor.sync_ranking_index(connection) == {"zip_folders": 1, "reindexed": 1, "removed": 1}
+        top = zillow_search_processor.top_listings(connection)
+        assert [(row["zpid"], row["listing_price"]) for row in top] == [("4", 100000), ("4", 250000), ("5", 900000)]
+
+        zillow_search_processor.delete_listings(connection, "33139", [5])
+        assert [row["zpid"] for row in zillow_search_processor.top_listings(connection)] == ["4", "4"]
+        with pytest.raises(ValueError):
+            zillow_search_processor.top_listings(connection, metric="price")
+    finally:
+        connection.close()
+
+
+def _baseline_ranking_csv(data_path, metadata_path, csv_path):
+    """The all-in-memory ranking the index replaced: every row of every folder, stable-sorted by ratio."""
+    all_results = []
+    for zip_code_folder in sorted(os.listdir(data_path)):
+        all_results.extend(zillow_search_processor.process_listings(
+            os.path.join(data_path, zip_code_folder), os.path.join(metadata_path, f"{zip_code_folder}_metadata.json"),
+        ))
+    sorted_results = sorted(all_results, key=lambda x: x["rentZestimate_to_price_ratio"], reverse=True)
+    with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=zillow_search_processor.RANKING_FIELDS)
+        writer.writeheader()
+        for result in sorted_results:
+            writer.writerow(result)
+
+
+def test_ranking_csv_matches_the_in_memory_ranking_byte_for_byte(search_tree):
+    data_path, metadata_path = search_tree / "SearchResults", search_tree / "SearchResultsMetadata"
+    scraped = [_listing(str(zpid), "33140", 450000 + zpid, 3000) for zpid in (10, 11)]
+    scraped[1]["hdpData"]["homeInfo"]["rentZestimate"] = 2750.5
+    # Same zpid in two scrapes of a folder, and two rows tied on the ratio.
+    _write_zip(data_path, metadata_path, "33140", scraped + [_listing("12", "33140", 300000, 3000), _listing("13", "33140", 300000, 3000)])
+    _write_zip(data_path, metadata_path, "33140", [_listing("10", "33140", 400000, 3000)], "2024-02-01_00-00")
+
+    zillow_search_processor.process_all_zip_codes()
+    _baseline_ranking_csv(data_path, metadata_path, search_tree / "baseline.csv")
+
+    written = (search_tree / "search_listings.csv").read_bytes()
+    assert written == (search_tree / "baseline.csv").read_bytes()
+    assert b"450010,3000,True" in written and b",2750.5," in written
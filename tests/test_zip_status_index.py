@@ -0,0 +1,55 @@
+import json
+import os
+
+from re_analyzer.scrapers import zip_status_index
+
+
+def _write_metadata(metadata_dir, zip_code, **fields):
+    metadata_dir.mkdir(parents=True, exist_ok=True)
+    path = metadata_dir / f"{zip_code}_metadata.json"
+    path.write_text(json.dumps(fields), encoding="utf-8")
+    return path
+
+
+def test_statuses_are_read_once_and_reread_when_the_file_changes(monkeypatch, tmp_path):
+    zip_status_index.clear_zip_status_index()
+    metadata_dir = tmp_path / "zillow" / "Metadata"
+    path = _write_metadata(
+        metadata_dir, "33131",
+        last_checked="2026-05-28T19:35:00", last_status="ok", canonical_count=12,
+        errors=[f"error {index}" for index in range(8)], last_run={"warning_count": 2},
+    )
+    _write_metadata(metadata_dir, "33139", last_status="blocked")
+    (metadata_dir / "33140_metadata.json").write_text("{not json", encoding="utf-8")
+
+    reads = []
+    load_file = zip_status_index.json_codec.load_file
+    monkeypatch.setattr(zip_status_index.json_codec, "load_file", lambda path: reads.append(os.path.basename(path)) or load_file(path))
+
+    statuses = zip_status_index.provider_zip_statuses(metadata_dir, ["33131", "33139", "33140", "32003"])
+    assert sorted(statuses) == ["33131", "33139", "33140"]
+    assert statuses["33131"]["last_checked_at"].tzinfo is not None
+    assert (statuses["33131"]["canonical_count"], statuses["33131"]["warning_count"], statuses["33131"]["error_count"]) == (12, 2, 8)
+    assert len(statuses["33131"]["errors"]) == zip_status_index.DETAIL_MESSAGE_LIMIT
+    assert statuses["33139"]["last_checked_at"] is None
+    assert statuses["33140"] is None
+
+    assert zip_status_index.provider_zip_statuses(metadata_dir, ["33131", "33139", "33140"]) == statuses
+    assert len(reads) == 3
+
+    path.write_text(json.dumps({"last_checked": "2026-06-01T00:00:00+00:00", "last_status": "empty"}), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert zip_status_index.provider_zip_statuses(metadata_dir)["33131"]["last_status"] == "empty"
+    assert reads[3:] == ["33131_metadata.json"]
+
+
+def test_recorded_writes_are_served_without_reading_the_file(monkeypatch, tmp_path):
+    zip_status_index.clear_zip_status_index()
+    metadata_dir = tmp_path / "redfin" / "Metadata"
+    metadata = {"last_checked": "2026-05-28T19:35:00+00:00", "last_status": "ok", "has_saved_payload": True}
+    path = _write_metadata(metadata_dir, "33131", **metadata)
+
+    zip_status_index.record_zip_status(str(tmp_path / "redfin" / "." / "Metadata" / path.name), metadata)
+
+    monkeypatch.setattr(zip_status_index.json_codec, "load_file", lambda path: (_ for _ in ()).throw(AssertionError(path)))
+    assert zip_status_index.provider_zip_statuses(metadata_dir)["33131"]["has_saved_payload"] is True